@@ -7,37 +7,75 @@ from fastapi import (
     UploadFile,
     File,
     Form,
-    Request
+    Request,
+    Response,
+    Header,
+    BackgroundTasks
 )
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from datetime import datetime, timezone
 
 # Database
-from app.core.database import get_db_ops
+from app.core.database import AsyncDB, get_async_db_ops, get_async_db_read, get_db_ops, get_db_read
+from app.core.config import settings
 
 # Schemas
 from app.schemas.report import (
     ReportCreate,
+    ReportFinalize,
     ReportResponse,
     ReportListResponse,
+    ReportBatchGetRequest,
+    ReportBatchGetResponse,
+    ReportClaimRequest,
+    ReportSearchResponse,
+    ReportNearbyResponse,
     ReportStatusUpdate,
     ReportStatus,
     ReportCategory
 )
-from app.schemas.attachment import AttachmentResponse, FileType
+from app.schemas.attachment import (
+    AttachmentResponse,
+    FileType,
+    UploadTicketRequest,
+    UploadTicketResponse,
+    ResumableUploadCreate,
+    ResumableUploadResponse,
+    ResumableUploadCommit
+)
 
 # Models
 from app.models.report import Report
 from app.models.attachment import Attachment
+from app.models.user import User
+
+# Auth
+from app.api.v1.auth import get_current_user
 
 # Services
 from app.services.report_service import ReportService
-from app.services.blob_service import BlobStorageService
+from app.services.report_read_service import ReportReadService
+from app.services.report_queue_service import ReportQueueService
+from app.services.report_cache import get_report_cache
+from app.services.report_documents import documents_etag, dumps, etag_matches, sign_report_document
+from app.services.upload_session_service import UploadSessionService
+from app.services.thumbnail_service import ThumbnailService
+from app.services.blob_service import get_blob_service
+from app.services.attachment_content_service import AttachmentContentService
 
 router = APIRouter()
 
 
+def _conditional_response(etag: str, body: Optional[bytes]) -> Response:
+    """JSON response carrying its ETag; a 304 when body is None (If-None-Match hit)"""
+    # Clients may keep the copy but must revalidate before reusing it
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if body is None:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 # ---------------------------------------------------------
 # REPORT CRUD
 # ---------------------------------------------------------
@@ -50,6 +88,7 @@ router = APIRouter()
 )
 async def create_report(
     request: Request,
+    background_tasks: BackgroundTasks,
     title: str = Form(...),
     user_id: str = Form(...),
     descriptionText: str = Form(...),
@@ -59,7 +98,7 @@ async def create_report(
     transcribedVoiceText: Optional[str] = Form(None),
     hashedDeviceId: Optional[str] = Form(None),
     files: List[UploadFile] = File(...), 
-    db: Session = Depends(get_db_ops)
+    db: AsyncDB = Depends(get_async_db_ops)
 ):
     """
     Submit a new incident report with file attachments.
@@ -100,77 +139,390 @@ async def create_report(
     # 5. Add reportUrl to response
     report_response.reportUrl = f"{base_url}/api/v1/reports/{report_response.reportId}"
     
+    # 6. Generate thumbnails after the response is sent
+    background_tasks.add_task(
+        ThumbnailService.generate_thumbnails,
+        [attachment.attachmentId for attachment in report_response.attachments]
+    )
+    
     return report_response
 
 
+@router.post(
+    "/upload-tickets",
+    response_model=List[UploadTicketResponse],
+    summary="Request direct-to-storage upload URLs"
+)
+def create_upload_tickets(ticket_request: UploadTicketRequest):
+    """
+    Issue short-lived, write-only upload URLs (step 1 of direct upload).
+    PUT each file to its uploadUrl with uploadHeaders, then call /finalize.
+    """
+    return ReportService.issue_upload_tickets(ticket_request)
+
+
+@router.post(
+    "/finalize",
+    response_model=ReportResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Submit a report with directly uploaded files"
+)
+def finalize_report(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    report_data: ReportFinalize,
+    db: Session = Depends(get_db_ops)
+):
+    """
+    Create a report from files already uploaded with upload tickets (step 2).
+    Each blob is verified in storage before its attachment is recorded.
+    """
+    base_url = str(request.base_url).rstrip('/')
+    
+    report_response = ReportService.finalize_report_with_blobs(db, report_data)
+    report_response.reportUrl = f"{base_url}/api/v1/reports/{report_response.reportId}"
+    
+    background_tasks.add_task(
+        ThumbnailService.generate_thumbnails,
+        [attachment.attachmentId for attachment in report_response.attachments]
+    )
+    
+    return report_response
+
+
+# ---------------------------------------------------------
+# RESUMABLE UPLOADS (tus-style)
+# ---------------------------------------------------------
+
+def _upload_session_response(request: Request, upload_session) -> ResumableUploadResponse:
+    base_url = str(request.base_url).rstrip('/')
+    return ResumableUploadResponse(
+        uploadId=upload_session.uploadId,
+        uploadUrl=f"{base_url}/api/v1/reports/uploads/{upload_session.uploadId}",
+        uploadOffset=upload_session.uploadOffset,
+        uploadLength=upload_session.uploadLength,
+        status=upload_session.status,
+        expiresAt=upload_session.expiresAt
+    )
+
+
+@router.post(
+    "/uploads",
+    response_model=ResumableUploadResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Start a resumable upload"
+)
+def create_upload_session(
+    request: Request,
+    response: Response,
+    upload_in: ResumableUploadCreate,
+    db: Session = Depends(get_db_ops)
+):
+    """
+    Open a resumable upload for a large file (e.g., video evidence).
+    Send the bytes with PATCH requests to uploadUrl, then commit it to a report.
+    """
+    upload_session = UploadSessionService.create_session(db, upload_in)
+    result = _upload_session_response(request, upload_session)
+    response.headers["Location"] = result.uploadUrl
+    return result
+
+
+@router.head(
+    "/uploads/{upload_id}",
+    summary="Get resumable upload offset"
+)
+def get_upload_offset(
+    upload_id: str,
+    db: Session = Depends(get_db_ops)
+):
+    """Return the number of bytes received so far in the Upload-Offset header"""
+    upload_session = UploadSessionService.get_session(db, upload_id)
+    return Response(
+        status_code=status.HTTP_200_OK,
+        headers={
+            "Upload-Offset": str(upload_session.uploadOffset),
+            "Upload-Length": str(upload_session.uploadLength),
+            "Cache-Control": "no-store"
+        }
+    )
+
+
+@router.patch(
+    "/uploads/{upload_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Upload a chunk of a resumable upload"
+)
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(..., alias="Upload-Offset", ge=0),
+    db: AsyncDB = Depends(get_async_db_ops)
+):
+    """
+    Append the request body at Upload-Offset. After a dropped connection,
+    HEAD the upload and resend from the returned offset.
+    """
+    new_offset = await UploadSessionService.append_chunk(
+        db,
+        upload_id,
+        upload_offset,
+        request.stream()
+    )
+    return Response(
+        status_code=status.HTTP_204_NO_CONTENT,
+        headers={"Upload-Offset": str(new_offset)}
+    )
+
+
+@router.post(
+    "/uploads/{upload_id}/commit",
+    response_model=AttachmentResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Attach a completed resumable upload to a report"
+)
+async def commit_upload(
+    upload_id: str,
+    commit_in: ResumableUploadCommit,
+    background_tasks: BackgroundTasks,
+    db: AsyncDB = Depends(get_async_db_ops)
+):
+    """Assemble the uploaded chunks and add the file to the report's attachments"""
+    attachment = await UploadSessionService.commit_session(db, upload_id, commit_in.reportId)
+    background_tasks.add_task(ThumbnailService.generate_thumbnails, [attachment.attachmentId])
+    return attachment
+
+
 @router.get(
     "/",
     response_model=ReportListResponse,
-    summary="List all reports"
+    summary="List all reports",
+    responses={304: {"description": "Client copy is current (If-None-Match)"}}
 )
 def list_reports(
-    skip: int = Query(0, ge=0),
+    skip: int = Query(0, ge=0, description="Deprecated offset pagination; use cursor"),
     limit: int = Query(10, ge=1, le=100),
     status: Optional[ReportStatus] = Query(None),
     category: Optional[ReportCategory] = Query(None),
-    db: Session = Depends(get_db_ops)
+    cursor: Optional[str] = Query(None, description="nextCursor from the previous page"),
+    include_total: bool = Query(False, description="Include the total count"),
+    count_mode: str = Query("cached", pattern="^(exact|cached|approximate)$", description="How the total is computed"),
+    view: str = Query("full", pattern="^(full|summary)$", description="'summary' omits text bodies and attachments"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    db: Session = Depends(get_db_read)
 ):
-    """Get paginated list of reports with their attachments"""
+    """Get paginated list of reports with their attachments (newest first)"""
     status_value = status.value if status else None
     category_value = category.value if category else None
     
-    return ReportService.list_reports(
+    # Pre-encoded JSON: response_model documents the shape but is not re-validated
+    etag, body = ReportReadService.list_reports(
         db,
         skip=skip,
         limit=limit,
         status=status_value,
-        category=category_value
+        category=category_value,
+        cursor=cursor,
+        include_total=include_total,
+        count_mode=count_mode,
+        view=view,
+        if_none_match=if_none_match
     )
+    return _conditional_response(etag, body)
+
+
+@router.get(
+    "/search",
+    response_model=ReportSearchResponse,
+    summary="Search reports"
+)
+def search_reports(
+    q: str = Query(..., min_length=1, max_length=200, description="Search text (Arabic and/or English)"),
+    status: Optional[ReportStatus] = Query(None),
+    category: Optional[ReportCategory] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db_read)
+):
+    """
+    Search report titles, descriptions and transcribed voice notes.
+    All words must match; spelling variants (hamza, ta marbuta, diacritics,
+    plurals) are normalized. Best matches first.
+    """
+    body = ReportReadService.search_reports(
+        db,
+        q,
+        status=status.value if status else None,
+        category=category.value if category else None,
+        skip=skip,
+        limit=limit
+    )
+    return Response(content=body, media_type="application/json")
+
+
+@router.get(
+    "/nearby",
+    response_model=ReportNearbyResponse,
+    summary="Find reports near a point or inside a bounding box"
+)
+def nearby_reports(
+    lat: Optional[float] = Query(None, ge=-90, le=90, description="Center latitude"),
+    lon: Optional[float] = Query(None, ge=-180, le=180, description="Center longitude"),
+    radius_m: float = Query(1000, gt=0, le=settings.NEARBY_MAX_RADIUS_METERS, description="Radius in meters"),
+    min_lat: Optional[float] = Query(None, ge=-90, le=90),
+    min_lon: Optional[float] = Query(None, ge=-180, le=180),
+    max_lat: Optional[float] = Query(None, ge=-90, le=90),
+    max_lon: Optional[float] = Query(None, ge=-180, le=180),
+    status: Optional[ReportStatus] = Query(None),
+    category: Optional[ReportCategory] = Query(None),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db_read)
+):
+    """
+    Radius search (lat, lon, radius_m) returns the nearest reports first;
+    bounding-box search (min_lat, min_lon, max_lat, max_lon) returns the
+    newest first. Only reports whose location resolved to coordinates match.
+    """
+    bbox_values = (min_lat, min_lon, max_lat, max_lon)
+    if all(value is not None for value in bbox_values):
+        if min_lat > max_lat or min_lon > max_lon:
+            raise HTTPException(
+                status_code=400,
+                detail="Bounding box minimums must not exceed its maximums"
+            )
+        bbox = bbox_values
+    elif lat is not None and lon is not None:
+        bbox = None
+    else:
+        raise HTTPException(
+            status_code=400,
+            detail="Provide lat and lon, or min_lat, min_lon, max_lat and max_lon"
+        )
+
+    body = ReportReadService.nearby_reports(
+        db,
+        latitude=lat,
+        longitude=lon,
+        radius_meters=radius_m,
+        bbox=bbox,
+        status=status.value if status else None,
+        category=category.value if category else None,
+        limit=limit
+    )
+    return Response(content=body, media_type="application/json")
+
+
+@router.post(
+    "/batch-get",
+    response_model=ReportBatchGetResponse,
+    summary="Get many reports by ID"
+)
+def batch_get_reports(
+    batch_in: ReportBatchGetRequest,
+    db: Session = Depends(get_db_read)
+):
+    """
+    Get up to 500 reports with their attachments in one request.
+    Reports come back in request order; unknown IDs are listed in 'missing'.
+    """
+    body = ReportReadService.get_reports(db, batch_in.reportIds)
+    return Response(content=body, media_type="application/json")
+
+
+@router.post(
+    "/claim",
+    response_model=ReportBatchGetResponse,
+    summary="Claim the next submitted reports"
+)
+def claim_reports(
+    claim_in: ReportClaimRequest,
+    db: Session = Depends(get_db_ops),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Assign the oldest Submitted reports (optionally of some categories) to
+    the calling officer and return them. Concurrent claims never receive
+    the same report; an empty list means the queue is empty.
+    **Requirement:** Requester must be an OFFICER or ADMIN.
+    """
+    if current_user.role not in ("officer", "admin"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized. Officer privileges required."
+        )
+    
+    report_ids = ReportQueueService.claim(
+        db,
+        current_user.userId,
+        limit=claim_in.limit,
+        categories=[category.value for category in claim_in.categories or []]
+    )
+    body = ReportReadService.get_reports(db, report_ids)
+    return Response(content=body, media_type="application/json")
 
 
 @router.get(
     "/{report_id}",
     response_model=ReportResponse,
-    summary="Get report by ID"
+    summary="Get report by ID",
+    responses={304: {"description": "Client copy is current (If-None-Match)"}}
 )
 def get_report(
     report_id: Optional[str] = None,
-    db: Session = Depends(get_db_ops)
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    db: Session = Depends(get_db_read)
 ):
     """Get a single report by its ID with all attachments"""
-    report = ReportService.get_report(db, report_id)
+    document = get_report_cache().get_document(db, report_id)
     
-    if not report:
+    if not document:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Report with ID {report_id} not found"
         )
     
-    return report
+    etag = documents_etag([document])
+    if etag_matches(if_none_match, etag):
+        return _conditional_response(etag, None)
+    
+    # Cached documents are unsigned; attachment URLs are signed per request
+    body = dumps(sign_report_document(document, get_blob_service()))
+    return _conditional_response(etag, body)
 
 @router.get(
     "/user/{user_id}",
     response_model = ReportListResponse,
-    summary="Get report by user_id"
+    summary="Get report by user_id",
+    responses={304: {"description": "Client copy is current (If-None-Match)"}}
 )
 def get_report_by_user(
     user_id :  str,
-    db: Session = Depends(get_db_ops),
-    skip: int = 0, 
-    limit: int = 10,
+    db: Session = Depends(get_db_read),
+    skip: int = Query(0, ge=0, description="Deprecated offset pagination; use cursor"),
+    limit: int = Query(10, ge=1, le=100),
     status: Optional[str] = None,
-    category: Optional[str] = None
+    category: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="nextCursor from the previous page"),
+    include_total: bool = Query(False, description="Include the total count"),
+    count_mode: str = Query("cached", pattern="^(exact|cached|approximate)$", description="How the total is computed"),
+    view: str = Query("full", pattern="^(full|summary)$", description="'summary' omits text bodies and attachments"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match")
 ):
-    """Get a single report by its ID with all attachments"""
-    reports = ReportService.get_report_by_user(db, user_id, skip, limit, status, category)
-    
-    if not reports:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Report with ID {user_id} not found"
-        )
-    
-    return reports
+    """Get a user's reports with their attachments (newest first)"""
+    etag, body = ReportReadService.list_reports(
+        db,
+        user_id=user_id,
+        skip=skip,
+        limit=limit,
+        status=status,
+        category=category,
+        cursor=cursor,
+        include_total=include_total,
+        count_mode=count_mode,
+        view=view,
+        if_none_match=if_none_match
+    )
+    return _conditional_response(etag, body)
 
 @router.put(
     "/{report_id}/status",
@@ -226,7 +578,7 @@ def delete_report(
 )
 def get_report_attachments(
     report_id: str,
-    db: Session = Depends(get_db_ops)
+    db: Session = Depends(get_db_read)
 ):
     """Get all attachments associated with a report with temporary download URLs"""
     # Verify report exists
@@ -241,7 +593,7 @@ def get_report_attachments(
     attachments = db.query(Attachment).filter(Attachment.reportId == report_id).all()
     
     # Generate download URLs
-    blob_service = BlobStorageService()
+    blob_service = get_blob_service()
     results = []
     
     for attachment in attachments:
@@ -255,8 +607,44 @@ def get_report_attachments(
                 mimeType=attachment.mimeType,
                 fileType=attachment.fileType,
                 fileSizeBytes=attachment.fileSizeBytes,
+                thumbnailUrl=ReportService._thumbnail_url(blob_service, attachment),
                 createdAt=datetime.now(timezone.utc)  # Manual timestamp
             )
         )
     
-    return results
\ No newline at end of file
+    return results
+
+
+@router.get(
+    "/{report_id}/attachments/{attachment_id}/content",
+    summary="Stream attachment content",
+    response_class=Response,
+    responses={
+        200: {"description": "Full attachment"},
+        206: {"description": "Requested byte range"},
+        304: {"description": "Client copy is current (If-None-Match)"},
+        416: {"description": "Range not satisfiable"}
+    }
+)
+async def get_attachment_content(
+    report_id: str,
+    attachment_id: str,
+    background_tasks: BackgroundTasks,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    if_range: Optional[str] = Header(None, alias="If-Range"),
+    db: AsyncDB = Depends(get_async_db_read)
+):
+    """
+    Stream an attachment through the API. Supports Range requests for
+    video scrubbing and If-None-Match revalidation; recently viewed files
+    are served from this node's disk cache.
+    """
+    attachment = await db.run_sync(AttachmentContentService.get_attachment, report_id, attachment_id)
+    return await AttachmentContentService.build_response(
+        attachment,
+        background_tasks,
+        range_header=range_header,
+        if_none_match=if_none_match,
+        if_range=if_range
+    )
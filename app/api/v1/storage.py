@@ -0,0 +1,96 @@
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Request, status
+from fastapi.responses import FileResponse
+
+from app.core.config import settings
+from app.services.blob_service import get_async_blob_service, get_blob_service
+from app.services.local_blob_service import LocalStorageMixin
+
+router = APIRouter()
+
+
+def _local_service(service, container: str, blob_name: str, sp: str, se: int, sig: str, required: str):
+    """Check that local storage is active and the signed token grants `required`"""
+    if not isinstance(service, LocalStorageMixin) or container != service.container_name:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+
+    try:
+        service.blob_path(blob_name)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid blob name")
+
+    if not any(permission in sp for permission in required) or not service.verify_signature(blob_name, sp, se, sig):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid or expired signature")
+
+    return service
+
+
+@router.get(
+    "/{container}/{blob_name}",
+    summary="Download a locally stored blob (signed URL)"
+)
+def download_blob(container: str, blob_name: str, sp: str, se: int, sig: str):
+    """
+    Serve a file written by the local storage backend.
+
+    Only mounted when STORAGE_BACKEND=local. FileResponse streams from disk
+    (zero-copy sendfile where the server supports it) instead of reading
+    the file into memory.
+    """
+    blob_service = _local_service(get_blob_service(), container, blob_name, sp, se, sig, "r")
+    metadata = blob_service.get_file_metadata(blob_name)
+
+    if not metadata:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Blob not found")
+
+    return FileResponse(
+        blob_service.blob_path(blob_name),
+        media_type=metadata['content_type'],
+        headers={"Cache-Control": "private, max-age=3600"}
+    )
+
+
+@router.put(
+    "/{container}/{blob_name}",
+    status_code=status.HTTP_201_CREATED,
+    summary="Upload a blob to local storage (signed URL)"
+)
+async def upload_blob(
+    container: str,
+    blob_name: str,
+    request: Request,
+    sp: str,
+    se: int,
+    sig: str,
+    content_length: Optional[int] = Header(None),
+    content_type: Optional[str] = Header(None),
+    x_ms_blob_content_type: Optional[str] = Header(None)
+):
+    """
+    Local stand-in for an Azure "Put Blob" to an upload ticket URL.
+
+    The body is streamed to disk chunk by chunk and never held in memory.
+    """
+    blob_service = _local_service(get_async_blob_service(), container, blob_name, sp, se, sig, "cw")
+
+    if content_length is None:
+        raise HTTPException(status_code=status.HTTP_411_LENGTH_REQUIRED, detail="Content-Length is required")
+    if content_length > settings.RESUMABLE_UPLOAD_MAX_SIZE_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Upload exceeds {settings.RESUMABLE_UPLOAD_MAX_SIZE_BYTES} bytes"
+        )
+
+    result = await blob_service.upload_chunks(
+        blob_name,
+        request.stream(),
+        x_ms_blob_content_type or content_type or "application/octet-stream"
+    )
+
+    if not result or result['size'] != content_length:
+        if result and result['url']:
+            await blob_service.delete_file(result['url'])
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Upload body did not match Content-Length")
+
+    return {"url": result['url'], "size": result['size'], "sha256": result['sha256']}
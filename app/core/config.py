@@ -26,6 +26,7 @@ class Settings(BaseSettings):
     
     # 1. Databases (Hot & Cold)
     SQLALCHEMY_DATABASE_URI_OPS: Optional[str] = None      
+    SQLALCHEMY_DATABASE_URI_OPS_READ: Optional[str] = None  # Read replica (e.g. with ApplicationIntent=ReadOnly)
     SQLALCHEMY_DATABASE_URI_ANALYTICS: Optional[str] = None 
     
     # 2. Storage
@@ -47,6 +48,43 @@ class Settings(BaseSettings):
     # ⚙️ Static Config
     # =========================================================
     BLOB_CONTAINER_NAME: str = "report-attachments"
+    STORAGE_BACKEND: str = "azure"  # "azure" or "local" (filesystem, for dev and isolated hosts)
+    LOCAL_STORAGE_PATH: str = "./storage"
+    LOCAL_STORAGE_BASE_URL: str = "http://localhost:8000/api/v1/storage"  # Public URL of the storage router
+    BLOB_UPLOAD_CHUNK_SIZE: int = 4 * 1024 * 1024  # Staged block size for streaming uploads
+    BLOB_UPLOAD_CONCURRENCY: int = 4  # Max parallel attachment uploads per report
+    BLOB_UPLOAD_TICKET_EXPIRY_MINUTES: int = 15  # Lifetime of direct-upload SAS URLs
+    MAX_ATTACHMENT_SIZE_BYTES: int = 52428800  # 50MB, matches AttachmentCreate
+    RESUMABLE_UPLOAD_MAX_SIZE_BYTES: int = 524288000  # 500MB, for large video evidence
+    RESUMABLE_UPLOAD_EXPIRY_HOURS: int = 24
+    THUMBNAIL_MAX_SIZE: int = 320  # Longest edge of attachment thumbnails (px)
+    THUMBNAIL_QUALITY: int = 70
+    THUMBNAIL_WORKERS: int = 2  # Thumbnail rendering processes per API worker
+    BLOB_PURGE_BATCH_SIZE: int = 256  # Azure blob batch limit
+    BLOB_PURGE_POLL_SECONDS: int = 10
+    BLOB_PURGE_MAX_BACKOFF_SECONDS: int = 3600
+    RECONCILE_GRACE_MINUTES: int = 60  # Skip blobs newer than this (uploads still in flight)
+    RECONCILE_PAGE_SIZE: int = 5000
+    SAS_EXPIRY_BUCKET_MINUTES: int = 15  # Download SAS expiries snap to this grid
+    SAS_CACHE_MAX_ENTRIES: int = 50000
+    ATTACHMENT_CACHE_PATH: str = "/tmp/attachment-cache"  # Per-node disk cache for the content proxy
+    ATTACHMENT_CACHE_MAX_BYTES: int = 2 * 1024 * 1024 * 1024  # 2GB
+    REPORT_COUNT_CACHE_TTL_SECONDS: int = 60  # Listing totals may lag other workers' writes by this much
+    REPORT_COUNT_CACHE_MAX_ENTRIES: int = 10000
+    REPORT_COUNTERS_REFRESH_SECONDS: int = 300  # Reload of the approximate per-filter counters
+    REPORT_CACHE_BACKEND: str = "memory"  # "memory" (per worker), "file" (shared per host), "redis" or "none"
+    REPORT_CACHE_TTL_SECONDS: int = 300
+    REPORT_CACHE_MAX_ENTRIES: int = 5000  # Memory backend only
+    REPORT_CACHE_PATH: str = "/tmp/report-cache"
+    REPORT_CACHE_REDIS_URL: Optional[str] = None
+    NEARBY_MAX_RADIUS_METERS: int = 50000
+    NEARBY_MAX_CANDIDATES: int = 5000  # Radius searches rank at most this many reports by distance
+    CLUSTER_WINDOW_MINUTES: int = 120  # Reports this close in time (to the cluster's latest) may join it
+    CLUSTER_RADIUS_METERS: int = 300  # ...and this close to its centroid, with the same category
+    CLUSTER_REFRESH_SECONDS: int = 10  # Pull of clusters created/updated by other workers
+    READ_REPLICA_MAX_LAG_SECONDS: int = 10  # Reads fall back to the primary beyond this lag
+    READ_REPLICA_LAG_CHECK_SECONDS: int = 15
+    DB_ASYNC_DRIVER: str = "auto"  # "aioodbc" (AsyncEngine), "thread" (pyodbc in worker threads) or "auto"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     ALLOWED_ORIGINS: list = ["http://localhost:3000", "http://localhost:8080", "capacitor://localhost"]
@@ -91,6 +129,7 @@ class AzureKeyVaultManager:
         """
         secrets_mapping = {
             "SqlOpsConnectionString": "SQLALCHEMY_DATABASE_URI_OPS",
+            "SqlOpsReadConnectionString": "SQLALCHEMY_DATABASE_URI_OPS_READ",
             "SqlAnalyticsConnectionString": "SQLALCHEMY_DATABASE_URI_ANALYTICS",
             "BlobStorageConnectionString": "BLOB_STORAGE_CONNECTION_STRING",
             "JwtSecretKey": "SECRET_KEY",
@@ -1,10 +1,15 @@
 # app/core/database.py
 
-from sqlalchemy import create_engine, text  
+from sqlalchemy import create_engine, event, text  
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
-from typing import Generator
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from typing import Any, AsyncGenerator, Callable, Generator, Optional, Union
+import asyncio
+import importlib.util
 import urllib.parse
 import logging
+import threading
+import time
 
 from app.core.config import get_settings  
 
@@ -55,6 +60,194 @@ except Exception as e:
 # Base class for Transactional Models
 BaseOps = declarative_base()
 
+# ==========================================
+# 1b. Operations DB Read Replica (Hot Path - Reads)
+# ==========================================
+engine_ops_read = None
+SessionLocalOpsRead = None
+
+if settings.SQLALCHEMY_DATABASE_URI_OPS_READ:
+    try:
+        url_ops_read = get_sqlalchemy_url(settings.SQLALCHEMY_DATABASE_URI_OPS_READ)
+        
+        engine_ops_read = create_engine(
+            url_ops_read,
+            pool_pre_ping=True,
+            pool_size=5,
+            max_overflow=10,
+            pool_recycle=3600,
+            echo=settings.DEBUG
+        )
+        
+        SessionLocalOpsRead = sessionmaker(
+            autocommit=False,
+            autoflush=False,
+            bind=engine_ops_read
+        )
+        
+        logger.info("✓ Operations read replica engine created")
+    except Exception as e:
+        logger.warning(f"⚠ Read replica unavailable, reads use the primary: {e}")
+        engine_ops_read = None
+        SessionLocalOpsRead = None
+
+
+class ReadReplicaMonitor:
+    """
+    Decides whether reads may go to the replica
+
+    Lag is estimated every READ_REPLICA_LAG_CHECK_SECONDS as the difference
+    between the newest Report.updatedAt on the primary and on the replica
+    (two index seeks on IX_Report_UpdatedAt). The estimate errs high when
+    writes are sparse, which only sends reads to the primary.
+    """
+
+    def __init__(self):
+        self.healthy = False
+        self.lag_seconds: Optional[float] = None
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _due(self) -> bool:
+        return self._checked_at is None or \
+            time.monotonic() - self._checked_at > settings.READ_REPLICA_LAG_CHECK_SECONDS
+
+    def _check(self) -> None:
+        query = text("SELECT MAX([updatedAt]) FROM [dbo].[Report]")
+        try:
+            with engine_ops.connect() as primary, engine_ops_read.connect() as replica:
+                primary_latest = primary.execute(query).scalar()
+                replica_latest = replica.execute(query).scalar()
+
+            if primary_latest is None or replica_latest == primary_latest:
+                self.lag_seconds = 0.0
+            elif replica_latest is None:
+                self.lag_seconds = float("inf")
+            else:
+                self.lag_seconds = max((primary_latest - replica_latest).total_seconds(), 0.0)
+
+            healthy = self.lag_seconds <= settings.READ_REPLICA_MAX_LAG_SECONDS
+            if healthy != self.healthy:
+                log = logger.info if healthy else logger.warning
+                log(f"{'✓' if healthy else '⚠'} Read replica {'in use' if healthy else 'lagging'} (lag {self.lag_seconds}s)")
+            self.healthy = healthy
+        except Exception as e:
+            logger.warning(f"⚠ Read replica check failed, reads use the primary: {e}")
+            self.healthy = False
+            self.lag_seconds = None
+        finally:
+            self._checked_at = time.monotonic()
+
+    def is_usable(self) -> bool:
+        if SessionLocalOpsRead is None:
+            return False
+        if self._due():
+            with self._lock:
+                if self._due():
+                    self._check()
+        return self.healthy
+
+    def stats(self) -> dict:
+        """Replica state (exposed on /health)"""
+        return {
+            "configured": SessionLocalOpsRead is not None,
+            "inUse": SessionLocalOpsRead is not None and self.healthy,
+            "lagSeconds": self.lag_seconds
+        }
+
+
+read_replica = ReadReplicaMonitor()
+
+
+@event.listens_for(Session, "before_flush")
+def _reject_read_only_writes(session: Session, flush_context, instances) -> None:
+    """Sessions from get_db_read must not write (they may be on a replica)"""
+    if session.info.get("read_only") and (session.new or session.dirty or session.deleted):
+        raise RuntimeError("Read-only session: use get_db_ops for writes")
+
+# ==========================================
+# 1c. Async Operations DB (for async endpoints)
+# ==========================================
+class ThreadedAsyncSession:
+    """
+    Thread-offloading adapter for sync-only drivers
+    
+    Exposes the subset of the AsyncSession API the services use (run_sync,
+    commit, rollback, close, info) over a regular Session. Each call runs in
+    a worker thread, so blocking pyodbc I/O never runs on the event loop.
+    Calls are awaited one at a time, so the Session is never used by two
+    threads at once.
+    """
+    
+    def __init__(self, sync_session: Session):
+        self.sync_session = sync_session
+    
+    @property
+    def info(self) -> dict:
+        return self.sync_session.info
+    
+    async def run_sync(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        return await asyncio.to_thread(fn, self.sync_session, *args, **kwargs)
+    
+    async def commit(self) -> None:
+        await asyncio.to_thread(self.sync_session.commit)
+    
+    async def rollback(self) -> None:
+        await asyncio.to_thread(self.sync_session.rollback)
+    
+    async def close(self) -> None:
+        await asyncio.to_thread(self.sync_session.close)
+
+
+def _async_driver() -> str:
+    """'aioodbc' (native AsyncEngine) or 'thread' (ThreadedAsyncSession over pyodbc)"""
+    driver = settings.DB_ASYNC_DRIVER
+    if driver == "auto":
+        return "aioodbc" if importlib.util.find_spec("aioodbc") else "thread"
+    if driver not in ("aioodbc", "thread"):
+        raise ValueError(f"Unknown DB_ASYNC_DRIVER '{driver}' (expected auto, aioodbc or thread)")
+    return driver
+
+
+def _create_async_sessionmaker(url: str):
+    engine = create_async_engine(
+        url.replace("mssql+pyodbc://", "mssql+aioodbc://", 1),
+        pool_pre_ping=True,
+        pool_size=5,
+        max_overflow=10,
+        pool_recycle=3600,
+        echo=settings.DEBUG
+    )
+    # Objects stay usable after commit without an implicit (sync) refresh
+    return engine, async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+
+engine_ops_async = None
+AsyncSessionLocalOps = None
+engine_ops_read_async = None
+AsyncSessionLocalOpsRead = None
+
+if _async_driver() == "aioodbc":
+    engine_ops_async, AsyncSessionLocalOps = _create_async_sessionmaker(url_ops)
+    if SessionLocalOpsRead is not None:
+        engine_ops_read_async, AsyncSessionLocalOpsRead = _create_async_sessionmaker(url_ops_read)
+    logger.info("✓ Async Operations database engine created (aioodbc)")
+else:
+    logger.info("✓ Async Operations sessions use thread offloading (pyodbc)")
+
+# Either kind of async session; services only use run_sync/commit/rollback/close/info
+AsyncDB = Union[AsyncSession, ThreadedAsyncSession]
+
+
+def _open_async_session(use_replica: bool) -> AsyncDB:
+    if AsyncSessionLocalOps is not None:
+        return AsyncSessionLocalOpsRead() if use_replica else AsyncSessionLocalOps()
+    return ThreadedAsyncSession(SessionLocalOpsRead() if use_replica else SessionLocalOps())
+
+def open_async_db_ops() -> AsyncDB:
+    """Async Operations DB session for background tasks (the caller closes it)"""
+    return _open_async_session(use_replica=False)
+
 # ==========================================
 # 2. Analytics DB (Cold Path - Reads)
 # ==========================================
@@ -107,6 +300,47 @@ def get_db_ops() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+def get_db_read() -> Generator[Session, None, None]:
+    """
+    Dependency for read-only endpoints (Operations DB read replica)
+    
+    Uses the replica while its lag is within READ_REPLICA_MAX_LAG_SECONDS,
+    otherwise the primary. Never commits: the transaction is released
+    when the session closes.
+    """
+    use_replica = read_replica.is_usable()
+    db = SessionLocalOpsRead() if use_replica else SessionLocalOps()
+    db.info["read_only"] = True
+    db.info["replica"] = use_replica
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db_ops() -> AsyncGenerator[AsyncDB, None]:
+    """Dependency for async HOT path endpoints (Operations DB, never blocks the event loop)"""
+    db = _open_async_session(use_replica=False)
+    try:
+        yield db
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    finally:
+        await db.close()
+
+async def get_async_db_read() -> AsyncGenerator[AsyncDB, None]:
+    """Async counterpart of get_db_read (replica when caught up, never commits)"""
+    # The periodic lag check does blocking I/O
+    use_replica = await asyncio.to_thread(read_replica.is_usable)
+    db = _open_async_session(use_replica)
+    db.info["read_only"] = True
+    db.info["replica"] = use_replica
+    try:
+        yield db
+    finally:
+        await db.close()
+
 def get_db_analytics() -> Generator[Session, None, None]:
     """Dependency for COLD path (Analytics DB)"""
     if not SessionLocalAnalytics:
@@ -5,11 +5,25 @@ from contextlib import asynccontextmanager
 import logging
 
 from app.core.config import get_settings
-from app.core.database import test_database_connections, engine_ops
-from app.api.v1 import reports, admin,users, auth
+from app.core.database import (
+    test_database_connections,
+    engine_ops,
+    engine_ops_read,
+    engine_ops_async,
+    engine_ops_read_async,
+    read_replica
+)
+from app.api.v1 import reports, admin,users, auth, storage
+from app.services.blob_service import init_blob_storage, close_blob_storage, sas_url_cache
+from app.services.thumbnail_service import init_thumbnail_pool, close_thumbnail_pool
+from app.services.purge_service import start_purge_worker, stop_purge_worker
+from app.services.attachment_content_service import attachment_cache
+from app.services.report_count_service import report_count_cache
+from app.services.report_cache import get_report_cache
+from app.services.report_cluster_service import report_clusters
 
 # Import models to register with SQLAlchemy (but don't use them directly)
-from app.models import user, report, attachment
+from app.models import user, report, attachment, blob_reference, upload_session, blob_purge, report_search_term, geocode_cache, report_cluster
 
 settings = get_settings()
 
@@ -31,10 +45,28 @@ async def lifespan(app: FastAPI):
         logger.critical(f"✗ Database connection failed: {e}", exc_info=True)
         raise SystemExit("Database connection failed")
     
+    try:
+        await init_blob_storage()
+    except Exception as e:
+        # Not fatal: requests retry lazily via get_blob_service()
+        logger.warning(f"⚠ Blob storage unavailable at startup: {e}")
+    
+    init_thumbnail_pool()
+    await start_purge_worker()
+    
     yield
     
     logger.info("Shutting down application...")
+    await stop_purge_worker()
+    close_thumbnail_pool()
+    await close_blob_storage()
     engine_ops.dispose()
+    if engine_ops_read:
+        engine_ops_read.dispose()
+    if engine_ops_async:
+        await engine_ops_async.dispose()
+    if engine_ops_read_async:
+        await engine_ops_read_async.dispose()
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -66,7 +98,13 @@ async def health_check():
         "databases": {
             "operations": "connected",
             "analytics": "connected" if settings.SQLALCHEMY_DATABASE_URI_ANALYTICS else "not configured"
-        }
+        },
+        "readReplica": read_replica.stats(),
+        "sasCache": sas_url_cache.stats(),
+        "attachmentCache": attachment_cache.stats(),
+        "countCache": report_count_cache.stats(),
+        "reportCache": get_report_cache().stats(),
+        "clusters": report_clusters.stats()
     }
 
 # Register routers
@@ -94,6 +132,14 @@ app.include_router(
     tags=["Auth"]
 )
 
+# Signed blob URLs of the filesystem backend resolve here
+if settings.STORAGE_BACKEND == "local":
+    app.include_router(
+        storage.router,
+        prefix="/api/v1/storage",
+        tags=["Storage"]
+    )
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     logger.error(f"Unhandled exception: {str(exc)}", exc_info=True)
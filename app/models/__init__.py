@@ -4,6 +4,12 @@ from app.core.database import BaseOps  # ✅ Import correct base
 from app.models.user import User
 from app.models.report import Report
 from app.models.attachment import Attachment
+from app.models.blob_reference import BlobReference
+from app.models.upload_session import UploadSession
+from app.models.blob_purge import BlobPurge
+from app.models.report_search_term import ReportSearchTerm
+from app.models.geocode_cache import GeocodeCache
+from app.models.report_cluster import ReportCluster
 
 # Export for convenience
-__all__ = ['BaseOps', 'User', 'Report', 'Attachment']
\ No newline at end of file
+__all__ = ['BaseOps', 'User', 'Report', 'Attachment', 'BlobReference', 'UploadSession', 'BlobPurge', 'ReportSearchTerm', 'GeocodeCache', 'ReportCluster']
\ No newline at end of file
@@ -24,6 +24,10 @@ class Attachment(BaseOps):
     
     # Metadata Columns
     blobStorageUri = Column("blobStorageUri", String(2048), nullable=False)
+    # SHA-256 of the content; set for deduplicated blobs (see BlobReference)
+    contentHash = Column("contentHash", String(64), nullable=True, index=True)
+    # WebP thumbnail / video poster frame, stored next to the original blob
+    thumbnailUri = Column("thumbnailUri", String(2048), nullable=True)
     mimeType = Column("mimeType", String(100), nullable=False)
     fileType = Column("fileType", String(50), nullable=False)
     fileSizeBytes = Column(
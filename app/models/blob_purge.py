@@ -0,0 +1,28 @@
+from sqlalchemy import Column, String, BigInteger, Integer, DateTime, func
+
+from app.core.database import BaseOps
+
+class BlobPurge(BaseOps):
+    """
+    Outbox of blobs waiting to be deleted from storage.
+    Rows are written in the same transaction as the DB delete and drained
+    by the background purge worker, so a failed blob delete is retried
+    instead of lost.
+    """
+    __tablename__ = "BlobPurge"
+    __table_args__ = {'schema': 'dbo'}
+
+    # Primary Key
+    purgeId = Column("purgeId", BigInteger, primary_key=True, autoincrement=True)
+
+    blobStorageUri = Column("blobStorageUri", String(2048), nullable=False)
+
+    # Retry bookkeeping
+    attempts = Column("attempts", Integer, nullable=False, default=0)
+    nextAttemptAt = Column("nextAttemptAt", DateTime, nullable=False, server_default=func.getutcdate())
+    lastError = Column("lastError", String(1000), nullable=True)
+
+    enqueuedAt = Column("enqueuedAt", DateTime, nullable=False, server_default=func.getutcdate())
+
+    def __repr__(self):
+        return f"<BlobPurge(purgeId={self.purgeId}, attempts={self.attempts})>"
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, String, Integer, DateTime, CheckConstraint, func
+
+from app.core.database import BaseOps
+
+class BlobReference(BaseOps):
+    """
+    Reference count for a content-addressed attachment blob.
+    One row per stored blob; the blob is deleted when refCount reaches 0.
+    """
+    __tablename__ = "BlobReference"
+    __table_args__ = (
+        CheckConstraint('refCount >= 0', name='CK_BlobReference_RefCount'),
+        {'schema': 'dbo'}
+    )
+
+    # Primary Key (SHA-256 hex digest, also the blob name)
+    contentHash = Column("contentHash", String(64), primary_key=True)
+
+    blobStorageUri = Column("blobStorageUri", String(2048), nullable=False)
+    refCount = Column("refCount", Integer, nullable=False, default=0)
+
+    createdAt = Column("createdAt", DateTime, nullable=False, server_default=func.getutcdate())
+
+    def __repr__(self):
+        return f"<BlobReference(contentHash={self.contentHash}, refCount={self.refCount})>"
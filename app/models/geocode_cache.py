@@ -0,0 +1,23 @@
+from sqlalchemy import Column, String, Float, DateTime, func
+
+from app.core.database import BaseOps
+
+class GeocodeCache(BaseOps):
+    """
+    Known places (landmarks, police stations, common addresses) with their
+    coordinates, keyed by normalized address text. Consulted at ingest for
+    report locations that carry no coordinates.
+    """
+    __tablename__ = "GeocodeCache"
+    __table_args__ = {'schema': 'dbo'}
+
+    # Primary Key (geolocation.address_key of the address text)
+    addressKey = Column("addressKey", String(450), primary_key=True)
+
+    latitude = Column("latitude", Float, nullable=False)
+    longitude = Column("longitude", Float, nullable=False)
+
+    createdAt = Column("createdAt", DateTime, nullable=False, server_default=func.getutcdate())
+
+    def __repr__(self):
+        return f"<GeocodeCache(addressKey={self.addressKey}, latitude={self.latitude}, longitude={self.longitude})>"
@@ -23,6 +23,18 @@ class Report(BaseOps):
     descriptionText = Column("descriptionText", Text, nullable=False)
     locationRaw = Column("locationRaw", String(2048), nullable=True)
     
+    # Parsed from locationRaw at ingest (NULL if it has no resolvable coordinates)
+    latitude = Column("latitude", Float, nullable=True)
+    longitude = Column("longitude", Float, nullable=True)
+    geohash = Column("geohash", String(12), nullable=True)
+    
+    # Incident cluster (see ReportCluster); NULL without coordinates
+    clusterId = Column("clusterId", String(450), nullable=True)
+    
+    # Officer working the report (set by ReportQueueService.claim)
+    assignedTo = Column("assignedTo", String(450), nullable=True)
+    assignedAt = Column("assignedAt", DateTime, nullable=True)
+    
     status = Column("status", String(50), nullable=False, default="Submitted")
     categoryId = Column("categoryId", String(100), nullable=False)
 
@@ -57,6 +69,11 @@ class Report(BaseOps):
         back_populates="report",
         cascade="all, delete-orphan"
     )
+    cluster = relationship(
+        "ReportCluster",
+        primaryjoin="foreign(Report.clusterId) == ReportCluster.clusterId",
+        viewonly=True
+    )
 
     def __repr__(self):
         return f"<Report(reportId={self.reportId}, title={self.title})>"
\ No newline at end of file
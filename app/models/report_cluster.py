@@ -0,0 +1,29 @@
+from sqlalchemy import Column, String, Integer, Float, DateTime
+
+from app.core.database import BaseOps
+
+class ReportCluster(BaseOps):
+    """
+    Group of reports about the same incident: same category, close in
+    space and time. Maintained incrementally by ReportClusterService as
+    reports are created; the first report's ID is the cluster ID.
+    """
+    __tablename__ = "ReportCluster"
+    __table_args__ = {'schema': 'dbo'}
+
+    # Primary Key (reportId of the report that started the cluster)
+    clusterId = Column("clusterId", String(450), primary_key=True)
+
+    categoryId = Column("categoryId", String(100), nullable=False)
+
+    # Geohash cell of the first report, and running centroid of all reports
+    geohash = Column("geohash", String(12), nullable=False)
+    latitude = Column("latitude", Float, nullable=False)
+    longitude = Column("longitude", Float, nullable=False)
+
+    reportCount = Column("reportCount", Integer, nullable=False, default=1)
+    firstReportAt = Column("firstReportAt", DateTime, nullable=False)
+    lastReportAt = Column("lastReportAt", DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<ReportCluster(clusterId={self.clusterId}, reportCount={self.reportCount})>"
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, String, Integer, ForeignKey
+
+from app.core.database import BaseOps
+
+class ReportSearchTerm(BaseOps):
+    """
+    Inverted index for report search: one row per (normalized term, report).
+    Rows are written in the same transaction as the report; the FK cascade
+    removes them when the report is deleted.
+    """
+    __tablename__ = "ReportSearchTerm"
+    __table_args__ = {'schema': 'dbo'}
+
+    # Composite Primary Key (clustered on term, so a term's postings are one range seek)
+    term = Column("term", String(64), primary_key=True)
+    reportId = Column(
+        "reportId",
+        String(450),
+        ForeignKey("dbo.Report.reportId", ondelete="CASCADE"),
+        primary_key=True
+    )
+
+    # Weighted term frequency (title occurrences count more)
+    weight = Column("weight", Integer, nullable=False)
+
+    def __repr__(self):
+        return f"<ReportSearchTerm(term={self.term}, reportId={self.reportId}, weight={self.weight})>"
@@ -0,0 +1,37 @@
+from sqlalchemy import Column, String, BigInteger, DateTime, CheckConstraint, func
+
+from app.core.database import BaseOps
+
+class UploadSession(BaseOps):
+    """
+    Resumable (tus-style) upload of a single attachment.
+    Chunks are staged as blob blocks; uploadOffset is the number of bytes staged.
+    """
+    __tablename__ = "UploadSession"
+    __table_args__ = (
+        CheckConstraint('uploadOffset >= 0 AND uploadOffset <= uploadLength', name='CK_UploadSession_Offset'),
+        {'schema': 'dbo'}
+    )
+
+    # Primary Key
+    uploadId = Column("uploadId", String(450), primary_key=True)
+
+    # Target blob and file metadata
+    blobName = Column("blobName", String(450), nullable=False)
+    filename = Column("filename", String(255), nullable=False)
+    mimeType = Column("mimeType", String(100), nullable=False)
+
+    # Progress
+    uploadLength = Column("uploadLength", BigInteger, nullable=False)
+    uploadOffset = Column("uploadOffset", BigInteger, nullable=False, default=0)
+    status = Column("status", String(20), nullable=False, default="active")  # active | completed
+
+    # Set once the finished blob is attached to a report
+    attachmentId = Column("attachmentId", String(450), nullable=True)
+
+    # Timestamps
+    createdAt = Column("createdAt", DateTime, nullable=False, server_default=func.getutcdate())
+    expiresAt = Column("expiresAt", DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<UploadSession(uploadId={self.uploadId}, offset={self.uploadOffset}/{self.uploadLength})>"
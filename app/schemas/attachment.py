@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List, Dict
 from enum import Enum
 from datetime import datetime
 
@@ -22,10 +22,47 @@ class AttachmentResponse(BaseModel):
     reportId: str
     blobStorageUri: str
     downloadUrl: Optional[str] = None  # Temporary SAS URL for downloading
+    thumbnailUrl: Optional[str] = None  # Temporary SAS URL of a small WebP preview
     mimeType: str
     fileType: str
     fileSizeBytes: int
     createdAt: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Schemas for DIRECT UPLOADS (Client -> Blob Storage, metadata only via API)
+class UploadTicketFile(BaseModel):
+    filename: str = Field(..., min_length=1, max_length=255)
+    mimeType: str = Field(..., description="MIME type the client will upload with.")
+    fileSizeBytes: int = Field(..., gt=0, le=52428800, description="Expected size of the file in bytes (max 50MB).")
+
+class UploadTicketRequest(BaseModel):
+    files: List[UploadTicketFile] = Field(..., min_length=1, max_length=10)
+
+class UploadTicketResponse(BaseModel):
+    filename: str
+    blobStorageUri: str  # Pass back in the finalize request
+    uploadUrl: str  # Write-only SAS URL: PUT the file bytes here
+    uploadHeaders: Dict[str, str]  # Headers the PUT request must include
+    expiresAt: datetime
+
+class AttachmentFinalize(BaseModel):
+    blobStorageUri: str = Field(..., description="blobStorageUri from an upload ticket.")
+
+# Schemas for RESUMABLE UPLOADS (tus-style upload sessions)
+class ResumableUploadCreate(BaseModel):
+    filename: str = Field(..., min_length=1, max_length=255)
+    mimeType: str = Field(..., max_length=100)
+    uploadLength: int = Field(..., gt=0, description="Total size of the file in bytes.")
+
+class ResumableUploadResponse(BaseModel):
+    uploadId: str
+    uploadUrl: str  # PATCH chunks here; HEAD returns the current offset
+    uploadOffset: int
+    uploadLength: int
+    status: str
+    expiresAt: datetime
+
+class ResumableUploadCommit(BaseModel):
+    reportId: str = Field(..., description="Report the finished file is attached to.")
@@ -1,9 +1,9 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, List
+from typing import Optional, List, Union
 from datetime import datetime
 from enum import Enum
 
-from app.schemas.attachment import AttachmentResponse, AttachmentCreate , FileType
+from app.schemas.attachment import AttachmentResponse, AttachmentCreate, AttachmentFinalize, FileType
 
 # Enums must match your SQL constraints exactly
 class ReportStatus(str, Enum):
@@ -50,6 +50,11 @@ class ReportCreate(ReportBase):
     # Nested Attachments: Client sends list of file metadata with the report
     attachments: List[AttachmentCreate] = []
 
+# Schema for FINALIZING a report whose files were uploaded directly to blob storage
+class ReportFinalize(ReportCreate):
+    userId: Optional[str] = None
+    attachments: List[AttachmentFinalize] = Field(..., min_length=1)
+
 # Schema for UPDATING a report (General Input)
 class ReportUpdate(BaseModel):
     title: Optional[str] = Field(None, min_length=3, max_length=500)
@@ -69,12 +74,18 @@ class ReportResponse(ReportBase):
     reportId: str
     status: ReportStatus
     location: str  # Matches [locationRaw] in DB
+    latitude: Optional[float] = None  # Parsed from location at ingest
+    longitude: Optional[float] = None
     aiConfidence: Optional[float] = None
     createdAt: datetime
     updatedAt: datetime
     userId: Optional[str] = None
     transcribedVoiceText: Optional[str] = None
     reportUrl : Optional[str] = None
+    clusterId: Optional[str] = None  # Incident cluster shared with near-duplicate reports
+    clusterSize: Optional[int] = None  # Number of reports in the cluster
+    assignedTo: Optional[str] = None  # Officer userId once claimed
+    assignedAt: Optional[datetime] = None
     
     # Returns full attachment objects
     attachments: List[AttachmentResponse] = []
@@ -98,10 +109,58 @@ class ReportResponse(ReportBase):
         populate_by_name=True
     )
 
+# Lightweight list item for view=summary (no text bodies, no attachment objects)
+class ReportSummary(BaseModel):
+    reportId: str
+    title: str
+    status: ReportStatus
+    categoryId: Optional[ReportCategory] = None
+    createdAt: datetime
+    attachmentCount: int = 0
+
+    model_config = ConfigDict(from_attributes=True)
+
+# Search hit: summary fields plus relevance
+class ReportSearchResult(ReportSummary):
+    score: float
+
+class ReportSearchResponse(BaseModel):
+    reports: List[ReportSearchResult]  # Best match first
+    terms: List[str]  # Normalized query terms (for highlighting)
+    page: int
+    pageSize: int
+    hasMore: bool = False
+
+# Nearby hit: summary fields plus position
+class ReportNearbyResult(ReportSummary):
+    latitude: float
+    longitude: float
+    distanceMeters: Optional[float] = None  # Radius searches only
+
+class ReportNearbyResponse(BaseModel):
+    reports: List[ReportNearbyResult]  # Nearest first (radius) or newest first (bounding box)
+    pageSize: int
+    truncated: bool = False  # More reports matched than were ranked or returned
+
 # --- NEW: Schema for LIST responses ---
 class ReportListResponse(BaseModel):
-    reports: List[ReportResponse]
-    total: int
-    page: int
+    reports: List[Union[ReportResponse, ReportSummary]]
+    nextCursor: Optional[str] = None  # Pass as ?cursor= for the next page; null on the last page
+    total: Optional[int] = None  # Only with include_total=true
+    totalIsApproximate: bool = False  # count_mode=approximate, or a cached total (may lag other workers by the cache TTL)
+    page: Optional[int] = None  # Offset (skip) pagination only
     pageSize: int
-    totalPages: int
\ No newline at end of file
+    totalPages: Optional[int] = None
+
+# Officer work queue: claim the oldest Submitted reports
+class ReportClaimRequest(BaseModel):
+    limit: int = Field(1, ge=1, le=50)
+    categories: Optional[List[ReportCategory]] = None  # Any category when omitted
+
+# Schema for fetching many reports in one request (officer console)
+class ReportBatchGetRequest(BaseModel):
+    reportIds: List[str] = Field(..., min_length=1, max_length=500)
+
+class ReportBatchGetResponse(BaseModel):
+    reports: List[ReportResponse]  # In request order, duplicates removed
+    missing: List[str] = []  # Requested IDs that do not exist
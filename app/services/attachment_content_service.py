@@ -0,0 +1,356 @@
+import asyncio
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, Optional, Tuple
+
+from fastapi import BackgroundTasks, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.attachment import Attachment
+from app.services.blob_service import get_async_blob_service
+from app.services.report_documents import etag_matches
+
+logger = logging.getLogger(__name__)
+
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# Partial fills older than this were abandoned by a crashed worker
+STALE_PART_SECONDS = 3600
+
+
+class AttachmentDiskCache:
+    """
+    Size-bounded on-disk LRU of attachment blobs, shared by the workers on a node
+
+    Attachment blobs are immutable (content-addressed or UUID-named), so a
+    cached copy never needs revalidation. Recency is the file mtime, touched
+    on every hit, so all worker processes share one cache without a separate
+    index; eviction scans the directory, which only happens after a fill.
+    """
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._filling: set = set()
+
+    def lookup(self, blob_name: str) -> Optional[BinaryIO]:
+        """
+        Open the cached file and mark it recently used, or return None
+
+        The file is opened here, not when streaming starts: another worker's
+        eviction can unlink it at any time, and an open handle keeps reading
+        the unlinked file, whereas a later open would fail mid-response.
+        Blocking; call it through asyncio.to_thread.
+        """
+        path = self.root / blob_name
+        try:
+            handle = open(path, 'rb')
+        except OSError:
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass  # Evicted just now; the open handle still reads it
+        self.hits += 1
+        return handle
+
+    def contains(self, blob_name: str) -> bool:
+        return (self.root / blob_name).is_file()
+
+    def accepts(self, size: int) -> bool:
+        """Large files would flush the whole cache, so only cache up to a quarter of it"""
+        return 0 < size <= self.max_bytes // 4
+
+    def begin_fill(self, blob_name: str) -> Optional[Path]:
+        """Reserve a fill and return its temporary path (None if already in progress here)"""
+        if blob_name in self._filling:
+            return None
+        self._filling.add(blob_name)
+        self.root.mkdir(parents=True, exist_ok=True)
+        return self.root / f".{blob_name}.{uuid.uuid4().hex}.part"
+
+    async def finish_fill(self, blob_name: str, temp_path: Path, complete: bool) -> None:
+        """Publish a completed fill (atomic rename) or discard a partial one"""
+        self._filling.discard(blob_name)
+        # Eviction scans and stats the whole directory: keep it off the event loop
+        await asyncio.to_thread(self._finish_fill, blob_name, temp_path, complete)
+
+    def _finish_fill(self, blob_name: str, temp_path: Path, complete: bool) -> None:
+        try:
+            if complete:
+                os.replace(temp_path, self.root / blob_name)
+                self._evict()
+            else:
+                temp_path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"⚠ Attachment cache fill of {blob_name} failed: {e}")
+
+    def _evict(self) -> None:
+        """Delete least recently used files until the cache fits in max_bytes"""
+        entries = []
+        total = 0
+        now = time.time()
+
+        for entry in os.scandir(self.root):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            if entry.name.startswith('.'):
+                if now - stat.st_mtime > STALE_PART_SECONDS:
+                    Path(entry.path).unlink(missing_ok=True)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            Path(path).unlink(missing_ok=True)
+            total -= size
+
+    def stats(self) -> dict:
+        """Cache metrics (exposed on /health)"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+attachment_cache = AttachmentDiskCache(settings.ATTACHMENT_CACHE_PATH, settings.ATTACHMENT_CACHE_MAX_BYTES)
+
+
+def parse_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range "bytes=" header into an inclusive (start, end)
+
+    Returns:
+        (start, end), or None to serve the whole file (no header, or a
+        multi-range / non-byte request, which servers may ignore)
+
+    Raises:
+        HTTPException: 416 if the range cannot be satisfied
+    """
+    if not range_header or not range_header.startswith("bytes=") or ',' in range_header:
+        return None
+
+    start_text, _, end_text = range_header[len("bytes="):].strip().partition('-')
+
+    try:
+        if not start_text:
+            # Suffix range: the last N bytes ("bytes=-0" selects nothing: 416)
+            suffix = int(end_text)
+            if suffix < 0:
+                raise ValueError
+            start, end = (max(0, size - suffix), size - 1) if suffix else (size, size - 1)
+        else:
+            start = int(start_text)
+            end = min(int(end_text), size - 1) if end_text else size - 1
+    except ValueError:
+        return None
+
+    if start >= size or start > end:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+
+    return start, end
+
+
+class AttachmentContentService:
+    """Streams attachment bytes through the API with Range and ETag support"""
+
+    @staticmethod
+    def get_attachment(db: Session, report_id: str, attachment_id: str) -> Attachment:
+        """Get an attachment of a report, or 404"""
+        attachment = db.query(Attachment).filter(
+            Attachment.attachmentId == attachment_id,
+            Attachment.reportId == report_id
+        ).first()
+
+        if not attachment:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Attachment {attachment_id} not found on report {report_id}"
+            )
+        return attachment
+
+    @staticmethod
+    async def build_response(
+        attachment: Attachment,
+        background_tasks: BackgroundTasks,
+        range_header: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+        if_range: Optional[str] = None
+    ) -> Response:
+        """
+        Serve an attachment, or the requested byte range of it
+
+        Cache hits are read from local disk. Misses are streamed from blob
+        storage (only the requested range), and the whole blob is copied
+        into the cache: inline for full downloads, in the background for
+        ranged ones, so a video being scrubbed is local after the first seek.
+
+        Args:
+            attachment: Attachment to serve
+            background_tasks: Used to fill the cache after a ranged miss
+            range_header: Range request header
+            if_none_match: If-None-Match request header
+            if_range: If-Range request header
+
+        Returns:
+            304, 200 or 206 response
+
+        Raises:
+            HTTPException: 416 for unsatisfiable ranges, 502 if storage fails
+        """
+        blob_name = attachment.blobStorageUri.split('/')[-1].split('?')[0]
+        size = attachment.fileSizeBytes
+        # Blobs are never rewritten, so the content hash (or unique blob name) is a strong validator
+        etag = f'"{attachment.contentHash or blob_name}"'
+
+        headers = {
+            "ETag": etag,
+            "Accept-Ranges": "bytes",
+            "Cache-Control": "private, max-age=86400, immutable"
+        }
+
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        if not size:
+            return Response(content=b"", media_type=attachment.mimeType, headers=headers)
+
+        # If-Range uses strong comparison (a weak validator never matches).
+        # A stale If-Range means the client's partial copy is outdated: send everything
+        byte_range = parse_range(range_header, size) if not if_range or if_range.strip() == etag else None
+        start, end = byte_range or (0, size - 1)
+        length = end - start + 1
+
+        headers["Content-Length"] = str(length)
+        status_code = status.HTTP_200_OK
+        if byte_range:
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            status_code = status.HTTP_206_PARTIAL_CONTENT
+
+        cached_file = await asyncio.to_thread(attachment_cache.lookup, blob_name)
+        if cached_file:
+            body = AttachmentContentService._read_file(cached_file, start, length)
+        else:
+            body = await AttachmentContentService._prime(
+                get_async_blob_service().download_range(blob_name, start, length)
+            )
+
+            if attachment_cache.accepts(size):
+                if byte_range:
+                    background_tasks.add_task(AttachmentContentService.fill_cache, blob_name, size)
+                else:
+                    body = AttachmentContentService._tee_to_cache(body, blob_name, size)
+
+        return StreamingResponse(
+            body,
+            status_code=status_code,
+            media_type=attachment.mimeType,
+            headers=headers
+        )
+
+    @staticmethod
+    async def fill_cache(blob_name: str, size: int) -> None:
+        """Copy a whole blob into the disk cache (background task after a ranged miss)"""
+        if attachment_cache.contains(blob_name):
+            return
+
+        temp_path = attachment_cache.begin_fill(blob_name)
+        if temp_path is None:
+            return
+
+        written = 0
+        try:
+            output = await asyncio.to_thread(open, temp_path, 'wb')
+            try:
+                async for chunk in get_async_blob_service().download_range(blob_name):
+                    await asyncio.to_thread(output.write, chunk)
+                    written += len(chunk)
+            finally:
+                await asyncio.to_thread(output.close)
+        except Exception as e:
+            logger.warning(f"⚠ Could not cache attachment {blob_name}: {e}")
+        finally:
+            await attachment_cache.finish_fill(blob_name, temp_path, complete=written == size)
+
+    @staticmethod
+    async def _read_file(handle: BinaryIO, start: int, length: int) -> AsyncIterator[bytes]:
+        """Stream a byte range of an open cached file (closes it)"""
+        try:
+            await asyncio.to_thread(handle.seek, start)
+            remaining = length
+            while remaining > 0:
+                chunk = await asyncio.to_thread(handle.read, min(remaining, STREAM_CHUNK_SIZE))
+                if not chunk:
+                    return
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            await asyncio.to_thread(handle.close)
+
+    @staticmethod
+    async def _prime(stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """
+        Start a storage download before the response headers are sent
+
+        Fetching the first chunk up front turns a missing blob or storage
+        outage into a 502 instead of a truncated 200.
+        """
+        try:
+            first = await stream.__anext__()
+        except StopAsyncIteration:
+            first = b""
+        except Exception as e:
+            logger.error(f"Storage error streaming attachment: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail="Attachment could not be read from storage"
+            )
+
+        async def chained() -> AsyncIterator[bytes]:
+            if first:
+                yield first
+            async for chunk in stream:
+                yield chunk
+
+        return chained()
+
+    @staticmethod
+    async def _tee_to_cache(body: AsyncIterator[bytes], blob_name: str, size: int) -> AsyncIterator[bytes]:
+        """Pass a full download through to the client while writing it to the cache"""
+        temp_path = attachment_cache.begin_fill(blob_name)
+        if temp_path is None:
+            async for chunk in body:
+                yield chunk
+            return
+
+        written = 0
+        output = await asyncio.to_thread(open, temp_path, 'wb')
+        try:
+            async for chunk in body:
+                await asyncio.to_thread(output.write, chunk)
+                written += len(chunk)
+                yield chunk
+        finally:
+            # Disconnected clients leave a partial file, which is discarded
+            await asyncio.to_thread(output.close)
+            await attachment_cache.finish_fill(blob_name, temp_path, complete=written == size)
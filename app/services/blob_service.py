@@ -1,16 +1,467 @@
 from azure.storage.blob import BlobServiceClient, generate_blob_sas, BlobSasPermissions, ContentSettings
+from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
 from azure.core.exceptions import AzureError
+from abc import ABC, abstractmethod
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Optional, BinaryIO, Any, List, Iterator, AsyncIterator
+from collections import OrderedDict
+from functools import lru_cache
+import hashlib
+import math
+import re
+import threading
 import uuid
 import logging
 
 from app.core.config import settings
 logger = logging.getLogger(__name__)
 
+# Blob names issued by generate_upload_url. No other write path uses the
+# prefix, so content-addressed blobs, thumbnails and resumable uploads can
+# never be claimed through finalize_report_with_blobs.
+UPLOAD_TICKET_PREFIX = "direct-"
+_UPLOAD_TICKET_NAME = re.compile(
+    rf"^{UPLOAD_TICKET_PREFIX}[0-9a-f]{{8}}-[0-9a-f]{{4}}-[0-9a-f]{{4}}-[0-9a-f]{{4}}-[0-9a-f]{{12}}\.[A-Za-z0-9]{{1,16}}$"
+)
 
 
-class BlobStorageService:
+
+@lru_cache(maxsize=4)
+def _parse_account_key(conn_str: Optional[str]) -> Optional[str]:
+    """Extract account key from a connection string (parsed once per string)"""
+    for part in (conn_str or '').split(';'):
+        if part.startswith('AccountKey='):
+            return part[len('AccountKey='):]
+    return None
+
+
+def snap_expiry(ttl: timedelta, bucket_minutes: int, now: Optional[datetime] = None) -> datetime:
+    """
+    Round now + ttl UP to the next bucket boundary
+    
+    Every signature made within one bucket gets the same expiry, so the
+    SAS URL is identical and cacheable, and it is never valid for less
+    than the requested ttl.
+    """
+    now = now or datetime.now(timezone.utc)
+    bucket_seconds = max(1, bucket_minutes) * 60
+    snapped = math.ceil((now + ttl).timestamp() / bucket_seconds) * bucket_seconds
+    return datetime.fromtimestamp(snapped, tz=timezone.utc)
+
+
+class SasUrlCache:
+    """In-process LRU of signed download URLs, keyed by blob name and expiry bucket"""
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: tuple) -> Optional[str]:
+        with self._lock:
+            url = self._entries.get(key)
+            if url is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return url
+    
+    def put(self, key: tuple, url: str) -> None:
+        with self._lock:
+            self._entries[key] = url
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def stats(self) -> dict:
+        """Cache metrics (exposed on /health)"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries)
+            }
+
+
+sas_url_cache = SasUrlCache(settings.SAS_CACHE_MAX_ENTRIES)
+
+
+class BlobSasMixin:
+    """
+    SAS URL signing shared by the sync and async storage services
+    
+    Defaults target Azure (blob_service_client); other backends override
+    container_url, get_blob_url and _sign_blob.
+    """
+    
+    @property
+    def container_url(self) -> str:
+        """Base URL of the attachment container (no trailing slash)"""
+        return self.blob_service_client.get_container_client(self.container_name).url.rstrip('/')
+    
+    def get_blob_url(self, blob_name: str) -> str:
+        """
+        Get the full URL for a blob
+        
+        Args:
+            blob_name: Name of the blob
+        
+        Returns:
+            Full blob URL
+        """
+        blob_client = self.blob_service_client.get_blob_client(
+            container=self.container_name,
+            blob=blob_name
+        )
+        return blob_client.url
+    
+    def generate_download_url(
+        self, 
+        blob_url: str,
+        expiry_hours: int = 1
+    ) -> Optional[str]:
+        """
+        Generate temporary download URL with SAS token
+        
+        Expiries are snapped to SAS_EXPIRY_BUCKET_MINUTES boundaries, so
+        repeat reads within a bucket return the identical, cached URL.
+        
+        Args:
+            blob_url: Permanent blob URL
+            expiry_hours: Minimum hours until SAS token expires (default: 1)
+        
+        Returns:
+            Temporary URL with SAS token, or None if failed
+        """
+        try:
+            # Extract blob name from URL
+            blob_name = blob_url.split('/')[-1].split('?')[0]
+            expiry = snap_expiry(timedelta(hours=expiry_hours), settings.SAS_EXPIRY_BUCKET_MINUTES)
+            
+            cache_key = (self.container_name, blob_name, expiry)
+            cached_url = sas_url_cache.get(cache_key)
+            if cached_url:
+                return cached_url
+            
+            # Generate SAS token with read permission
+            sas_token = self._sign_blob(
+                blob_name,
+                permission=BlobSasPermissions(read=True),
+                expiry=expiry
+            )
+            
+            if not sas_token:
+                return None
+            
+            # Return URL with SAS token
+            base_url = blob_url.split('?')[0]  # Remove existing SAS if any
+            download_url = f"{base_url}?{sas_token}"
+            sas_url_cache.put(cache_key, download_url)
+            
+            logger.debug(f"Generated SAS URL for {blob_name} (expires {expiry.isoformat()})")
+            return download_url
+        
+        except AzureError as e:
+            logger.error(f"Azure error generating SAS token for {blob_url}: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error generating SAS token: {e}")
+            return None
+    
+    def generate_upload_url(
+        self,
+        filename: str,
+        expiry_minutes: Optional[int] = None
+    ) -> Optional[dict]:
+        """
+        Generate a short-lived, write-only SAS URL for a direct client upload
+        
+        The client PUTs the file straight to blob storage, so the bytes never
+        pass through the API workers.
+        
+        Args:
+            filename: Original filename (used for the blob extension)
+            expiry_minutes: Minutes until the SAS expires (default: BLOB_UPLOAD_TICKET_EXPIRY_MINUTES)
+        
+        Returns:
+            Dictionary with 'blob_name', 'blob_url', 'upload_url' and 'expires_at',
+            or None if failed
+        """
+        expiry_minutes = expiry_minutes or settings.BLOB_UPLOAD_TICKET_EXPIRY_MINUTES
+        
+        try:
+            file_extension = re.sub(r'[^A-Za-z0-9]', '', filename.split('.')[-1])[:16] if '.' in filename else ''
+            blob_name = f"{UPLOAD_TICKET_PREFIX}{uuid.uuid4()}.{file_extension or 'bin'}"
+            expires_at = datetime.now(timezone.utc) + timedelta(minutes=expiry_minutes)
+            
+            # Create/write only: the ticket cannot read, list or delete anything
+            sas_token = self._sign_blob(
+                blob_name,
+                permission=BlobSasPermissions(create=True, write=True),
+                expiry=expires_at
+            )
+            
+            if not sas_token:
+                return None
+            
+            blob_url = self.get_blob_url(blob_name)
+            
+            logger.debug(f"Issued upload ticket for {blob_name} (expires in {expiry_minutes}m)")
+            return {
+                'blob_name': blob_name,
+                'blob_url': blob_url,
+                'upload_url': f"{blob_url}?{sas_token}",
+                'expires_at': expires_at
+            }
+        
+        except AzureError as e:
+            logger.error(f"Azure error generating upload SAS for '{filename}': {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error generating upload SAS: {e}")
+            return None
+    
+    def is_upload_ticket_url(self, blob_url: str) -> bool:
+        """Check that a URL points at a blob of this container named by generate_upload_url"""
+        container_url = self.container_url
+        base_url = blob_url.split('?')[0]
+        
+        if not base_url.startswith(f"{container_url}/"):
+            return False
+        
+        return bool(_UPLOAD_TICKET_NAME.match(base_url[len(container_url) + 1:]))
+    
+    def _sign_blob(
+        self,
+        blob_name: str,
+        permission: BlobSasPermissions,
+        expiry: datetime
+    ) -> Optional[str]:
+        """Sign a blob-scoped SAS token with the account key"""
+        account_key = self._get_account_key()
+        
+        if not account_key:
+            logger.error("Could not extract account key from connection string")
+            return None
+        
+        return generate_blob_sas(
+            account_name=self.blob_service_client.account_name,
+            container_name=self.container_name,
+            blob_name=blob_name,
+            account_key=account_key,
+            permission=permission,
+            expiry=expiry
+        )
+    
+    def _get_account_key(self) -> Optional[str]:
+        """Extract account key from connection string"""
+        return _parse_account_key(settings.BLOB_STORAGE_CONNECTION_STRING)
+
+
+# ==========================================
+# Storage Backend Interface
+# ==========================================
+class StorageBackend(BlobSasMixin, ABC):
+    """
+    Sync attachment storage interface
+    
+    Implemented by BlobStorageService (Azure) and LocalBlobStorageService
+    (filesystem); select one with STORAGE_BACKEND.
+    """
+    
+    container_name: str
+    
+    @abstractmethod
+    def close(self) -> None:
+        """Release clients and connections"""
+    
+    @abstractmethod
+    def upload_file(self, file_content: bytes, filename: str, content_type: str) -> Optional[str]:
+        ...
+    
+    @abstractmethod
+    def upload_stream(
+        self,
+        stream: BinaryIO,
+        filename: str,
+        content_type: str,
+        chunk_size: Optional[int] = None
+    ) -> Optional[dict]:
+        ...
+    
+    @abstractmethod
+    def delete_file(self, blob_url: str) -> bool:
+        ...
+    
+    @abstractmethod
+    def delete_files_batch(self, blob_urls: List[str]) -> List[Optional[str]]:
+        ...
+    
+    @abstractmethod
+    def get_file_metadata(self, blob_url: str) -> Optional[dict]:
+        ...
+    
+    @abstractmethod
+    def list_blobs(self, prefix: Optional[str] = None) -> list:
+        ...
+    
+    @abstractmethod
+    def iter_blobs(self, prefix: Optional[str] = None, page_size: int = 5000) -> Iterator[Any]:
+        """Yield objects with name, size and last_modified, in name order"""
+
+
+class AsyncStorageBackend(BlobSasMixin, ABC):
+    """
+    Async attachment storage interface
+    
+    Use as an async context manager so the underlying resources are released.
+    """
+    
+    container_name: str
+    
+    async def __aenter__(self) -> "AsyncStorageBackend":
+        await self._ensure_container_exists()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+    
+    @abstractmethod
+    async def close(self) -> None:
+        ...
+    
+    @abstractmethod
+    async def _ensure_container_exists(self) -> None:
+        ...
+    
+    @abstractmethod
+    async def exists(self, blob_name: str) -> bool:
+        ...
+    
+    @abstractmethod
+    async def upload_stream(
+        self,
+        stream: Any,
+        filename: str,
+        content_type: str,
+        chunk_size: Optional[int] = None,
+        blob_name: Optional[str] = None
+    ) -> Optional[dict]:
+        ...
+    
+    @abstractmethod
+    async def upload_bytes(self, blob_name: str, data: bytes, content_type: str) -> Optional[str]:
+        ...
+    
+    @abstractmethod
+    async def stage_block_at(self, blob_name: str, offset: int, data: bytes) -> bool:
+        ...
+    
+    @abstractmethod
+    async def commit_staged_blocks(
+        self,
+        blob_name: str,
+        expected_size: int,
+        filename: str,
+        content_type: str
+    ) -> Optional[str]:
+        ...
+    
+    @abstractmethod
+    async def delete_file(self, blob_url: str) -> bool:
+        ...
+    
+    @abstractmethod
+    def download_range(
+        self,
+        blob_name: str,
+        offset: int = 0,
+        length: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """Stream `length` bytes (default: to the end) starting at `offset`"""
+    
+    async def upload_content_addressed(
+        self,
+        stream: Any,
+        filename: str,
+        content_type: str,
+        chunk_size: Optional[int] = None
+    ) -> Optional[dict]:
+        """
+        Upload a file under its SHA-256, skipping the upload if it is already stored
+        
+        The stream is hashed in a first local pass (UploadFile is spooled to
+        disk by the multipart parser), so identical content is detected before
+        any bytes go over the network.
+        
+        Args:
+            stream: Object with awaitable read(size) and seek(offset) methods
+            filename: Original filename
+            content_type: MIME type (e.g., 'image/png', 'video/mp4')
+            chunk_size: Read/block size in bytes (default: BLOB_UPLOAD_CHUNK_SIZE)
+        
+        Returns:
+            Dictionary with 'url', 'size', 'sha256' and 'created' (False when
+            the blob already existed), or None if failed.
+            Empty streams return size 0 with url None.
+        """
+        chunk_size = chunk_size or settings.BLOB_UPLOAD_CHUNK_SIZE
+        
+        try:
+            hasher = hashlib.sha256()
+            size = 0
+            
+            while True:
+                chunk = await stream.read(chunk_size)
+                if not chunk:
+                    break
+                hasher.update(chunk)
+                size += len(chunk)
+            
+            content_hash = hasher.hexdigest()
+            if size == 0:
+                return {'url': None, 'size': 0, 'sha256': content_hash, 'created': False}
+            
+            if await self.exists(content_hash):
+                logger.info(f"✓ Deduplicated file: {content_hash} ({size} bytes)")
+                return {
+                    'url': self.get_blob_url(content_hash),
+                    'size': size,
+                    'sha256': content_hash,
+                    'created': False
+                }
+            
+            await stream.seek(0)
+            result = await self.upload_stream(
+                stream=stream,
+                filename=filename,
+                content_type=content_type,
+                chunk_size=chunk_size,
+                blob_name=content_hash
+            )
+            
+            if not result:
+                return None
+            
+            if result['sha256'] != content_hash:
+                # Content changed between passes; never keep a mislabelled blob
+                await self.delete_file(result['url'])
+                logger.error(f"Content of '{filename}' changed during upload")
+                return None
+            
+            return {**result, 'created': True}
+        
+        except Exception as e:
+            logger.error(f"Unexpected error uploading file '{filename}': {e}")
+            return None
+
+
+class BlobStorageService(StorageBackend):
     """Azure Blob Storage operations for report attachments"""
     
     def __init__(self):
@@ -25,6 +476,10 @@ class BlobStorageService:
         # Ensure container exists
         self._ensure_container_exists()
     
+    def close(self) -> None:
+        """Close the underlying HTTP session"""
+        self.blob_service_client.close()
+    
     def _ensure_container_exists(self):
         """Create container if it doesn't exist"""
         try:
@@ -89,6 +544,84 @@ class BlobStorageService:
             logger.error(f"Unexpected error uploading file '{filename}': {e}")
             return None
     
+    def upload_stream(
+        self,
+        stream: BinaryIO,
+        filename: str,
+        content_type: str,
+        chunk_size: Optional[int] = None
+    ) -> Optional[dict]:
+        """
+        Upload a file-like object to Azure Blob Storage as staged blocks
+        
+        Reads the stream in bounded chunks and stages each one as a block,
+        so memory use stays constant regardless of file size. The size and
+        SHA-256 of the content are computed while the bytes pass through.
+        
+        Args:
+            stream: Binary file-like object (e.g., UploadFile.file)
+            filename: Original filename
+            content_type: MIME type (e.g., 'image/png', 'video/mp4')
+            chunk_size: Block size in bytes (default: BLOB_UPLOAD_CHUNK_SIZE)
+        
+        Returns:
+            Dictionary with 'url', 'size' and 'sha256', or None if failed.
+            Empty streams are not committed and return size 0 with url None.
+        """
+        chunk_size = chunk_size or settings.BLOB_UPLOAD_CHUNK_SIZE
+        
+        try:
+            file_extension = filename.split('.')[-1] if '.' in filename else 'bin'
+            blob_name = f"{uuid.uuid4()}.{file_extension}"
+            
+            blob_client = self.blob_service_client.get_blob_client(
+                container=self.container_name,
+                blob=blob_name
+            )
+            
+            hasher = hashlib.sha256()
+            size = 0
+            block_ids = []
+            
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                
+                # Block IDs must have equal length within a blob (SDK base64-encodes them)
+                block_id = f"{len(block_ids):08d}"
+                blob_client.stage_block(block_id=block_id, data=chunk, length=len(chunk))
+                block_ids.append(block_id)
+                
+                hasher.update(chunk)
+                size += len(chunk)
+            
+            if size == 0:
+                # Nothing was staged, so no blob exists to clean up
+                return {'url': None, 'size': 0, 'sha256': hasher.hexdigest()}
+            
+            content_hash = hasher.hexdigest()
+            blob_client.commit_block_list(
+                block_ids,
+                content_settings=ContentSettings(content_type=content_type),
+                metadata={
+                    'original_filename': filename,
+                    'uploaded_at': datetime.now(timezone.utc).isoformat(),
+                    'sha256': content_hash
+                }
+            )
+            
+            logger.info(f"✓ Streamed file: {blob_name} ({size} bytes, {len(block_ids)} blocks)")
+            
+            return {'url': blob_client.url, 'size': size, 'sha256': content_hash}
+        
+        except AzureError as e:
+            logger.error(f"Azure error streaming file '{filename}': {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error streaming file '{filename}': {e}")
+            return None
+    
     def delete_file(self, blob_url: str) -> bool:
         """
         Delete file from Azure Blob Storage
@@ -119,66 +652,42 @@ class BlobStorageService:
             logger.error(f"Unexpected error deleting file: {e}")
             return False
     
-    def generate_download_url(
-        self, 
-        blob_url: str,
-        expiry_hours: int = 1
-    ) -> Optional[str]:
+    def delete_files_batch(self, blob_urls: List[str]) -> List[Optional[str]]:
         """
-        Generate temporary download URL with SAS token
+        Delete up to 256 blobs with a single batch request
         
         Args:
-            blob_url: Permanent blob URL
-            expiry_hours: Number of hours until SAS token expires (default: 1)
+            blob_urls: Full blob URLs
         
         Returns:
-            Temporary URL with SAS token, or None if failed
+            One entry per URL, in order: None if the blob was deleted (or was
+            already gone), otherwise an error description
         """
+        if not blob_urls:
+            return []
+        
+        blob_names = [blob_url.split('/')[-1].split('?')[0] for blob_url in blob_urls]
+        
         try:
-            # Extract blob name from URL
-            blob_name = blob_url.split('/')[-1].split('?')[0]
-            
-            # Get account key from connection string
-            account_key = self._get_account_key()
-            
-            if not account_key:
-                logger.error("Could not extract account key from connection string")
-                return None
-            
-            # Generate SAS token with read permission
-            sas_token = generate_blob_sas(
-                account_name=self.blob_service_client.account_name,
-                container_name=self.container_name,
-                blob_name=blob_name,
-                account_key=account_key,
-                permission=BlobSasPermissions(read=True),
-                expiry=datetime.now(timezone.utc) + timedelta(hours=expiry_hours)
-            )
+            container_client = self.blob_service_client.get_container_client(self.container_name)
+            responses = container_client.delete_blobs(*blob_names, raise_on_any_failure=False)
             
-            # Return URL with SAS token
-            base_url = blob_url.split('?')[0]  # Remove existing SAS if any
-            download_url = f"{base_url}?{sas_token}"
+            results = []
+            for response in responses:
+                if response.status_code in (202, 404):
+                    results.append(None)
+                else:
+                    results.append(f"HTTP {response.status_code}: {response.reason}")
             
-            logger.debug(f"Generated SAS URL for {blob_name} (expires in {expiry_hours}h)")
-            return download_url
+            logger.info(f"✓ Batch deleted {results.count(None)}/{len(blob_names)} blobs")
+            return results
         
         except AzureError as e:
-            logger.error(f"Azure error generating SAS token for {blob_url}: {e}")
-            return None
+            logger.error(f"Azure error in batch delete of {len(blob_names)} blobs: {e}")
+            return [str(e)] * len(blob_urls)
         except Exception as e:
-            logger.error(f"Unexpected error generating SAS token: {e}")
-            return None
-    
-    def _get_account_key(self) -> Optional[str]:
-        """Extract account key from connection string"""
-        try:
-            conn_str = settings.BLOB_STORAGE_CONNECTION_STRING
-            for part in conn_str.split(';'):
-                if part.startswith('AccountKey='):
-                    return part.replace('AccountKey=', '')
-            return None
-        except Exception:
-            return None
+            logger.error(f"Unexpected error in batch delete: {e}")
+            return [str(e)] * len(blob_urls)
     
     def get_file_metadata(self, blob_url: str) -> Optional[dict]:
         """
@@ -231,18 +740,399 @@ class BlobStorageService:
             logger.error(f"Error listing blobs: {e}")
             return []
     
-    def get_blob_url(self, blob_name: str) -> str:
+    def iter_blobs(
+        self,
+        prefix: Optional[str] = None,
+        page_size: int = 5000
+    ) -> Iterator[Any]:
         """
-        Get the full URL for a blob
+        Stream blob properties in name order, one listing page at a time
+        
+        Unlike list_blobs, only a single page is held in memory, so this
+        scales to containers with millions of blobs.
         
         Args:
-            blob_name: Name of the blob
+            prefix: Optional prefix to filter blobs
+            page_size: Blobs per listing request (max 5000)
+        
+        Yields:
+            BlobProperties (name, size, last_modified, ...)
+        """
+        container_client = self.blob_service_client.get_container_client(self.container_name)
+        pages = container_client.list_blobs(
+            name_starts_with=prefix,
+            results_per_page=page_size
+        ).by_page()
+        
+        for page in pages:
+            for blob in page:
+                yield blob
+
+
+class AsyncBlobStorageService(AsyncStorageBackend):
+    """
+    Non-blocking Azure Blob Storage operations (azure.storage.blob.aio)
+    
+    Used by async endpoints so uploads never block the event loop.
+    Use as an async context manager so the underlying HTTP session is closed.
+    """
+    
+    def __init__(self):
+        if not settings.BLOB_STORAGE_CONNECTION_STRING:
+            raise ValueError("BLOB_STORAGE_CONNECTION_STRING is not configured")
+        
+        self.blob_service_client = AsyncBlobServiceClient.from_connection_string(
+            settings.BLOB_STORAGE_CONNECTION_STRING
+        )
+        self.container_name = getattr(settings, 'BLOB_CONTAINER_NAME', 'report-attachments')
+    
+    async def close(self) -> None:
+        """Close the underlying HTTP session"""
+        await self.blob_service_client.close()
+    
+    async def _ensure_container_exists(self):
+        """Create container if it doesn't exist"""
+        try:
+            container_client = self.blob_service_client.get_container_client(self.container_name)
+            if not await container_client.exists():
+                await container_client.create_container()
+                logger.info(f"Created container: {self.container_name}")
+        except AzureError as e:
+            logger.error(f"Error ensuring container exists: {e}")
+    
+    async def upload_stream(
+        self,
+        stream: Any,
+        filename: str,
+        content_type: str,
+        chunk_size: Optional[int] = None,
+        blob_name: Optional[str] = None
+    ) -> Optional[dict]:
+        """
+        Upload an async readable (e.g., UploadFile) as staged blocks
+        
+        Async counterpart of BlobStorageService.upload_stream.
+        
+        Args:
+            stream: Object with an awaitable read(size) method
+            filename: Original filename
+            content_type: MIME type (e.g., 'image/png', 'video/mp4')
+            chunk_size: Block size in bytes (default: BLOB_UPLOAD_CHUNK_SIZE)
+            blob_name: Target blob name (default: random UUID plus extension)
         
         Returns:
-            Full blob URL
+            Dictionary with 'url', 'size' and 'sha256', or None if failed.
+            Empty streams are not committed and return size 0 with url None.
+        """
+        chunk_size = chunk_size or settings.BLOB_UPLOAD_CHUNK_SIZE
+        
+        try:
+            if not blob_name:
+                file_extension = filename.split('.')[-1] if '.' in filename else 'bin'
+                blob_name = f"{uuid.uuid4()}.{file_extension}"
+            
+            blob_client = self.blob_service_client.get_blob_client(
+                container=self.container_name,
+                blob=blob_name
+            )
+            
+            hasher = hashlib.sha256()
+            size = 0
+            block_ids = []
+            
+            while True:
+                chunk = await stream.read(chunk_size)
+                if not chunk:
+                    break
+                
+                block_id = f"{len(block_ids):08d}"
+                await blob_client.stage_block(block_id=block_id, data=chunk, length=len(chunk))
+                block_ids.append(block_id)
+                
+                hasher.update(chunk)
+                size += len(chunk)
+            
+            if size == 0:
+                return {'url': None, 'size': 0, 'sha256': hasher.hexdigest()}
+            
+            content_hash = hasher.hexdigest()
+            await blob_client.commit_block_list(
+                block_ids,
+                content_settings=ContentSettings(content_type=content_type),
+                metadata={
+                    'original_filename': filename,
+                    'uploaded_at': datetime.now(timezone.utc).isoformat(),
+                    'sha256': content_hash
+                }
+            )
+            
+            logger.info(f"✓ Streamed file: {blob_name} ({size} bytes, {len(block_ids)} blocks)")
+            
+            return {'url': blob_client.url, 'size': size, 'sha256': content_hash}
+        
+        except AzureError as e:
+            logger.error(f"Azure error streaming file '{filename}': {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error streaming file '{filename}': {e}")
+            return None
+    
+    async def exists(self, blob_name: str) -> bool:
+        """Check whether a committed blob exists"""
+        blob_client = self.blob_service_client.get_blob_client(
+            container=self.container_name,
+            blob=blob_name
+        )
+        return await blob_client.exists()
+    
+    async def upload_bytes(
+        self,
+        blob_name: str,
+        data: bytes,
+        content_type: str
+    ) -> Optional[str]:
+        """
+        Upload a small in-memory blob (e.g., a generated thumbnail)
+        
+        Returns:
+            Blob URL if successful, None otherwise
+        """
+        try:
+            blob_client = self.blob_service_client.get_blob_client(
+                container=self.container_name,
+                blob=blob_name
+            )
+            await blob_client.upload_blob(
+                data,
+                content_settings=ContentSettings(content_type=content_type),
+                overwrite=True
+            )
+            
+            logger.info(f"✓ Uploaded file: {blob_name} ({len(data)} bytes)")
+            return blob_client.url
+        
+        except AzureError as e:
+            logger.error(f"Azure error uploading {blob_name}: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error uploading {blob_name}: {e}")
+            return None
+    
+    async def stage_block_at(self, blob_name: str, offset: int, data: bytes) -> bool:
+        """
+        Stage one uncommitted block holding the bytes that start at `offset`
+        
+        The block ID encodes the offset, so re-sending a chunk replaces the
+        same block and commit_staged_blocks can rebuild the byte order.
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            blob_client = self.blob_service_client.get_blob_client(
+                container=self.container_name,
+                blob=blob_name
+            )
+            await blob_client.stage_block(block_id=f"{offset:016d}", data=data, length=len(data))
+            return True
+        except AzureError as e:
+            logger.error(f"Azure error staging block at {offset} of {blob_name}: {e}")
+            return False
+        except Exception as e:
+            logger.error(f"Unexpected error staging block: {e}")
+            return False
+    
+    async def commit_staged_blocks(
+        self,
+        blob_name: str,
+        expected_size: int,
+        filename: str,
+        content_type: str
+    ) -> Optional[str]:
+        """
+        Commit blocks staged by stage_block_at into the final blob
+        
+        Walks the uncommitted blocks from offset 0, each block starting where
+        the previous one ended, so stale or overlapping blocks from retries
+        are skipped.
+        
+        Returns:
+            Blob URL if successful, None if blocks are missing or commit failed
+        """
+        try:
+            blob_client = self.blob_service_client.get_blob_client(
+                container=self.container_name,
+                blob=blob_name
+            )
+            
+            _, uncommitted = await blob_client.get_block_list(block_list_type='uncommitted')
+            sizes = {block.id: block.size for block in uncommitted}
+            
+            block_ids = []
+            offset = 0
+            while offset < expected_size:
+                block_id = f"{offset:016d}"
+                if not sizes.get(block_id):
+                    logger.error(f"Missing block at offset {offset} of {blob_name}")
+                    return None
+                block_ids.append(block_id)
+                offset += sizes[block_id]
+            
+            if offset != expected_size:
+                logger.error(f"Staged blocks of {blob_name} total {offset}, expected {expected_size}")
+                return None
+            
+            await blob_client.commit_block_list(
+                block_ids,
+                content_settings=ContentSettings(content_type=content_type),
+                metadata={
+                    'original_filename': filename,
+                    'uploaded_at': datetime.now(timezone.utc).isoformat()
+                }
+            )
+            
+            logger.info(f"✓ Committed resumable upload: {blob_name} ({expected_size} bytes, {len(block_ids)} blocks)")
+            return blob_client.url
+        
+        except AzureError as e:
+            logger.error(f"Azure error committing blocks of {blob_name}: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error committing blocks: {e}")
+            return None
+    
+    async def download_range(
+        self,
+        blob_name: str,
+        offset: int = 0,
+        length: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream part of a blob (a single ranged Get Blob request)
+        
+        Raises:
+            AzureError: If the blob is missing or the download fails
         """
         blob_client = self.blob_service_client.get_blob_client(
             container=self.container_name,
             blob=blob_name
         )
-        return blob_client.url
\ No newline at end of file
+        downloader = await blob_client.download_blob(offset=offset, length=length)
+        
+        async for chunk in downloader.chunks():
+            yield chunk
+    
+    async def delete_file(self, blob_url: str) -> bool:
+        """
+        Delete file from Azure Blob Storage
+        
+        Args:
+            blob_url: Full blob URL
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            blob_name = blob_url.split('/')[-1].split('?')[0]
+            
+            blob_client = self.blob_service_client.get_blob_client(
+                container=self.container_name,
+                blob=blob_name
+            )
+            
+            await blob_client.delete_blob()
+            logger.info(f"✓ Deleted blob: {blob_name}")
+            return True
+            
+        except AzureError as e:
+            logger.error(f"Azure error deleting file from {blob_url}: {e}")
+            return False
+        except Exception as e:
+            logger.error(f"Unexpected error deleting file: {e}")
+            return False
+
+
+# ==========================================
+# Shared Clients (one per worker process)
+# ==========================================
+_blob_service: Optional[StorageBackend] = None
+_async_blob_service: Optional[AsyncStorageBackend] = None
+_blob_service_lock = threading.Lock()
+
+
+def _storage_backend_classes() -> tuple:
+    """Resolve the (sync, async) service classes for STORAGE_BACKEND"""
+    if settings.STORAGE_BACKEND == "local":
+        # Imported lazily: the local backend imports this module
+        from app.services.local_blob_service import (
+            LocalBlobStorageService,
+            AsyncLocalBlobStorageService
+        )
+        return LocalBlobStorageService, AsyncLocalBlobStorageService
+    
+    if settings.STORAGE_BACKEND != "azure":
+        raise ValueError(f"Unknown STORAGE_BACKEND '{settings.STORAGE_BACKEND}' (expected 'azure' or 'local')")
+    
+    return BlobStorageService, AsyncBlobStorageService
+
+
+async def init_blob_storage() -> None:
+    """
+    Create the shared storage clients and bootstrap the container once
+    
+    Called from the FastAPI lifespan so request handlers reuse one
+    connection pool instead of paying a TLS handshake and a container
+    existence check on every call.
+    """
+    global _blob_service, _async_blob_service
+    
+    sync_class, async_class = _storage_backend_classes()
+    _blob_service = sync_class()  # Performs the one-time container check
+    _async_blob_service = async_class()
+    logger.info(
+        f"✓ Blob storage clients ready "
+        f"(backend: {settings.STORAGE_BACKEND}, container: {_blob_service.container_name})"
+    )
+
+
+async def close_blob_storage() -> None:
+    """Release the shared storage clients on shutdown"""
+    global _blob_service, _async_blob_service
+    
+    if _async_blob_service:
+        await _async_blob_service.close()
+    if _blob_service:
+        _blob_service.close()
+    
+    _blob_service = None
+    _async_blob_service = None
+
+
+def get_blob_service() -> StorageBackend:
+    """
+    Get the shared sync storage service
+    
+    Falls back to lazy creation when the lifespan did not run (scripts, tests).
+    """
+    global _blob_service
+    
+    if _blob_service is None:
+        with _blob_service_lock:
+            if _blob_service is None:
+                _blob_service = _storage_backend_classes()[0]()
+    return _blob_service
+
+
+def get_async_blob_service() -> AsyncStorageBackend:
+    """
+    Get the shared async storage service
+    
+    Must be called from a running event loop. The container is assumed to
+    exist; init_blob_storage (or the sync service) bootstraps it.
+    """
+    global _async_blob_service
+    
+    if _async_blob_service is None:
+        get_blob_service()  # Make sure the container check has happened
+        _async_blob_service = _storage_backend_classes()[1]()
+    return _async_blob_service
@@ -0,0 +1,177 @@
+"""
+Coordinates for free-text report locations, and geohash helpers for
+spatial queries.
+
+Reports keep the citizen's text in locationRaw; at ingest the coordinates
+are parsed out of it (Google Maps links or "lat,lon" text) or looked up
+in the GeocodeCache table of known places, and stored in indexed
+latitude/longitude/geohash columns.
+"""
+import logging
+import math
+import re
+from typing import List, Optional, Tuple
+from urllib.parse import unquote
+
+from sqlalchemy.orm import Session
+
+from app.models.geocode_cache import GeocodeCache
+from app.models.report import Report
+from app.services.text_normalization import normalize
+
+logger = logging.getLogger(__name__)
+
+GEOHASH_PRECISION = 9  # ~5m cells; prefixes give coarser cells for queries
+EARTH_RADIUS_METERS = 6371008.8
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_NUMBER = r"(-?\d{1,3}(?:\.\d+)?)"
+
+# Most specific first: a place's pin (!3d!4d) beats the map viewport (@)
+_COORDINATE_PATTERNS = [
+    re.compile(rf"!3d{_NUMBER}!4d{_NUMBER}"),
+    re.compile(rf"[?&](?:q|query|ll|destination|daddr|center)=(?:loc:)?{_NUMBER}\s*,\s*{_NUMBER}"),
+    re.compile(rf"@{_NUMBER},{_NUMBER}"),
+    re.compile(rf"^\s*\(?{_NUMBER}\s*[,\s]\s*{_NUMBER}\)?\s*$"),
+]
+
+
+def parse_coordinates(text: Optional[str]) -> Optional[Tuple[float, float]]:
+    """
+    Extract (latitude, longitude) from a maps link or "lat,lon" text
+
+    Short links (maps.app.goo.gl) carry no coordinates and return None.
+    """
+    if not text:
+        return None
+
+    text = unquote(text)
+    for pattern in _COORDINATE_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            latitude, longitude = float(match.group(1)), float(match.group(2))
+            if -90 <= latitude <= 90 and -180 <= longitude <= 180:
+                return latitude, longitude
+    return None
+
+
+def address_key(text: str) -> str:
+    """GeocodeCache key: normalized, whitespace-collapsed address text"""
+    return " ".join(re.findall(r"\w+", normalize(text)))[:450]
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Standard base32 geohash"""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+
+    while len(chars) < precision:
+        target, value = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (target[0] + target[1]) / 2
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            target[0] = middle
+        else:
+            target[1] = middle
+        even = not even
+
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits, bit_count = 0, 0
+
+    return "".join(chars)
+
+
+def _cell_size(precision: int) -> Tuple[float, float]:
+    """(height, width) in degrees of a geohash cell"""
+    lon_bits = math.ceil(precision * 5 / 2)
+    lat_bits = precision * 5 // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def neighbor_cells(latitude: float, longitude: float, precision: int) -> List[str]:
+    """The geohash cell containing a point and its (up to) 8 neighbours"""
+    height, width = _cell_size(precision)
+    return sorted({
+        encode_geohash(
+            min(max(latitude + d_lat * height, -90.0), 90.0),
+            (longitude + d_lon * width + 180.0) % 360.0 - 180.0,
+            precision
+        )
+        for d_lat in (-1, 0, 1)
+        for d_lon in (-1, 0, 1)
+    })
+
+
+def covering_cells(
+    min_lat: float,
+    min_lon: float,
+    max_lat: float,
+    max_lon: float,
+    max_cells: int = 16
+) -> List[str]:
+    """
+    Geohash prefixes that together cover a bounding box
+
+    Uses the finest precision needing at most max_cells cells, so each cell
+    is one index range seek (geohash LIKE 'prefix%').
+    """
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = _cell_size(precision)
+        rows = range(int((min_lat + 90) // height), int(min((max_lat + 90) // height, 180 / height - 1)) + 1)
+        columns = range(int((min_lon + 180) // width), int(min((max_lon + 180) // width, 360 / width - 1)) + 1)
+        if len(rows) * len(columns) <= max_cells or precision == 1:
+            return sorted({
+                encode_geohash(-90 + (row + 0.5) * height, -180 + (column + 0.5) * width, precision)
+                for row in rows
+                for column in columns
+            })
+    return []
+
+
+def bounding_box(latitude: float, longitude: float, radius_meters: float) -> Tuple[float, float, float, float]:
+    """(min_lat, min_lon, max_lat, max_lon) enclosing a circle"""
+    delta_lat = math.degrees(radius_meters / EARTH_RADIUS_METERS)
+    cos_lat = max(math.cos(math.radians(latitude)), 1e-6)
+    delta_lon = min(math.degrees(radius_meters / (EARTH_RADIUS_METERS * cos_lat)), 180.0)
+    return (
+        max(latitude - delta_lat, -90.0),
+        max(longitude - delta_lon, -180.0),
+        min(latitude + delta_lat, 90.0),
+        min(longitude + delta_lon, 180.0),
+    )
+
+
+def haversine_meters(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * math.asin(math.sqrt(a))
+
+
+def locate_report(db: Session, report: Report) -> None:
+    """
+    Set a new report's latitude, longitude and geohash from its locationRaw
+
+    Text without coordinates is looked up in GeocodeCache by normalized
+    address. Unresolved locations leave the columns NULL.
+    """
+    coordinates = parse_coordinates(report.locationRaw)
+
+    if coordinates is None and report.locationRaw:
+        cached = db.query(GeocodeCache.latitude, GeocodeCache.longitude).filter(
+            GeocodeCache.addressKey == address_key(report.locationRaw)
+        ).first()
+        if cached:
+            coordinates = (cached.latitude, cached.longitude)
+
+    if coordinates is None:
+        logger.debug(f"No coordinates for report {report.reportId} location")
+        return
+
+    report.latitude, report.longitude = coordinates
+    report.geohash = encode_geohash(*coordinates)
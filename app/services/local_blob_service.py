@@ -0,0 +1,564 @@
+import asyncio
+import hashlib
+import hmac
+import io
+import json
+import os
+import re
+import shutil
+import uuid
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, BinaryIO, Any, List, Iterator, AsyncIterator, NamedTuple
+from urllib.parse import urlencode
+
+from azure.storage.blob import BlobSasPermissions
+
+from app.core.config import settings
+from app.services.blob_service import StorageBackend, AsyncStorageBackend
+
+logger = logging.getLogger(__name__)
+
+# Flat names only (uuid.ext, sha256 hex, "<name>.thumb.webp"): no separators, no dotfiles
+_BLOB_NAME_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]{0,254}$")
+
+# Bookkeeping directories inside the container root (hidden from listings)
+_META_DIR = ".meta"
+_BLOCKS_DIR = ".blocks"
+_TMP_DIR = ".tmp"
+
+
+class LocalBlob(NamedTuple):
+    """Listing entry with the BlobProperties fields the reconciler reads"""
+    name: str
+    size: int
+    last_modified: datetime
+
+
+class LocalStorageMixin:
+    """
+    Paths, URLs and signed tokens shared by the sync and async filesystem services
+
+    Blobs are plain files under LOCAL_STORAGE_PATH/<container>, with content
+    type and metadata in a JSON sidecar. URLs point at the storage router,
+    and "SAS" tokens are HMAC signatures keyed on SECRET_KEY, so the rest of
+    the app handles both backends the same way.
+    """
+
+    def _init_local(self) -> None:
+        if not settings.SECRET_KEY:
+            raise ValueError("SECRET_KEY is required to sign local storage URLs")
+
+        self.container_name = getattr(settings, 'BLOB_CONTAINER_NAME', 'report-attachments')
+        self.root = Path(settings.LOCAL_STORAGE_PATH).resolve() / self.container_name
+
+    @property
+    def container_url(self) -> str:
+        return f"{settings.LOCAL_STORAGE_BASE_URL.rstrip('/')}/{self.container_name}"
+
+    def get_blob_url(self, blob_name: str) -> str:
+        return f"{self.container_url}/{blob_name}"
+
+    def blob_path(self, blob_name: str) -> Path:
+        """
+        Resolve a blob name to its file
+
+        Raises:
+            ValueError: If the name could escape the container directory
+        """
+        if not _BLOB_NAME_PATTERN.match(blob_name) or '..' in blob_name:
+            raise ValueError(f"Invalid blob name: {blob_name!r}")
+        return self.root / blob_name
+
+    def _meta_path(self, blob_name: str) -> Path:
+        return self.root / _META_DIR / f"{blob_name}.json"
+
+    def _blocks_path(self, blob_name: str) -> Path:
+        return self.root / _BLOCKS_DIR / blob_name
+
+    def _temp_path(self) -> Path:
+        return self.root / _TMP_DIR / uuid.uuid4().hex
+
+    def _create_directories(self) -> None:
+        for directory in (self.root, self.root / _META_DIR, self.root / _BLOCKS_DIR, self.root / _TMP_DIR):
+            directory.mkdir(parents=True, exist_ok=True)
+
+    def _write_meta(self, blob_name: str, content_type: str, metadata: Optional[dict] = None) -> None:
+        meta_path = self._meta_path(blob_name)
+        temp_path = self._temp_path()
+        temp_path.write_text(json.dumps({'content_type': content_type, 'metadata': metadata or {}}))
+        os.replace(temp_path, meta_path)
+
+    def _read_meta(self, blob_name: str) -> dict:
+        try:
+            return json.loads(self._meta_path(blob_name).read_text())
+        except (OSError, ValueError):
+            return {'content_type': 'application/octet-stream', 'metadata': {}}
+
+    def _remove_blob(self, blob_name: str) -> bool:
+        """Delete a blob and its sidecar; False if it did not exist"""
+        path = self.blob_path(blob_name)
+        self._meta_path(blob_name).unlink(missing_ok=True)
+        try:
+            path.unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _signature(self, blob_name: str, permission: str, expiry_ts: int) -> str:
+        message = f"{self.container_name}\n{blob_name}\n{permission}\n{expiry_ts}"
+        return hmac.new(settings.SECRET_KEY.encode(), message.encode(), hashlib.sha256).hexdigest()
+
+    def _sign_blob(
+        self,
+        blob_name: str,
+        permission: BlobSasPermissions,
+        expiry: datetime
+    ) -> Optional[str]:
+        """Sign a blob-scoped token in the same query-string shape as a SAS"""
+        permission_str = str(permission)
+        expiry_ts = int(expiry.timestamp())
+        return urlencode({
+            'sp': permission_str,
+            'se': expiry_ts,
+            'sig': self._signature(blob_name, permission_str, expiry_ts)
+        })
+
+    def verify_signature(self, blob_name: str, permission: str, expiry_ts: int, signature: str) -> bool:
+        """Check a token produced by _sign_blob (signature and expiry)"""
+        if expiry_ts < datetime.now(timezone.utc).timestamp():
+            return False
+        return hmac.compare_digest(self._signature(blob_name, permission, expiry_ts), signature)
+
+
+class LocalBlobStorageService(LocalStorageMixin, StorageBackend):
+    """Filesystem storage for report attachments (STORAGE_BACKEND=local)"""
+
+    def __init__(self):
+        self._init_local()
+        self._ensure_container_exists()
+
+    def _ensure_container_exists(self):
+        """Create the container directories if they don't exist"""
+        self._create_directories()
+
+    def close(self) -> None:
+        """Nothing to release; files are opened per call"""
+
+    def upload_file(
+        self,
+        file_content: bytes,
+        filename: str,
+        content_type: str
+    ) -> Optional[str]:
+        """
+        Write an in-memory file
+
+        Returns:
+            Blob URL if successful, None otherwise
+        """
+        result = self.upload_stream(io.BytesIO(file_content), filename, content_type)
+        return result['url'] if result else None
+
+    def upload_stream(
+        self,
+        stream: BinaryIO,
+        filename: str,
+        content_type: str,
+        chunk_size: Optional[int] = None
+    ) -> Optional[dict]:
+        """
+        Copy a file-like object to disk in bounded chunks
+
+        Bytes go to a temporary file that is renamed into place, so readers
+        never see a partial blob.
+
+        Returns:
+            Dictionary with 'url', 'size' and 'sha256', or None if failed.
+            Empty streams are not stored and return size 0 with url None.
+        """
+        chunk_size = chunk_size or settings.BLOB_UPLOAD_CHUNK_SIZE
+        file_extension = filename.split('.')[-1] if '.' in filename else 'bin'
+        blob_name = f"{uuid.uuid4()}.{file_extension}"
+        temp_path = self._temp_path()
+
+        try:
+            hasher = hashlib.sha256()
+            size = 0
+
+            with open(temp_path, 'wb') as output:
+                while True:
+                    chunk = stream.read(chunk_size)
+                    if not chunk:
+                        break
+                    output.write(chunk)
+                    hasher.update(chunk)
+                    size += len(chunk)
+
+            if size == 0:
+                temp_path.unlink(missing_ok=True)
+                return {'url': None, 'size': 0, 'sha256': hasher.hexdigest()}
+
+            content_hash = hasher.hexdigest()
+            os.replace(temp_path, self.blob_path(blob_name))
+            self._write_meta(blob_name, content_type, {
+                'original_filename': filename,
+                'uploaded_at': datetime.now(timezone.utc).isoformat(),
+                'sha256': content_hash
+            })
+
+            logger.info(f"✓ Stored file: {blob_name} ({size} bytes)")
+            return {'url': self.get_blob_url(blob_name), 'size': size, 'sha256': content_hash}
+
+        except Exception as e:
+            temp_path.unlink(missing_ok=True)
+            logger.error(f"Error storing file '{filename}': {e}")
+            return None
+
+    def delete_file(self, blob_url: str) -> bool:
+        """
+        Delete a stored file
+
+        Returns:
+            True if it was deleted, False if missing or failed
+        """
+        try:
+            blob_name = blob_url.split('/')[-1].split('?')[0]
+            if not self._remove_blob(blob_name):
+                logger.error(f"Blob not found for delete: {blob_url}")
+                return False
+            logger.info(f"✓ Deleted blob: {blob_name}")
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting file {blob_url}: {e}")
+            return False
+
+    def delete_files_batch(self, blob_urls: List[str]) -> List[Optional[str]]:
+        """
+        Delete several files
+
+        Returns:
+            One entry per URL, in order: None if the file was deleted (or was
+            already gone), otherwise an error description
+        """
+        results = []
+        for blob_url in blob_urls:
+            try:
+                self._remove_blob(blob_url.split('/')[-1].split('?')[0])
+                results.append(None)
+            except Exception as e:
+                results.append(str(e))
+
+        if blob_urls:
+            logger.info(f"✓ Batch deleted {results.count(None)}/{len(blob_urls)} blobs")
+        return results
+
+    def get_file_metadata(self, blob_url: str) -> Optional[dict]:
+        """
+        Get size, content type and metadata of a stored file
+
+        Returns:
+            Dictionary with metadata, or None if missing or failed
+        """
+        try:
+            blob_name = blob_url.split('/')[-1].split('?')[0]
+            stat = self.blob_path(blob_name).stat()
+            meta = self._read_meta(blob_name)
+            last_modified = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
+
+            return {
+                'size': stat.st_size,
+                'content_type': meta['content_type'],
+                'created_on': last_modified,
+                'last_modified': last_modified,
+                'metadata': meta['metadata']
+            }
+        except FileNotFoundError:
+            logger.error(f"Blob not found: {blob_url}")
+            return None
+        except Exception as e:
+            logger.error(f"Error getting metadata for {blob_url}: {e}")
+            return None
+
+    def list_blobs(self, prefix: Optional[str] = None) -> list:
+        """List blob names, optionally filtered by prefix"""
+        return [blob.name for blob in self.iter_blobs(prefix)]
+
+    def iter_blobs(
+        self,
+        prefix: Optional[str] = None,
+        page_size: int = 5000
+    ) -> Iterator[LocalBlob]:
+        """
+        Yield stored blobs in name order
+
+        The directory is listed in one pass (names only), then stat'ed lazily.
+        page_size is accepted for interface parity.
+        """
+        try:
+            names = sorted(
+                entry.name for entry in os.scandir(self.root)
+                if entry.is_file() and not entry.name.startswith('.')
+                and (not prefix or entry.name.startswith(prefix))
+            )
+        except FileNotFoundError:
+            return
+
+        for name in names:
+            try:
+                stat = (self.root / name).stat()
+            except FileNotFoundError:
+                continue  # Deleted while listing
+            yield LocalBlob(name, stat.st_size, datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc))
+
+
+class AsyncLocalBlobStorageService(LocalStorageMixin, AsyncStorageBackend):
+    """
+    Non-blocking filesystem storage
+
+    File I/O runs in the default thread pool, one chunk at a time, so large
+    writes never block the event loop and memory stays bounded.
+    """
+
+    def __init__(self):
+        self._init_local()
+
+    async def close(self) -> None:
+        """Nothing to release; files are opened per call"""
+
+    async def _ensure_container_exists(self):
+        await asyncio.to_thread(self._create_directories)
+
+    async def exists(self, blob_name: str) -> bool:
+        return await asyncio.to_thread(self.blob_path(blob_name).is_file)
+
+    async def upload_chunks(
+        self,
+        blob_name: str,
+        chunks: AsyncIterator[bytes],
+        content_type: str,
+        filename: Optional[str] = None
+    ) -> Optional[dict]:
+        """
+        Write an async byte stream (e.g., a request body) to a blob
+
+        Returns:
+            Dictionary with 'url', 'size' and 'sha256', or None if failed.
+            Empty streams are not stored and return size 0 with url None.
+        """
+        temp_path = self._temp_path()
+
+        try:
+            path = self.blob_path(blob_name)
+            hasher = hashlib.sha256()
+            size = 0
+
+            output = await asyncio.to_thread(open, temp_path, 'wb')
+            try:
+                async for chunk in chunks:
+                    if not chunk:
+                        continue
+                    await asyncio.to_thread(output.write, chunk)
+                    hasher.update(chunk)
+                    size += len(chunk)
+            finally:
+                await asyncio.to_thread(output.close)
+
+            if size == 0:
+                await asyncio.to_thread(temp_path.unlink, True)
+                return {'url': None, 'size': 0, 'sha256': hasher.hexdigest()}
+
+            content_hash = hasher.hexdigest()
+            metadata = {'uploaded_at': datetime.now(timezone.utc).isoformat(), 'sha256': content_hash}
+            if filename:
+                metadata['original_filename'] = filename
+
+            await asyncio.to_thread(os.replace, temp_path, path)
+            await asyncio.to_thread(self._write_meta, blob_name, content_type, metadata)
+
+            logger.info(f"✓ Stored file: {blob_name} ({size} bytes)")
+            return {'url': self.get_blob_url(blob_name), 'size': size, 'sha256': content_hash}
+
+        except Exception as e:
+            await asyncio.to_thread(temp_path.unlink, True)
+            logger.error(f"Error storing {blob_name}: {e}")
+            return None
+
+    async def upload_stream(
+        self,
+        stream: Any,
+        filename: str,
+        content_type: str,
+        chunk_size: Optional[int] = None,
+        blob_name: Optional[str] = None
+    ) -> Optional[dict]:
+        """
+        Write an async readable (e.g., UploadFile) to disk in bounded chunks
+
+        Async counterpart of LocalBlobStorageService.upload_stream.
+        """
+        chunk_size = chunk_size or settings.BLOB_UPLOAD_CHUNK_SIZE
+
+        if not blob_name:
+            file_extension = filename.split('.')[-1] if '.' in filename else 'bin'
+            blob_name = f"{uuid.uuid4()}.{file_extension}"
+
+        async def read_chunks() -> AsyncIterator[bytes]:
+            while True:
+                chunk = await stream.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+        return await self.upload_chunks(blob_name, read_chunks(), content_type, filename)
+
+    async def upload_bytes(
+        self,
+        blob_name: str,
+        data: bytes,
+        content_type: str
+    ) -> Optional[str]:
+        """
+        Write a small in-memory blob (e.g., a generated thumbnail)
+
+        Returns:
+            Blob URL if successful, None otherwise
+        """
+        async def single_chunk() -> AsyncIterator[bytes]:
+            yield data
+
+        result = await self.upload_chunks(blob_name, single_chunk(), content_type)
+        return result['url'] if result else None
+
+    async def stage_block_at(self, blob_name: str, offset: int, data: bytes) -> bool:
+        """
+        Store one block holding the bytes that start at `offset`
+
+        Blocks are files named by offset, so re-sending a chunk replaces the
+        same block and commit_staged_blocks can rebuild the byte order.
+        """
+        def write_block() -> None:
+            blocks_path = self._blocks_path(blob_name)
+            blocks_path.mkdir(exist_ok=True)
+            temp_path = self._temp_path()
+            temp_path.write_bytes(data)
+            os.replace(temp_path, blocks_path / f"{offset:016d}")
+
+        try:
+            self.blob_path(blob_name)  # Validate before touching the filesystem
+            await asyncio.to_thread(write_block)
+            return True
+        except Exception as e:
+            logger.error(f"Error staging block at {offset} of {blob_name}: {e}")
+            return False
+
+    async def commit_staged_blocks(
+        self,
+        blob_name: str,
+        expected_size: int,
+        filename: str,
+        content_type: str
+    ) -> Optional[str]:
+        """
+        Concatenate blocks staged by stage_block_at into the final blob
+
+        Walks the blocks from offset 0, each starting where the previous one
+        ended, so stale or overlapping blocks from retries are skipped.
+
+        Returns:
+            Blob URL if successful, None if blocks are missing or commit failed
+        """
+        def assemble() -> Optional[int]:
+            blocks_path = self._blocks_path(blob_name)
+            sizes = {entry.name: entry.stat().st_size for entry in os.scandir(blocks_path)}
+
+            block_ids = []
+            offset = 0
+            while offset < expected_size:
+                block_id = f"{offset:016d}"
+                if not sizes.get(block_id):
+                    logger.error(f"Missing block at offset {offset} of {blob_name}")
+                    return None
+                block_ids.append(block_id)
+                offset += sizes[block_id]
+
+            if offset != expected_size:
+                logger.error(f"Staged blocks of {blob_name} total {offset}, expected {expected_size}")
+                return None
+
+            temp_path = self._temp_path()
+            with open(temp_path, 'wb') as output:
+                for block_id in block_ids:
+                    with open(blocks_path / block_id, 'rb') as block:
+                        shutil.copyfileobj(block, output, settings.BLOB_UPLOAD_CHUNK_SIZE)
+
+            os.replace(temp_path, self.blob_path(blob_name))
+            self._write_meta(blob_name, content_type, {
+                'original_filename': filename,
+                'uploaded_at': datetime.now(timezone.utc).isoformat()
+            })
+            shutil.rmtree(blocks_path, ignore_errors=True)
+            return len(block_ids)
+
+        try:
+            block_count = await asyncio.to_thread(assemble)
+            if block_count is None:
+                return None
+
+            logger.info(f"✓ Committed resumable upload: {blob_name} ({expected_size} bytes, {block_count} blocks)")
+            return self.get_blob_url(blob_name)
+
+        except FileNotFoundError:
+            logger.error(f"No staged blocks for {blob_name}")
+            return None
+        except Exception as e:
+            logger.error(f"Error committing blocks of {blob_name}: {e}")
+            return None
+
+    async def download_range(
+        self,
+        blob_name: str,
+        offset: int = 0,
+        length: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream part of a stored file
+
+        Raises:
+            FileNotFoundError: If the blob does not exist
+        """
+        handle = await asyncio.to_thread(open, self.blob_path(blob_name), 'rb')
+        try:
+            await asyncio.to_thread(handle.seek, offset)
+            remaining = length
+
+            while remaining is None or remaining > 0:
+                read_size = settings.BLOB_UPLOAD_CHUNK_SIZE if remaining is None else min(remaining, settings.BLOB_UPLOAD_CHUNK_SIZE)
+                chunk = await asyncio.to_thread(handle.read, read_size)
+                if not chunk:
+                    return
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+        finally:
+            await asyncio.to_thread(handle.close)
+
+    async def delete_file(self, blob_url: str) -> bool:
+        """
+        Delete a stored file
+
+        Returns:
+            True if it was deleted, False if missing or failed
+        """
+        try:
+            blob_name = blob_url.split('/')[-1].split('?')[0]
+            if not await asyncio.to_thread(self._remove_blob, blob_name):
+                logger.error(f"Blob not found for delete: {blob_url}")
+                return False
+            logger.info(f"✓ Deleted blob: {blob_name}")
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting file {blob_url}: {e}")
+            return False
+
@@ -0,0 +1,172 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocalOps
+from app.models.blob_purge import BlobPurge
+from app.models.blob_reference import BlobReference
+from app.services.blob_service import get_blob_service
+
+logger = logging.getLogger(__name__)
+
+_purge_task: Optional[asyncio.Task] = None
+
+
+def _utcnow_naive() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _content_hash_of(blob_url: str) -> Optional[str]:
+    """SHA-256 that a content-addressed blob (or its thumbnail) is named after, if any"""
+    base_name = blob_url.split('/')[-1].split('?')[0].split('.')[0]
+    if len(base_name) == 64 and all(c in "0123456789abcdef" for c in base_name):
+        return base_name
+    return None
+
+
+class PurgeService:
+    """
+    Durable, batched deletion of attachment blobs.
+
+    Callers enqueue blob URLs in the same transaction as their DB delete;
+    the background worker drains the BlobPurge outbox with blob batch
+    deletes and retries failures with exponential backoff.
+    """
+
+    @staticmethod
+    def enqueue(db: Session, blob_urls: List[str]) -> None:
+        """Queue blobs for deletion (committed with the caller's transaction)"""
+        now = _utcnow_naive()
+        for blob_url in blob_urls:
+            db.add(BlobPurge(blobStorageUri=blob_url, attempts=0, nextAttemptAt=now))
+
+    @staticmethod
+    def drain_batch() -> int:
+        """
+        Delete one batch of due blobs
+
+        Rows are claimed with skip-locked semantics, so every API worker can
+        drain the same table without double-deleting or blocking each other.
+        Content-addressed blobs are only deleted while their BlobReference
+        key is locked and known to be unreferenced.
+
+        Returns:
+            Number of outbox rows processed
+        """
+        db = SessionLocalOps()
+        try:
+            rows = db.query(BlobPurge).filter(
+                BlobPurge.nextAttemptAt <= _utcnow_naive()
+            ).order_by(
+                BlobPurge.nextAttemptAt
+            ).with_for_update(skip_locked=True).limit(settings.BLOB_PURGE_BATCH_SIZE).all()
+
+            if not rows:
+                return 0
+
+            # Content-addressed blobs may have been referenced again since they were queued
+            hashes = {_content_hash_of(row.blobStorageUri) for row in rows} - {None}
+            referenced, tombstones = PurgeService._lock_references(db, hashes)
+
+            to_delete = []
+            for row in rows:
+                if _content_hash_of(row.blobStorageUri) in referenced:
+                    db.delete(row)
+                else:
+                    to_delete.append(row)
+
+            errors = get_blob_service().delete_files_batch([row.blobStorageUri for row in to_delete])
+
+            now = _utcnow_naive()
+            for row, error in zip(to_delete, errors):
+                if error is None:
+                    db.delete(row)
+                    continue
+
+                row.attempts += 1
+                row.lastError = error[:1000]
+                backoff = min(
+                    settings.BLOB_PURGE_MAX_BACKOFF_SECONDS,
+                    settings.BLOB_PURGE_POLL_SECONDS * 2 ** row.attempts
+                )
+                row.nextAttemptAt = now + timedelta(seconds=backoff)
+
+            for tombstone in tombstones:
+                db.delete(tombstone)
+            db.commit()
+            return len(rows)
+
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Blob purge batch failed: {e}")
+            return 0
+        finally:
+            db.close()
+
+    @staticmethod
+    def _lock_references(db: Session, hashes: Set[str]) -> Tuple[Set[str], List[BlobReference]]:
+        """
+        Lock the BlobReference keys of content-addressed blobs until the batch commits
+
+        Hashes without a reference row get a refCount=0 tombstone, so their
+        key is locked too. An upload acquiring one of these hashes waits
+        for the blob delete to commit instead of re-referencing the blob
+        between this check and the delete; one that committed first keeps
+        its blob. The caller deletes the tombstones before committing.
+
+        Returns:
+            (hashes that are still referenced, tombstones added)
+        """
+        if not hashes:
+            return set(), []
+
+        referenced = {
+            content_hash for (content_hash,) in db.query(BlobReference.contentHash).filter(
+                BlobReference.contentHash.in_(hashes)
+            ).with_for_update()
+        }
+        tombstones = [
+            BlobReference(contentHash=content_hash, blobStorageUri=content_hash, refCount=0)
+            for content_hash in sorted(hashes - referenced)
+        ]
+        db.add_all(tombstones)
+        db.flush()
+        return referenced, tombstones
+
+
+# ==========================================
+# Background Worker Lifecycle
+# ==========================================
+async def _purge_loop() -> None:
+    while True:
+        drained = await asyncio.to_thread(PurgeService.drain_batch)
+
+        # Keep going while there is a backlog, otherwise poll
+        if drained < settings.BLOB_PURGE_BATCH_SIZE:
+            await asyncio.sleep(settings.BLOB_PURGE_POLL_SECONDS)
+
+
+async def start_purge_worker() -> None:
+    """Start the background purge worker (called from the lifespan)"""
+    global _purge_task
+
+    if _purge_task is None:
+        _purge_task = asyncio.create_task(_purge_loop())
+        logger.info("✓ Blob purge worker started")
+
+
+async def stop_purge_worker() -> None:
+    """Stop the background purge worker on shutdown"""
+    global _purge_task
+
+    if _purge_task is not None:
+        _purge_task.cancel()
+        try:
+            await _purge_task
+        except asyncio.CancelledError:
+            pass
+        _purge_task = None
@@ -0,0 +1,190 @@
+"""
+Orphaned blob reconciler.
+
+Run as a job:  python -m app.services.reconcile_service [--delete]
+"""
+import argparse
+import heapq
+import itertools
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocalOps
+from app.models.attachment import Attachment
+from app.models.blob_purge import BlobPurge
+from app.models.blob_reference import BlobReference
+from app.services.blob_service import get_blob_service
+from app.services.purge_service import PurgeService
+
+logger = logging.getLogger(__name__)
+
+# Binary collation so SQL Server sorts URIs in the same order as the blob listing
+BINARY_COLLATION = "Latin1_General_BIN2"
+
+# Columns that keep a blob alive, tagged by source
+REFERENCE_COLUMNS = {
+    "attachment": Attachment.blobStorageUri,
+    "thumbnail": Attachment.thumbnailUri,
+    "reference": BlobReference.blobStorageUri,
+    "purge": BlobPurge.blobStorageUri,
+}
+
+SAMPLE_LIMIT = 100
+
+
+class ReconcileService:
+    """
+    Finds blobs without DB references (orphans) and Attachment rows whose
+    blob is missing (dangling) by merge-joining two sorted streams:
+    the paged blob listing and keyset-paginated reference columns.
+    Memory stays bounded by the page and chunk sizes.
+    """
+
+    @staticmethod
+    def _stream_names(
+        db: Session,
+        source: str,
+        container_url: str,
+        chunk_size: int
+    ) -> Iterator[Tuple[str, str]]:
+        """Yield (blob name, source) for one reference column in binary name order"""
+        column = REFERENCE_COLUMNS[source]
+        ordered = column.collate(BINARY_COLLATION)
+        prefix = f"{container_url}/"
+        last_value = None
+
+        while True:
+            query = db.query(column).filter(
+                column.isnot(None),
+                column.startswith(prefix, autoescape=True)
+            )
+            if last_value is not None:
+                query = query.filter(ordered > last_value)
+
+            rows = query.order_by(ordered).limit(chunk_size).all()
+            if not rows:
+                return
+
+            for (value,) in rows:
+                yield value[len(prefix):].split('?')[0], source
+
+            last_value = rows[-1][0]
+
+    @staticmethod
+    def run(delete: bool = False, grace_minutes: Optional[int] = None) -> dict:
+        """
+        Reconcile the attachment container against the operations DB
+
+        Args:
+            delete: Queue orphaned blobs in the BlobPurge outbox (default: report only)
+            grace_minutes: Ignore blobs modified more recently than this,
+                since their DB rows may not be committed yet
+
+        Returns:
+            Summary with counts and a sample of orphaned blobs and dangling attachments
+        """
+        grace_minutes = settings.RECONCILE_GRACE_MINUTES if grace_minutes is None else grace_minutes
+        cutoff = datetime.now(timezone.utc) - timedelta(minutes=grace_minutes)
+        page_size = settings.RECONCILE_PAGE_SIZE
+
+        blob_service = get_blob_service()
+        container_url = blob_service.container_url
+
+        summary = {
+            "blobsScanned": 0,
+            "orphanedBlobs": 0,
+            "danglingAttachments": 0,
+            "queuedForPurge": 0,
+            "orphanedSample": [],
+            "danglingSample": [],
+        }
+
+        db = SessionLocalOps()
+        try:
+            # Merge every reference column into one sorted stream, grouped by blob name
+            known = itertools.groupby(
+                heapq.merge(*(
+                    ReconcileService._stream_names(db, source, container_url, page_size)
+                    for source in REFERENCE_COLUMNS
+                )),
+                key=lambda item: item[0]
+            )
+            blobs = blob_service.iter_blobs(page_size=page_size)
+
+            pending_purge = []
+
+            def flush_purge() -> None:
+                if delete and pending_purge:
+                    PurgeService.enqueue(db, pending_purge)
+                    db.commit()
+                    summary["queuedForPurge"] += len(pending_purge)
+                pending_purge.clear()
+
+            def next_known():
+                group = next(known, None)
+                if group is None:
+                    return None, set()
+                name, items = group
+                return name, {source for _, source in items}
+
+            blob = next(blobs, None)
+            known_name, sources = next_known()
+
+            while blob is not None or known_name is not None:
+                if known_name is None or (blob is not None and blob.name < known_name):
+                    # Blob with no reference at all
+                    summary["blobsScanned"] += 1
+                    if blob.last_modified and blob.last_modified < cutoff:
+                        summary["orphanedBlobs"] += 1
+                        if len(summary["orphanedSample"]) < SAMPLE_LIMIT:
+                            summary["orphanedSample"].append(blob.name)
+                        pending_purge.append(f"{container_url}/{blob.name}")
+                        if len(pending_purge) >= settings.BLOB_PURGE_BATCH_SIZE:
+                            flush_purge()
+                    blob = next(blobs, None)
+
+                elif blob is None or known_name < blob.name:
+                    # Reference with no blob; only attachment originals are reported
+                    if "attachment" in sources:
+                        summary["danglingAttachments"] += 1
+                        if len(summary["danglingSample"]) < SAMPLE_LIMIT:
+                            summary["danglingSample"].append(known_name)
+                    known_name, sources = next_known()
+
+                else:
+                    summary["blobsScanned"] += 1
+                    blob = next(blobs, None)
+                    known_name, sources = next_known()
+
+            flush_purge()
+
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        logger.info(
+            f"✓ Reconciled {summary['blobsScanned']} blobs: "
+            f"{summary['orphanedBlobs']} orphaned, {summary['danglingAttachments']} dangling, "
+            f"{summary['queuedForPurge']} queued for purge"
+        )
+        return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find orphaned attachment blobs and dangling attachment rows")
+    parser.add_argument("--delete", action="store_true", help="Queue orphaned blobs for deletion")
+    parser.add_argument("--grace-minutes", type=int, default=None, help="Ignore blobs newer than this")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    print(json.dumps(
+        ReconcileService.run(delete=args.delete, grace_minutes=args.grace_minutes),
+        indent=2
+    ))
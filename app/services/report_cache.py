@@ -0,0 +1,264 @@
+import os
+import threading
+import time
+import uuid
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.report import Report
+from app.models.report_cluster import ReportCluster
+from app.services.report_documents import dumps, loads, load_report_document
+
+logger = logging.getLogger(__name__)
+
+
+# ==========================================
+# Backends
+# ==========================================
+class ReportCacheBackend(ABC):
+    """Byte store for cached report documents"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+
+class MemoryReportCacheBackend(ReportCacheBackend):
+    """Per-process LRU with TTL (fastest; entries are revalidated against the DB)"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class FileReportCacheBackend(ReportCacheBackend):
+    """
+    Directory-backed store shared by all workers on one host
+
+    Local stand-in for the Redis backend: entries shared across workers for
+    development and single-node deployments, without a server.
+    """
+
+    def __init__(self, path: str):
+        self.root = Path(path)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            expires_at, _, value = path.read_bytes().partition(b"\n")
+            if float(expires_at) < time.time():
+                path.unlink(missing_ok=True)
+                return None
+            return value
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        temp_path = self.root / f".{uuid.uuid4().hex}"
+        try:
+            temp_path.write_bytes(f"{time.time() + ttl_seconds}\n".encode() + value)
+            os.replace(temp_path, self._path(key))
+        except OSError as e:
+            temp_path.unlink(missing_ok=True)
+            logger.warning(f"⚠ Report cache write failed: {e}")
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+
+class RedisReportCacheBackend(ReportCacheBackend):
+    """Shared store for multi-node deployments (REPORT_CACHE_REDIS_URL)"""
+
+    def __init__(self, url: str):
+        import redis
+
+        self.client = redis.Redis.from_url(url, socket_timeout=0.5)
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self.client.get(key)
+        except Exception as e:
+            # A cache outage degrades to DB reads, never to errors
+            logger.warning(f"⚠ Report cache get failed: {e}")
+            return None
+
+    def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        try:
+            self.client.set(key, value, ex=ttl_seconds)
+        except Exception as e:
+            logger.warning(f"⚠ Report cache set failed: {e}")
+
+    def delete(self, key: str) -> None:
+        try:
+            self.client.delete(key)
+        except Exception as e:
+            # An invalidation that fails leaves the entry to expire with its TTL
+            logger.error(f"✗ Report cache delete failed for {key}: {e}")
+
+
+def _create_backend() -> Optional[ReportCacheBackend]:
+    backend = settings.REPORT_CACHE_BACKEND
+
+    if backend == "memory":
+        return MemoryReportCacheBackend(settings.REPORT_CACHE_MAX_ENTRIES)
+    if backend == "file":
+        return FileReportCacheBackend(settings.REPORT_CACHE_PATH)
+    if backend == "redis":
+        if not settings.REPORT_CACHE_REDIS_URL:
+            raise ValueError("REPORT_CACHE_REDIS_URL is not configured")
+        return RedisReportCacheBackend(settings.REPORT_CACHE_REDIS_URL)
+    if backend == "none":
+        return None
+
+    raise ValueError(f"Unknown REPORT_CACHE_BACKEND '{backend}' (expected memory, file, redis or none)")
+
+
+# ==========================================
+# Read-through cache
+# ==========================================
+class ReportCache:
+    """
+    Read-through cache of single report documents (unsigned)
+
+    Attachment URLs are signed per request, so cached entries never hold
+    expiring SAS tokens. Writers call invalidate() after committing.
+
+    Entries carry the report's updatedAt (which every report write changes)
+    and every hit is revalidated against it with a primary-key lookup on
+    the request's session before it is served. The same lookup reads the
+    cluster size, which changes without a write to the report, so hits and
+    misses on any worker return the same document (and ETag). This covers what
+    invalidation alone cannot: the in-process backend never sees other
+    workers' invalidations, and a reader can re-fill an entry with data
+    loaded just before a writer's commit and invalidation. Such entries
+    are refilled on their next read instead of lingering for the TTL.
+
+    Reads on a replica compare against the replica's updatedAt, so they
+    may be served what the replica itself would return, never anything
+    older. Replica reads can therefore fill shared backends too.
+    """
+
+    def __init__(self, backend: Optional[ReportCacheBackend]):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(report_id: str) -> str:
+        return f"report-v1-{report_id}"
+
+    def get_document(self, db: Session, report_id: str) -> Optional[dict]:
+        """
+        Get an unsigned report document, loading and caching it on a miss
+
+        Returns:
+            Document dict, or None if the report does not exist
+        """
+        if self.backend is None:
+            return load_report_document(db, report_id)
+
+        key = self._key(report_id)
+        raw = self.backend.get(key)
+
+        if raw is not None:
+            entry = loads(raw)
+            current = self._current_state(db, report_id)
+            if current is not None and current.updatedAt.isoformat() == entry["version"]:
+                self.hits += 1
+                document = entry["report"]
+                # Clusters grow without a write to this report, so the size comes from the DB too
+                document["clusterSize"] = current.clusterSize
+                return document
+
+        self.misses += 1
+        document = load_report_document(db, report_id)
+        if document is not None:
+            self.backend.set(
+                key,
+                dumps({"version": document["updatedAt"].isoformat(), "report": document}),
+                settings.REPORT_CACHE_TTL_SECONDS
+            )
+        return document
+
+    @staticmethod
+    def _current_state(db: Session, report_id: str):
+        """The report's updatedAt and cluster size (one PK seek), or None if it is gone"""
+        return db.query(
+            Report.updatedAt,
+            ReportCluster.reportCount.label("clusterSize")
+        ).outerjoin(
+            ReportCluster, ReportCluster.clusterId == Report.clusterId
+        ).filter(Report.reportId == report_id).first()
+
+    def invalidate(self, *report_ids: str) -> None:
+        """Drop cached reports after a committed change (status, delete, attachments)"""
+        if self.backend is None:
+            return
+        for report_id in set(report_ids):
+            self.backend.delete(self._key(report_id))
+
+    def stats(self) -> dict:
+        """Cache metrics (exposed on /health)"""
+        lookups = self.hits + self.misses
+        return {
+            "backend": settings.REPORT_CACHE_BACKEND,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+_report_cache: Optional[ReportCache] = None
+_report_cache_lock = threading.Lock()
+
+
+def get_report_cache() -> ReportCache:
+    """Get the shared report cache (created on first use)"""
+    global _report_cache
+
+    if _report_cache is None:
+        with _report_cache_lock:
+            if _report_cache is None:
+                _report_cache = ReportCache(_create_backend())
+    return _report_cache
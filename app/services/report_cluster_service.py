@@ -0,0 +1,251 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Set, Tuple
+
+from sqlalchemy import case
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.report import Report
+from app.models.report_cluster import ReportCluster
+from app.services.geolocation import haversine_meters, neighbor_cells
+
+logger = logging.getLogger(__name__)
+
+# ~1.2km x 0.6km cells: the 3x3 neighbourhood covers CLUSTER_RADIUS_METERS
+CLUSTER_CELL_PRECISION = 6
+
+CellKey = Tuple[str, str]  # (categoryId, geohash cell)
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """DATETIME2 columns hold naive UTC"""
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+
+@dataclass
+class _Cluster:
+    clusterId: str
+    categoryId: str
+    cell: str
+    latitude: float
+    longitude: float
+    reportCount: int
+    lastReportAt: datetime
+
+
+class ReportClusterIndex:
+    """
+    In-memory index of recently active incident clusters
+
+    Clusters are bucketed by (category, geohash cell), so matching a new
+    report looks at the clusters of 9 cells only: O(1) per insert, with no
+    Report table access. Clusters created by other workers are pulled in
+    every CLUSTER_REFRESH_SECONDS through the ReportCluster.lastReportAt
+    index (only rows changed since the last pull).
+
+    Clusters stay in memory for the time window plus the report cache TTL,
+    so cached report documents never outlive their cluster's size updates.
+    """
+
+    def __init__(self):
+        self._clusters: Dict[str, _Cluster] = {}
+        self._cells: Dict[CellKey, Set[str]] = defaultdict(set)
+        self._watermark: Optional[datetime] = None
+        self._refreshed_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _window() -> timedelta:
+        return timedelta(minutes=settings.CLUSTER_WINDOW_MINUTES)
+
+    @staticmethod
+    def _retention() -> timedelta:
+        return timedelta(minutes=settings.CLUSTER_WINDOW_MINUTES, seconds=settings.REPORT_CACHE_TTL_SECONDS)
+
+    def _put(self, cluster: _Cluster) -> None:
+        self._clusters[cluster.clusterId] = cluster
+        self._cells[(cluster.categoryId, cluster.cell)].add(cluster.clusterId)
+
+    def _evict(self, now: datetime) -> None:
+        cutoff = now - self._retention()
+        for cluster_id in [c.clusterId for c in self._clusters.values() if c.lastReportAt < cutoff]:
+            cluster = self._clusters.pop(cluster_id)
+            cell = self._cells[(cluster.categoryId, cluster.cell)]
+            cell.discard(cluster_id)
+            if not cell:
+                del self._cells[(cluster.categoryId, cluster.cell)]
+
+    def refresh(self, db: Session, force: bool = False) -> None:
+        """Pull clusters changed since the last refresh (all active ones on first use)"""
+        if not force and self._refreshed_at is not None and \
+                time.monotonic() - self._refreshed_at < settings.CLUSTER_REFRESH_SECONDS:
+            return
+
+        now = _naive_utc(datetime.now(timezone.utc))
+        # Overlap the last pull: rows committed late can carry slightly older timestamps
+        since = self._watermark - timedelta(seconds=settings.CLUSTER_REFRESH_SECONDS) \
+            if self._watermark else now - self._retention()
+        rows = db.query(ReportCluster).filter(ReportCluster.lastReportAt > since).all()
+
+        with self._lock:
+            for row in rows:
+                self._put(_Cluster(
+                    clusterId=row.clusterId,
+                    categoryId=row.categoryId,
+                    cell=row.geohash[:CLUSTER_CELL_PRECISION],
+                    latitude=row.latitude,
+                    longitude=row.longitude,
+                    reportCount=row.reportCount,
+                    lastReportAt=row.lastReportAt
+                ))
+                if self._watermark is None or row.lastReportAt > self._watermark:
+                    self._watermark = row.lastReportAt
+            self._watermark = self._watermark or since
+            self._evict(now)
+            self._refreshed_at = time.monotonic()
+
+        if rows:
+            logger.debug(f"Pulled {len(rows)} report clusters")
+
+    def match(self, category_id: str, latitude: float, longitude: float, created_at: datetime) -> Optional[_Cluster]:
+        """Nearest cluster of the same category within the radius and time window"""
+        earliest = created_at - self._window()
+        best, best_distance = None, float(settings.CLUSTER_RADIUS_METERS)
+
+        with self._lock:
+            for cell in neighbor_cells(latitude, longitude, CLUSTER_CELL_PRECISION):
+                for cluster_id in self._cells.get((category_id, cell), ()):
+                    cluster = self._clusters[cluster_id]
+                    # Emptied by deletes: nothing left to be a duplicate of
+                    if cluster.reportCount <= 0 or cluster.lastReportAt < earliest:
+                        continue
+                    distance = haversine_meters(latitude, longitude, cluster.latitude, cluster.longitude)
+                    if distance <= best_distance:
+                        best, best_distance = cluster, distance
+        return best
+
+    def record_join(self, cluster_id: str, latitude: float, longitude: float, created_at: datetime) -> None:
+        with self._lock:
+            cluster = self._clusters.get(cluster_id)
+            if cluster:
+                count = cluster.reportCount
+                cluster.latitude = (cluster.latitude * count + latitude) / (count + 1)
+                cluster.longitude = (cluster.longitude * count + longitude) / (count + 1)
+                cluster.reportCount = count + 1
+                cluster.lastReportAt = max(cluster.lastReportAt, created_at)
+
+    def record_new(self, cluster: _Cluster) -> None:
+        with self._lock:
+            self._put(cluster)
+
+    def record_removal(self, cluster_id: str) -> None:
+        with self._lock:
+            cluster = self._clusters.get(cluster_id)
+            if cluster and cluster.reportCount > 0:
+                cluster.reportCount -= 1
+
+    def size(self, cluster_id: str) -> Optional[int]:
+        """Current size of an active cluster (None once it has left memory)"""
+        cluster = self._clusters.get(cluster_id)
+        return cluster.reportCount if cluster else None
+
+    def stats(self) -> dict:
+        """Index metrics (exposed on /health)"""
+        return {
+            "activeClusters": len(self._clusters),
+            "cells": len(self._cells)
+        }
+
+
+report_clusters = ReportClusterIndex()
+
+
+class ReportClusterService:
+    """
+    Groups new reports with recent reports of the same incident
+
+    assign() runs inside the report's transaction and writes the cluster
+    row changes (new cluster, or an atomic count/centroid increment);
+    record() applies the same change to the in-memory index after commit.
+    """
+
+    @staticmethod
+    def assign(db: Session, report: Report) -> Optional[Tuple[str, bool]]:
+        """
+        Set report.clusterId; the caller commits
+
+        Args:
+            db: Database session holding the report's transaction
+            report: New report (with coordinates from locate_report)
+
+        Returns:
+            (clusterId, is_new) to pass to record(), or None for reports without coordinates
+        """
+        if report.latitude is None or report.longitude is None:
+            return None
+
+        report_clusters.refresh(db)
+        created_at = _naive_utc(report.createdAt)
+        cluster = report_clusters.match(report.categoryId, report.latitude, report.longitude, created_at)
+
+        if cluster is None:
+            db.add(ReportCluster(
+                clusterId=report.reportId,
+                categoryId=report.categoryId,
+                geohash=report.geohash,
+                latitude=report.latitude,
+                longitude=report.longitude,
+                reportCount=1,
+                firstReportAt=created_at,
+                lastReportAt=created_at
+            ))
+            report.clusterId = report.reportId
+            return report.clusterId, True
+
+        # Single atomic UPDATE: concurrent joins from other workers can't lose counts
+        db.query(ReportCluster).filter(ReportCluster.clusterId == cluster.clusterId).update({
+            ReportCluster.latitude: (ReportCluster.latitude * ReportCluster.reportCount + report.latitude) / (ReportCluster.reportCount + 1),
+            ReportCluster.longitude: (ReportCluster.longitude * ReportCluster.reportCount + report.longitude) / (ReportCluster.reportCount + 1),
+            ReportCluster.reportCount: ReportCluster.reportCount + 1,
+            # A late-committed older report must not move the window back
+            ReportCluster.lastReportAt: case(
+                (ReportCluster.lastReportAt < created_at, created_at),
+                else_=ReportCluster.lastReportAt
+            )
+        }, synchronize_session=False)
+        report.clusterId = cluster.clusterId
+        return cluster.clusterId, False
+
+    @staticmethod
+    def record(report: Report, assignment: Optional[Tuple[str, bool]]) -> None:
+        """Apply a committed assign() to the in-memory index"""
+        if assignment is None:
+            return
+
+        cluster_id, is_new = assignment
+        created_at = _naive_utc(report.createdAt)
+        if is_new:
+            report_clusters.record_new(_Cluster(
+                clusterId=cluster_id,
+                categoryId=report.categoryId,
+                cell=report.geohash[:CLUSTER_CELL_PRECISION],
+                latitude=report.latitude,
+                longitude=report.longitude,
+                reportCount=1,
+                lastReportAt=created_at
+            ))
+        else:
+            report_clusters.record_join(cluster_id, report.latitude, report.longitude, created_at)
+
+    @staticmethod
+    def remove(db: Session, report: Report) -> None:
+        """Decrement the report's cluster count; the caller commits"""
+        if report.clusterId:
+            db.query(ReportCluster).filter(ReportCluster.clusterId == report.clusterId).update({
+                ReportCluster.reportCount: ReportCluster.reportCount - 1
+            }, synchronize_session=False)
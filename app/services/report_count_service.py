@@ -0,0 +1,185 @@
+import threading
+import time
+import logging
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Query, Session
+
+from app.core.config import settings
+from app.models.report import Report
+
+logger = logging.getLogger(__name__)
+
+# (status, category, userId); None means "not filtered"
+CountKey = Tuple[Optional[str], Optional[str], Optional[str]]
+
+def _matches(key: CountKey, values: CountKey) -> bool:
+    """True if a report with `values` is counted under filter `key`"""
+    return all(part is None or part == value for part, value in zip(key, values))
+
+
+class ReportCountCache:
+    """In-process TTL cache of exact filtered report counts"""
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: CountKey) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: CountKey, count: int) -> None:
+        with self._lock:
+            self._entries[key] = (count, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, values: CountKey) -> None:
+        """Drop every cached filter that counts a report with these (status, category, userId)"""
+        with self._lock:
+            for key in [key for key in self._entries if _matches(key, values)]:
+                del self._entries[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries)
+            }
+
+
+class ReportCounters:
+    """
+    Per-(status, category) report counters for approximate totals
+
+    Loaded with one GROUP BY (a handful of rows) and then kept current by
+    the write paths through adjust(). A periodic reload corrects drift from
+    writes made by other worker processes. Any status/category filter is
+    answered by summing cells, without touching the Report table.
+    """
+
+    def __init__(self, refresh_seconds: int):
+        self.refresh_seconds = refresh_seconds
+        self._cells: Dict[Tuple[str, str], int] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _refresh(self, db: Session) -> None:
+        rows = db.query(Report.status, Report.categoryId, func.count()).group_by(
+            Report.status, Report.categoryId
+        ).all()
+        with self._lock:
+            self._cells = {(status, category): count for status, category, count in rows}
+            self._loaded_at = time.monotonic()
+        logger.debug(f"Reloaded report counters ({len(rows)} cells)")
+
+    def estimate(self, db: Session, status: Optional[str], category: Optional[str]) -> int:
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > self.refresh_seconds:
+            self._refresh(db)
+        with self._lock:
+            return sum(
+                count for (cell_status, cell_category), count in self._cells.items()
+                if _matches((status, category, None), (cell_status, cell_category, None))
+            )
+
+    def adjust(self, status: str, category: str, delta: int) -> None:
+        with self._lock:
+            if self._loaded_at is not None:
+                cell = (status, category)
+                self._cells[cell] = max(0, self._cells.get(cell, 0) + delta)
+
+
+report_count_cache = ReportCountCache(
+    settings.REPORT_COUNT_CACHE_TTL_SECONDS,
+    settings.REPORT_COUNT_CACHE_MAX_ENTRIES
+)
+report_counters = ReportCounters(settings.REPORT_COUNTERS_REFRESH_SECONDS)
+
+
+class ReportCountService:
+    """Totals for report listings: exact, TTL-cached, or approximate"""
+
+    @staticmethod
+    def count(
+        db: Session,
+        query: Query,
+        status: Optional[str] = None,
+        category: Optional[str] = None,
+        user_id: Optional[str] = None,
+        mode: str = "cached"
+    ) -> Tuple[int, bool]:
+        """
+        Count the reports matched by a filtered listing query
+
+        Args:
+            db: Database session
+            query: The listing query, already filtered by status/category/userId
+            status: Status filter applied to the query
+            category: Category filter applied to the query
+            user_id: User filter applied to the query
+            mode: 'exact' (always COUNT), 'cached' (COUNT at most once per TTL)
+                or 'approximate' (maintained counters)
+
+        Returns:
+            (total, is_approximate)
+
+        A cached total is invalidated by this worker's writes only, so one
+        served from the cache may miss other workers' writes for up to
+        REPORT_COUNT_CACHE_TTL_SECONDS and is flagged approximate. A total
+        counted by this call is exact.
+        """
+        # Per-user sets are small and served by IX_Report_UserId, so they are never estimated
+        if mode == "approximate" and user_id is None:
+            return report_counters.estimate(db, status, category), True
+
+        if mode == "exact":
+            return query.order_by(None).count(), False
+
+        key = (status, category, user_id)
+        total = report_count_cache.get(key)
+        if total is not None:
+            return total, True
+
+        total = query.order_by(None).count()
+        report_count_cache.put(key, total)
+        return total, False
+
+    @staticmethod
+    def record_change(
+        before: Optional[CountKey] = None,
+        after: Optional[CountKey] = None
+    ) -> None:
+        """
+        Keep totals current after a committed report write
+
+        Pass `before` for deletes, `after` for creates, and both for updates,
+        as snapshot() tuples taken around the change.
+        """
+        for snapshot, delta in ((before, -1), (after, 1)):
+            if snapshot is None:
+                continue
+            status, category, user_id = snapshot
+            report_count_cache.invalidate((status, category, user_id))
+            report_counters.adjust(status, category, delta)
+
+    @staticmethod
+    def snapshot(report: Report) -> CountKey:
+        """The (status, categoryId, userId) a report is counted under"""
+        return report.status, report.categoryId, report.userId
@@ -0,0 +1,178 @@
+"""
+Report JSON documents built straight from column rows.
+
+Shared by the lean listing path and the report cache. Documents are plain
+dicts in the ReportResponse shape; attachment URLs are signed separately
+(sign_report_document) so unsigned documents can be cached.
+"""
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Iterable, Optional
+
+from sqlalchemy.orm import Query, Session
+
+from app.models.report import Report
+from app.models.attachment import Attachment
+from app.models.report_cluster import ReportCluster
+
+try:
+    import orjson
+
+    def dumps(payload: Any) -> bytes:
+        return orjson.dumps(payload)
+
+    def loads(data: bytes) -> Any:
+        return orjson.loads(data)
+except ImportError:  # Slower fallback with the same output
+    def _default(value: Any) -> str:
+        if isinstance(value, datetime):
+            return value.isoformat()
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+    def dumps(payload: Any) -> bytes:
+        return json.dumps(payload, default=_default, separators=(',', ':')).encode()
+
+    def loads(data: bytes) -> Any:
+        return json.loads(data)
+
+
+# Only the columns the responses need; rows come back as plain tuples
+REPORT_COLUMNS = (
+    Report.reportId,
+    Report.title,
+    Report.descriptionText,
+    Report.categoryId,
+    Report.status,
+    Report.locationRaw,
+    Report.latitude,
+    Report.longitude,
+    Report.aiConfidence,
+    Report.createdAt,
+    Report.updatedAt,
+    Report.userId,
+    Report.transcribedVoiceText,
+    Report.clusterId,
+    ReportCluster.reportCount.label("clusterSize"),
+    Report.assignedTo,
+    Report.assignedAt,
+)
+
+ATTACHMENT_COLUMNS = (
+    Attachment.attachmentId,
+    Attachment.reportId,
+    Attachment.blobStorageUri,
+    Attachment.thumbnailUri,
+    Attachment.mimeType,
+    Attachment.fileType,
+    Attachment.fileSizeBytes,
+    Attachment.createdAt,
+)
+
+
+def report_rows(db: Session) -> Query:
+    """Query for REPORT_COLUMNS (joins the cluster row for its size)"""
+    return db.query(*REPORT_COLUMNS).outerjoin(ReportCluster, ReportCluster.clusterId == Report.clusterId)
+
+
+def report_document(row, attachment_rows: Iterable) -> dict:
+    """Unsigned ReportResponse-shaped dict for one report row and its attachment rows"""
+    return {
+        "title": row.title,
+        "descriptionText": row.descriptionText,
+        "categoryId": row.categoryId,
+        "reportId": row.reportId,
+        "status": row.status,
+        "location": row.locationRaw,
+        "latitude": row.latitude,
+        "longitude": row.longitude,
+        "aiConfidence": row.aiConfidence,
+        "createdAt": row.createdAt,
+        "updatedAt": row.updatedAt,
+        "userId": row.userId,
+        "transcribedVoiceText": row.transcribedVoiceText,
+        "reportUrl": None,
+        "clusterId": row.clusterId,
+        "clusterSize": row.clusterSize,
+        "assignedTo": row.assignedTo,
+        "assignedAt": row.assignedAt,
+        "attachments": [
+            {
+                "attachmentId": att.attachmentId,
+                "reportId": att.reportId,
+                "blobStorageUri": att.blobStorageUri,
+                "thumbnailUri": att.thumbnailUri,
+                "mimeType": att.mimeType,
+                "fileType": att.fileType,
+                "fileSizeBytes": att.fileSizeBytes,
+                "createdAt": att.createdAt,
+            }
+            for att in attachment_rows
+        ],
+    }
+
+
+def sign_report_document(document: dict, blob_service) -> dict:
+    """Replace attachment thumbnailUri with signed downloadUrl/thumbnailUrl (in place)"""
+    for attachment in document["attachments"]:
+        thumbnail_uri = attachment.pop("thumbnailUri", None)
+        attachment["downloadUrl"] = blob_service.generate_download_url(attachment["blobStorageUri"])
+        attachment["thumbnailUrl"] = blob_service.generate_download_url(thumbnail_uri) if thumbnail_uri else None
+    return document
+
+
+def load_report_document(db: Session, report_id: str) -> Optional[dict]:
+    """Fetch one report and its attachments as an unsigned document (two PK/index seeks)"""
+    row = report_rows(db).filter(Report.reportId == report_id).first()
+    if row is None:
+        return None
+
+    attachment_rows = db.query(*ATTACHMENT_COLUMNS).filter(Attachment.reportId == report_id).all()
+    return report_document(row, attachment_rows)
+
+
+def _version_part(document: dict) -> str:
+    updated_at = document["updatedAt"]
+    if isinstance(updated_at, datetime):
+        updated_at = updated_at.isoformat()
+    # Thumbnails are added after upload, so their presence is part of the version
+    attachments = ",".join(
+        f"{att['attachmentId']}{'+t' if att.get('thumbnailUri') else ''}"
+        for att in document["attachments"]
+    )
+    return f"{document['reportId']}|{updated_at}|{document.get('clusterSize')}|{attachments}"
+
+
+def documents_etag(documents: Iterable[dict], page_metadata: Optional[dict] = None) -> str:
+    """
+    Strong ETag for unsigned report documents (and a listing's page metadata)
+
+    Derived from reportId, updatedAt, cluster size and the attachment set, so it is
+    computed before any SAS signing or JSON encoding.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for document in documents:
+        digest.update(_version_part(document).encode())
+        digest.update(b"\n")
+    if page_metadata is not None:
+        digest.update(dumps(page_metadata))
+    return f'"{digest.hexdigest()}"'
+
+
+def rows_etag(rows: Iterable, page_metadata: dict) -> str:
+    """Strong ETag for a page of flat rows (summary view), from every column value"""
+    digest = hashlib.blake2b(digest_size=16)
+    for row in rows:
+        digest.update(repr(tuple(row)).encode())
+        digest.update(b"\n")
+    digest.update(dumps(page_metadata))
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 specifies for GET)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
@@ -0,0 +1,143 @@
+import logging
+from typing import List, Optional
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+
+from app.models.report import Report
+from app.services.report_cache import get_report_cache
+from app.services.report_count_service import ReportCountService
+from app.services.report_service import utcnow_naive
+
+logger = logging.getLogger(__name__)
+
+# Rows are claimed oldest first. UPDLOCK holds each selected row until the
+# transaction ends; READPAST skips rows another claim is holding instead of
+# waiting on them, so concurrent officers never queue behind each other.
+# OUTPUT goes INTO a table variable because Report has an AFTER UPDATE trigger.
+_MSSQL_CLAIM = """
+SET NOCOUNT ON;
+DECLARE @claimed TABLE ([reportId] NVARCHAR(450), [categoryId] NVARCHAR(100), [userId] NVARCHAR(450), [createdAt] DATETIME2(7));
+WITH [next] AS (
+    SELECT TOP (:limit) [reportId], [categoryId], [userId], [createdAt], [status], [assignedTo], [assignedAt], [updatedAt]
+    FROM [dbo].[Report] WITH (UPDLOCK, READPAST, ROWLOCK)
+    WHERE [status] = 'Submitted'{category_filter}
+    ORDER BY [createdAt], [reportId]
+)
+UPDATE [next]
+SET [status] = 'Assigned', [assignedTo] = :officer_id, [assignedAt] = :claimed_at, [updatedAt] = :claimed_at
+OUTPUT inserted.[reportId], inserted.[categoryId], inserted.[userId], inserted.[createdAt] INTO @claimed;
+SELECT [reportId], [categoryId], [userId] FROM @claimed ORDER BY [createdAt], [reportId];
+"""
+
+
+class ReportQueueService:
+    """
+    Officer work queue over Submitted reports
+
+    Each claim is one short transaction that moves the oldest Submitted
+    reports to Assigned for the calling officer. Concurrent claims skip
+    each other's locked rows, so no report is handed out twice and no
+    claim waits on another.
+    """
+
+    @staticmethod
+    def claim(
+        db: Session,
+        officer_id: str,
+        limit: int = 1,
+        categories: Optional[List[str]] = None
+    ) -> List[str]:
+        """
+        Atomically assign the next Submitted reports to an officer
+
+        Args:
+            db: Database session (Operations DB primary)
+            officer_id: userId of the claiming officer
+            limit: Maximum number of reports to claim
+            categories: Only claim reports of these categories (any when empty)
+
+        Returns:
+            Claimed report IDs, oldest first (fewer than limit when the queue runs dry)
+
+        Raises:
+            HTTPException: If the claim cannot be committed
+        """
+        claimed_at = utcnow_naive()
+
+        try:
+            if db.get_bind().dialect.name == "mssql":
+                rows = ReportQueueService._claim_mssql(db, officer_id, limit, categories, claimed_at)
+            else:
+                rows = ReportQueueService._claim_portable(db, officer_id, limit, categories, claimed_at)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to claim reports: {str(e)}"
+            )
+
+        for row in rows:
+            ReportCountService.record_change(
+                before=("Submitted", row.categoryId, row.userId),
+                after=("Assigned", row.categoryId, row.userId)
+            )
+        report_ids = [row.reportId for row in rows]
+        if report_ids:
+            get_report_cache().invalidate(*report_ids)
+            logger.info(f"✓ Officer {officer_id} claimed {len(report_ids)} reports")
+
+        return report_ids
+
+    @staticmethod
+    def _claim_mssql(db: Session, officer_id: str, limit: int, categories: Optional[List[str]], claimed_at) -> list:
+        """Single UPDATE ... WITH (UPDLOCK, READPAST) statement"""
+        params = {"limit": limit, "officer_id": officer_id, "claimed_at": claimed_at}
+        statement = text(_MSSQL_CLAIM.format(
+            category_filter=" AND [categoryId] IN :categories" if categories else ""
+        ))
+        if categories:
+            statement = statement.bindparams(bindparam("categories", expanding=True))
+            params["categories"] = list(categories)
+
+        return db.execute(statement, params).all()
+
+    @staticmethod
+    def _claim_portable(db: Session, officer_id: str, limit: int, categories: Optional[List[str]], claimed_at) -> list:
+        """
+        SELECT ... FOR UPDATE SKIP LOCKED, then a guarded UPDATE
+
+        Dialects without row locks ignore FOR UPDATE; the status guard in
+        the UPDATE still prevents double assignment, but a claim racing
+        another may return fewer reports than were available.
+        """
+        query = db.query(Report.reportId).filter(Report.status == "Submitted")
+        if categories:
+            query = query.filter(Report.categoryId.in_(categories))
+
+        candidates = [
+            report_id for (report_id,) in query.order_by(Report.createdAt, Report.reportId)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        ]
+        if not candidates:
+            return []
+
+        db.query(Report).filter(
+            Report.reportId.in_(candidates),
+            Report.status == "Submitted"
+        ).update({
+            Report.status: "Assigned",
+            Report.assignedTo: officer_id,
+            Report.assignedAt: claimed_at,
+            Report.updatedAt: claimed_at
+        }, synchronize_session=False)
+
+        return db.query(Report.reportId, Report.categoryId, Report.userId).filter(
+            Report.reportId.in_(candidates),
+            Report.assignedTo == officer_id,
+            Report.assignedAt == claimed_at
+        ).order_by(Report.createdAt, Report.reportId).all()
@@ -0,0 +1,334 @@
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, func, or_
+from sqlalchemy.orm import Session
+
+from app.models.report import Report
+from app.models.attachment import Attachment
+from app.models.report_search_term import ReportSearchTerm
+from app.core.config import settings
+from app.services.blob_service import get_blob_service
+from app.services.geolocation import bounding_box, covering_cells, haversine_meters
+from app.services.report_count_service import ReportCountService, report_counters
+from app.services.report_documents import (
+    ATTACHMENT_COLUMNS,
+    documents_etag,
+    dumps,
+    etag_matches,
+    report_document,
+    report_rows,
+    rows_etag,
+    sign_report_document,
+)
+from app.services.report_service import ReportService
+from app.services.text_normalization import tokenize
+
+MAX_SEARCH_TERMS = 8
+
+
+def serialize_report_page(
+    report_rows: Iterable,
+    attachments_by_report: Dict[str, List],
+    blob_service,
+    page_metadata: dict
+) -> bytes:
+    """
+    Encode a page of report and attachment rows as ReportListResponse JSON
+
+    Builds plain dicts straight from the row tuples, with no ORM or Pydantic
+    objects per row.
+    """
+    documents = [report_document(row, attachments_by_report.get(row.reportId, ())) for row in report_rows]
+    return serialize_documents(documents, blob_service, page_metadata)
+
+
+def serialize_documents(documents: List[dict], blob_service, page_metadata: dict) -> bytes:
+    """Sign unsigned report documents and encode them as ReportListResponse JSON"""
+    reports = [sign_report_document(document, blob_service) for document in documents]
+    return dumps({"reports": reports, **page_metadata})
+
+
+class ReportReadService:
+    """
+    Lean read path for the report listing endpoints
+
+    Rows are fetched as column tuples (no identity map or ORM instances)
+    and encoded straight to JSON bytes in the ReportListResponse shape,
+    skipping per-row Pydantic models and FastAPI's response_model
+    re-validation.
+    """
+
+    @staticmethod
+    def list_reports(
+        db: Session,
+        user_id: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 10,
+        status: Optional[str] = None,
+        category: Optional[str] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+        count_mode: str = "cached",
+        view: str = "full",
+        if_none_match: Optional[str] = None
+    ) -> Tuple[str, Optional[bytes]]:
+        """
+        List reports as a JSON-encoded ReportListResponse
+
+        Args:
+            db: Database session
+            user_id: Optional reporter filter
+            skip: Number of records to skip (legacy offset pagination; ignored with a cursor)
+            limit: Maximum number of records to return
+            status: Optional status filter
+            category: Optional category filter
+            cursor: nextCursor from the previous page
+            include_total: Also return the total (opt-in)
+            count_mode: How to compute the total: 'exact', 'cached' (TTL) or 'approximate'
+            view: 'full' (reports with attachments) or 'summary'
+            if_none_match: If-None-Match request header
+
+        Returns:
+            (ETag, UTF-8 JSON body); the body is None if the client's copy is current
+        """
+        if view == "summary":
+            query = ReportService._summary_query(db)
+        else:
+            query = report_rows(db)
+
+        if status:
+            query = query.filter(Report.status == status)
+        if category:
+            query = query.filter(Report.categoryId == category)
+        if user_id:
+            query = query.filter(Report.userId == user_id)
+
+        total, approximate = ReportCountService.count(
+            db, query, status, category, user_id, mode=count_mode
+        ) if include_total else (None, False)
+        rows, next_cursor = ReportService._paginate(query, limit, skip, cursor)
+        page_metadata = ReportService._page_metadata(limit, skip, cursor, next_cursor, total, approximate)
+
+        if view == "summary":
+            etag = rows_etag(rows, page_metadata)
+            if etag_matches(if_none_match, etag):
+                return etag, None
+            return etag, dumps({"reports": [dict(row._mapping) for row in rows], **page_metadata})
+
+        # One query for the whole page's attachments
+        attachments_by_report = defaultdict(list)
+        if rows:
+            attachment_rows = db.query(*ATTACHMENT_COLUMNS).filter(
+                Attachment.reportId.in_([row.reportId for row in rows])
+            ).all()
+            for att in attachment_rows:
+                attachments_by_report[att.reportId].append(att)
+
+        # Validate before signing any SAS URL or encoding anything
+        documents = [report_document(row, attachments_by_report.get(row.reportId, ())) for row in rows]
+        etag = documents_etag(documents, page_metadata)
+        if etag_matches(if_none_match, etag):
+            return etag, None
+
+        return etag, serialize_documents(documents, get_blob_service(), page_metadata)
+
+    @staticmethod
+    def get_reports(db: Session, report_ids: List[str]) -> bytes:
+        """
+        Fetch many reports as a JSON-encoded ReportBatchGetResponse
+
+        One IN query for the reports, one for their attachments, and a single
+        blob service signing every URL in one pass.
+
+        Args:
+            db: Database session
+            report_ids: Report IDs (at most a few hundred, well under SQL Server's 2100 parameters)
+
+        Returns:
+            UTF-8 JSON body; reports keep the requested order, unknown IDs are listed in 'missing'
+        """
+        requested = list(dict.fromkeys(report_ids))
+
+        rows = report_rows(db).filter(Report.reportId.in_(requested)).all()
+        rows_by_id = {row.reportId: row for row in rows}
+
+        attachments_by_report = defaultdict(list)
+        if rows:
+            attachment_rows = db.query(*ATTACHMENT_COLUMNS).filter(
+                Attachment.reportId.in_(list(rows_by_id))
+            ).all()
+            for att in attachment_rows:
+                attachments_by_report[att.reportId].append(att)
+
+        blob_service = get_blob_service()
+        reports = [
+            sign_report_document(report_document(rows_by_id[report_id], attachments_by_report[report_id]), blob_service)
+            for report_id in requested
+            if report_id in rows_by_id
+        ]
+        missing = [report_id for report_id in requested if report_id not in rows_by_id]
+        return dumps({"reports": reports, "missing": missing})
+
+    @staticmethod
+    def search_reports(
+        db: Session,
+        query_text: str,
+        status: Optional[str] = None,
+        category: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 20
+    ) -> bytes:
+        """
+        Full-text search over title, description and transcribed voice text
+
+        Every query term must match (AND). Hits are ranked by the sum of each
+        term's weighted frequency times its BM25 inverse document frequency,
+        so rare terms and title matches rank first. Postings are read with
+        range seeks on the ReportSearchTerm clustered key, never a Report scan.
+
+        Args:
+            db: Database session
+            query_text: Free text in Arabic and/or English
+            status: Optional status filter
+            category: Optional category filter
+            skip: Number of hits to skip
+            limit: Maximum number of hits to return
+
+        Returns:
+            UTF-8 JSON body (ReportSearchResponse)
+        """
+        terms = list(dict.fromkeys(tokenize(query_text)))[:MAX_SEARCH_TERMS]
+        page_metadata = {"terms": terms, "page": skip // limit + 1, "pageSize": limit}
+        if not terms:
+            return dumps({"reports": [], "hasMore": False, **page_metadata})
+
+        document_frequency = dict(db.query(
+            ReportSearchTerm.term,
+            func.count(ReportSearchTerm.reportId)
+        ).filter(ReportSearchTerm.term.in_(terms)).group_by(ReportSearchTerm.term).all())
+
+        # A term no report contains means no report contains all of them
+        if len(document_frequency) < len(terms):
+            return dumps({"reports": [], "hasMore": False, **page_metadata})
+
+        total_reports = max(report_counters.estimate(db, None, None), max(document_frequency.values()))
+        idf = {
+            term: math.log(1 + (total_reports - df + 0.5) / (df + 0.5))
+            for term, df in document_frequency.items()
+        }
+        score = func.sum(
+            ReportSearchTerm.weight * case(idf, value=ReportSearchTerm.term, else_=0.0)
+        ).label("score")
+
+        hits_query = db.query(ReportSearchTerm.reportId, score).filter(ReportSearchTerm.term.in_(terms))
+        if status or category:
+            hits_query = hits_query.join(Report, Report.reportId == ReportSearchTerm.reportId)
+            if status:
+                hits_query = hits_query.filter(Report.status == status)
+            if category:
+                hits_query = hits_query.filter(Report.categoryId == category)
+
+        hits = hits_query.group_by(ReportSearchTerm.reportId).having(
+            func.count(ReportSearchTerm.term) == len(terms)
+        ).order_by(score.desc(), ReportSearchTerm.reportId.desc()).offset(skip).limit(limit + 1).all()
+
+        has_more = len(hits) > limit
+        hits = hits[:limit]
+
+        summaries = {}
+        if hits:
+            summaries = {
+                row.reportId: dict(row._mapping)
+                for row in ReportService._summary_query(db).filter(
+                    Report.reportId.in_([hit.reportId for hit in hits])
+                ).all()
+            }
+
+        reports = [
+            {**summaries[hit.reportId], "score": round(float(hit.score), 4)}
+            for hit in hits
+            if hit.reportId in summaries
+        ]
+        return dumps({"reports": reports, "hasMore": has_more, **page_metadata})
+
+    @staticmethod
+    def nearby_reports(
+        db: Session,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+        radius_meters: float = 1000,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+        status: Optional[str] = None,
+        category: Optional[str] = None,
+        limit: int = 50
+    ) -> bytes:
+        """
+        Reports within a radius of a point (nearest first) or inside a bounding box (newest first)
+
+        The search area is covered by a handful of geohash prefixes, each one
+        range seek on IX_Report_Geohash (which also carries the coordinates and
+        filter columns), then trimmed to the exact box/circle.
+
+        Args:
+            db: Database session
+            latitude: Center latitude (radius search)
+            longitude: Center longitude (radius search)
+            radius_meters: Search radius
+            bbox: (min_lat, min_lon, max_lat, max_lon); takes precedence over the radius search
+            status: Optional status filter
+            category: Optional category filter
+            limit: Maximum number of reports to return
+
+        Returns:
+            UTF-8 JSON body (ReportNearbyResponse)
+        """
+        min_lat, min_lon, max_lat, max_lon = bbox or bounding_box(latitude, longitude, radius_meters)
+
+        query = db.query(Report.reportId, Report.latitude, Report.longitude).filter(
+            or_(*[Report.geohash.like(f"{cell}%") for cell in covering_cells(min_lat, min_lon, max_lat, max_lon)]),
+            Report.latitude.between(min_lat, max_lat),
+            Report.longitude.between(min_lon, max_lon)
+        )
+        if status:
+            query = query.filter(Report.status == status)
+        if category:
+            query = query.filter(Report.categoryId == category)
+
+        if bbox:
+            rows = query.order_by(Report.createdAt.desc()).limit(limit + 1).all()
+            truncated = len(rows) > limit
+            hits = [(row, None) for row in rows[:limit]]
+        else:
+            rows = query.limit(settings.NEARBY_MAX_CANDIDATES + 1).all()
+            truncated = len(rows) > settings.NEARBY_MAX_CANDIDATES
+            in_radius = []
+            for row in rows[:settings.NEARBY_MAX_CANDIDATES]:
+                distance = haversine_meters(latitude, longitude, row.latitude, row.longitude)
+                if distance <= radius_meters:
+                    in_radius.append((row, distance))
+            in_radius.sort(key=lambda hit: hit[1])
+            truncated = truncated or len(in_radius) > limit
+            hits = in_radius[:limit]
+
+        summaries = {}
+        if hits:
+            summaries = {
+                row.reportId: dict(row._mapping)
+                for row in ReportService._summary_query(db).filter(
+                    Report.reportId.in_([row.reportId for row, _ in hits])
+                ).all()
+            }
+
+        reports = [
+            {
+                **summaries[row.reportId],
+                "latitude": row.latitude,
+                "longitude": row.longitude,
+                "distanceMeters": round(distance, 1) if distance is not None else None
+            }
+            for row, distance in hits
+            if row.reportId in summaries
+        ]
+        return dumps({"reports": reports, "pageSize": limit, "truncated": truncated})
@@ -0,0 +1,94 @@
+import logging
+from typing import Dict
+
+from sqlalchemy.orm import Session
+
+from app.models.report import Report
+from app.models.report_search_term import ReportSearchTerm
+from app.services.text_normalization import term_weights
+
+logger = logging.getLogger(__name__)
+
+# Per-occurrence weight of a term in each field
+TITLE_WEIGHT = 3
+DESCRIPTION_WEIGHT = 1
+TRANSCRIPT_WEIGHT = 1
+
+
+class ReportSearchService:
+    """
+    Maintains the ReportSearchTerm inverted index
+
+    Reports are indexed in the transaction that creates them, so search
+    results are consistent with the Report table on every worker. Deletes
+    are handled by the FK cascade. Queries are served by
+    ReportReadService.search_reports.
+    """
+
+    @staticmethod
+    def _terms(report: Report) -> Dict[str, int]:
+        return term_weights([
+            (report.title, TITLE_WEIGHT),
+            (report.descriptionText, DESCRIPTION_WEIGHT),
+            (report.transcribedVoiceText, TRANSCRIPT_WEIGHT),
+        ])
+
+    @staticmethod
+    def index_report(db: Session, report: Report) -> None:
+        """
+        Add (or replace) a report's terms; the caller commits
+
+        Args:
+            db: Database session holding the report's transaction
+            report: Report with its text fields set
+        """
+        db.query(ReportSearchTerm).filter(
+            ReportSearchTerm.reportId == report.reportId
+        ).delete(synchronize_session=False)
+
+        db.add_all([
+            ReportSearchTerm(term=term, reportId=report.reportId, weight=weight)
+            for term, weight in ReportSearchService._terms(report).items()
+        ])
+
+    @staticmethod
+    def reindex(db: Session, batch_size: int = 500) -> int:
+        """
+        Rebuild the index for every report (backfill, or after changing normalization)
+
+        Commits once per batch, walking the primary key so memory stays flat.
+
+        Returns:
+            Number of reports indexed
+        """
+        indexed = 0
+        last_id = ""
+
+        while True:
+            reports = db.query(Report).filter(
+                Report.reportId > last_id
+            ).order_by(Report.reportId).limit(batch_size).all()
+            if not reports:
+                break
+
+            for report in reports:
+                ReportSearchService.index_report(db, report)
+            indexed += len(reports)
+            last_id = reports[-1].reportId
+
+            db.commit()
+            db.expunge_all()
+            logger.info(f"✓ Search index: {indexed} reports indexed")
+
+        return indexed
+
+
+if __name__ == "__main__":
+    from app.core.database import SessionLocalOps
+
+    logging.basicConfig(level=logging.INFO)
+    session = SessionLocalOps()
+    try:
+        print(f"Indexed {ReportSearchService.reindex(session)} reports")
+    finally:
+        session.close()
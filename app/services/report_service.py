@@ -1,19 +1,38 @@
+import asyncio
+import base64
+import json
 import uuid
 from datetime import datetime, timezone
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
-from sqlalchemy.orm import selectinload, Session
+from sqlalchemy import and_, func, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Query, selectinload, Session
 from fastapi import HTTPException, UploadFile
 
-from app.services.blob_service import BlobStorageService
-from app.schemas.attachment import FileType
+from app.core.config import settings
+from app.core.database import AsyncDB
+from app.services.blob_service import (
+    AsyncStorageBackend,
+    get_blob_service,
+    get_async_blob_service
+)
+from app.schemas.attachment import FileType, UploadTicketRequest, UploadTicketResponse
 
 from app.models.report import Report
 from app.models.attachment import Attachment
+from app.models.blob_purge import BlobPurge
+from app.models.blob_reference import BlobReference
+from app.services.purge_service import PurgeService
+from app.services.report_count_service import ReportCountService
+from app.services.report_cache import get_report_cache
+from app.services.report_search_service import ReportSearchService
+from app.services.geolocation import locate_report
+from app.services.report_cluster_service import ReportClusterService, report_clusters
 from app.schemas.report import (
     ReportCreate, 
+    ReportFinalize,
     ReportResponse, 
-    ReportListResponse, 
     ReportStatusUpdate
 )
 
@@ -21,12 +40,16 @@ def utcnow():
     """Helper function to get current UTC time"""
     return datetime.now(timezone.utc)
 
+def utcnow_naive():
+    """Current UTC time without tzinfo, for comparing with DATETIME2 columns"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
 class ReportService:
     """Service layer for report operations"""
     
     @staticmethod
     async def create_report_with_files(
-        db: Session,
+        db: AsyncDB,
         report_data: ReportCreate,
         files: List[UploadFile],
         user_id: Optional[str] = None
@@ -35,13 +58,17 @@ class ReportService:
         Create a report with file attachments
         
         Process:
-        1. Creates Report record in database
-        2. Uploads each file to Azure Blob Storage
-        3. Saves attachment metadata to database
+        1. Uploads all files to Azure Blob Storage concurrently (non-blocking)
+        2. References each blob, uploading again any that a purge deleted meanwhile
+        3. Creates Report and Attachment records in one transaction
         4. Returns response with temporary SAS download URLs
         
+        Database work runs through db.run_sync, off the event loop, and no
+        transaction is held open while files upload (except to restore a
+        purged blob, which is rare).
+        
         Args:
-            db: Database session
+            db: Async database session
             report_data: Report data from request
             files: List of uploaded files
             user_id: User ID (None for anonymous reports)
@@ -53,112 +80,92 @@ class ReportService:
             HTTPException: If file upload or database operation fails
         """
         
-        # --- 1. Create Report Record ---
-        report_id = f"R-{uuid.uuid4().hex[:8].upper()}"
-        
-        db_report = Report(
-            reportId=report_id,
-            title=report_data.title,
-            descriptionText=report_data.descriptionText,
-            locationRaw=report_data.location,
-            categoryId=report_data.categoryId.value if report_data.categoryId else "other",
-            userId=user_id,
-            transcribedVoiceText=report_data.transcribedVoiceText,
-            status="Submitted",
-            aiConfidence=None,
-            createdAt=utcnow(),
-            updatedAt=utcnow()
-        )
-        
-        db.add(db_report)
-        db.flush()  # Insert report without committing transaction
-        
-        # --- 2. Initialize Blob Service ---
-        blob_service = BlobStorageService()
-        attachment_responses_data = []
-        uploaded_blobs = []  # Track uploaded blobs for rollback
-        
-        # --- 3. Process Each File ---
-        for file in files:
-            try:
-                # Read file content
-                file_bytes = await file.read()
-                
-                if len(file_bytes) == 0:
-                    raise Exception(f"File '{file.filename}' is empty")
-                
-                # Upload to Azure Blob Storage
-                blob_url = blob_service.upload_file(
-                    file_content=file_bytes,
-                    filename=file.filename or "unnamed",
-                    content_type=file.content_type or "application/octet-stream"
+        # --- 1. Upload All Files Concurrently ---
+        blob_service = get_async_blob_service()
+        upload_results = await ReportService._upload_files_concurrently(blob_service, files)
+        
+        # Track every blob this request created, for potential rollback
+        # (deduplicated uploads reuse an existing blob and are never deleted here)
+        uploaded_blobs = {
+            result["sha256"]: result["url"] for result in upload_results
+            if isinstance(result, dict) and result.get("created")
+        }
+        
+        for file, upload_result in zip(files, upload_results):
+            error = None
+            if isinstance(upload_result, BaseException):
+                error = str(upload_result)
+            elif not upload_result:
+                error = "Failed to upload file to blob storage"
+            elif upload_result["size"] == 0:
+                error = f"File '{file.filename}' is empty"
+            
+            if error:
+                await ReportService._rollback_uploaded_blobs(db, blob_service, uploaded_blobs)
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Failed to process file '{file.filename}': {error}"
                 )
+        
+        # --- 2. Reference the Blobs (re-uploading any purged meanwhile) ---
+        def acquire_references(session: Session) -> List[bool]:
+            return [
+                ReportService._acquire_blob_reference(session, upload_result["sha256"], upload_result["url"])
+                for upload_result in upload_results
+            ]
+        
+        # --- 3. Create Report and Attachment Records ---
+        def persist(session: Session) -> Tuple[Report, ReportResponse, Optional[Tuple[str, bool]]]:
+            db_report = ReportService._new_report(report_data, user_id)
+            locate_report(session, db_report)
+            session.add(db_report)
+            
+            attachment_responses_data = []
+            for file, upload_result in zip(files, upload_results):
+                blob_url = upload_result["url"]
                 
-                if not blob_url:
-                    raise Exception(f"Failed to upload file to blob storage")
-                
-                uploaded_blobs.append(blob_url)  # Track for potential rollback
-                
-                # Generate temporary SAS download URL (expires in 1 hour)
-                download_url = blob_service.generate_download_url(blob_url)
-                
-                # Determine file type from MIME type
                 mime = file.content_type or "application/octet-stream"
-                if mime.startswith("image/"):
-                    file_type = FileType.IMAGE
-                elif mime.startswith("video/"):
-                    file_type = FileType.VIDEO
-                elif mime.startswith("audio/"):
-                    file_type = FileType.AUDIO
-                else:
-                    file_type = FileType.DOCUMENT
+                file_type = ReportService._classify_mime(mime)
                 
-                # Create attachment record in database
                 new_attachment = Attachment(
                     attachmentId=str(uuid.uuid4()),
-                    reportId=report_id,
+                    reportId=db_report.reportId,
                     blobStorageUri=blob_url,
+                    contentHash=upload_result["sha256"],
                     mimeType=mime,
                     fileType=file_type.value,
-                    fileSizeBytes=len(file_bytes)
+                    fileSizeBytes=upload_result["size"]
                 )
-                db.add(new_attachment)
+                session.add(new_attachment)
                 
-                # Prepare attachment data for response
                 attachment_responses_data.append({
                     "attachmentId": new_attachment.attachmentId,
-                    "reportId": report_id,
+                    "reportId": db_report.reportId,
                     "blobStorageUri": blob_url,
-                    "downloadUrl": download_url,
+                    "downloadUrl": blob_service.generate_download_url(blob_url),
                     "mimeType": mime,
                     "fileType": file_type.value,
-                    "fileSizeBytes": len(file_bytes),
+                    "fileSizeBytes": upload_result["size"],
                     "createdAt": utcnow()
                 })
-                
-            except Exception as e:
-                # Rollback: Delete uploaded blobs and rollback database transaction
-                db.rollback()
-                for blob_url in uploaded_blobs:
-                    blob_service.delete_file(blob_url)
-                
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Failed to process file '{file.filename}': {str(e)}"
-                )
-        
-        # --- 4. Commit Transaction and Return ---
-        try:
-            db.commit()
-            db.refresh(db_report)
             
-            return ReportResponse(
+            ReportSearchService.index_report(session, db_report)
+            cluster_assignment = ReportClusterService.assign(session, db_report)
+            session.commit()
+            session.refresh(db_report)
+            
+            # Built here: the cluster relationship lazy-loads
+            response = ReportResponse(
                 reportId=db_report.reportId,
                 title=db_report.title,
                 descriptionText=db_report.descriptionText,
                 categoryId=db_report.categoryId,
                 status=db_report.status,
                 location=db_report.locationRaw,
+                latitude=db_report.latitude,
+                longitude=db_report.longitude,
+                clusterId=db_report.clusterId,
+                clusterSize=db_report.cluster.reportCount if db_report.cluster else None,
                 aiConfidence=db_report.aiConfidence,
                 createdAt=db_report.createdAt,
                 updatedAt=db_report.updatedAt,
@@ -167,16 +174,503 @@ class ReportService:
                 attachments=attachment_responses_data,
                 reportUrl=None  # Will be set by API endpoint
             )
+            return db_report, response, cluster_assignment
+        
+        # --- 4. Commit Transaction and Return ---
+        try:
+            new_references = await db.run_sync(acquire_references)
+            await ReportService._restore_purged_blobs(
+                blob_service, files, upload_results, new_references, uploaded_blobs
+            )
+            db_report, response, cluster_assignment = await db.run_sync(persist)
         except Exception as e:
-            # Rollback on commit failure
-            db.rollback()
-            for blob_url in uploaded_blobs:
-                blob_service.delete_file(blob_url)
+            await db.rollback()
+            await ReportService._rollback_uploaded_blobs(db, blob_service, uploaded_blobs)
+            
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to create report: {str(e)}"
+            )
+        
+        ReportCountService.record_change(after=ReportCountService.snapshot(db_report))
+        ReportClusterService.record(db_report, cluster_assignment)
+        return response
+    
+    @staticmethod
+    def issue_upload_tickets(ticket_request: UploadTicketRequest) -> List[UploadTicketResponse]:
+        """
+        Issue write-only SAS URLs so clients upload attachments directly to blob storage
+        
+        Phase 1 of the direct upload flow. The client PUTs each file to its
+        uploadUrl, then calls finalize_report_with_blobs with the blobStorageUri
+        values. Tickets that are never finalized leave unreferenced blobs.
+        
+        Args:
+            ticket_request: Files the client intends to upload
+        
+        Returns:
+            One UploadTicketResponse per requested file
+        
+        Raises:
+            HTTPException: If a SAS URL cannot be generated
+        """
+        blob_service = get_blob_service()
+        tickets = []
+        
+        for file in ticket_request.files:
+            ticket = blob_service.generate_upload_url(file.filename)
+            
+            if not ticket:
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Failed to issue upload URL for '{file.filename}'"
+                )
+            
+            tickets.append(UploadTicketResponse(
+                filename=file.filename,
+                blobStorageUri=ticket["blob_url"],
+                uploadUrl=ticket["upload_url"],
+                uploadHeaders={
+                    "x-ms-blob-type": "BlockBlob",
+                    "x-ms-blob-content-type": file.mimeType
+                },
+                expiresAt=ticket["expires_at"]
+            ))
+        
+        return tickets
+    
+    @staticmethod
+    def finalize_report_with_blobs(
+        db: Session,
+        report_data: ReportFinalize
+    ) -> ReportResponse:
+        """
+        Create a report from attachments uploaded directly to blob storage
+        
+        Phase 2 of the direct upload flow. Only metadata passes through the API.
+        
+        Process:
+        1. Verifies each blob was issued by issue_upload_tickets, exists in
+           the container (get_file_metadata) and is not attached or purged
+        2. Creates Report and Attachment records from the verified blob properties
+        3. Returns response with temporary SAS download URLs
+        
+        Args:
+            db: Database session
+            report_data: Report data plus blobStorageUri of each uploaded file
+        
+        Returns:
+            ReportResponse with report details and attachments
+        
+        Raises:
+            HTTPException: If a blob is missing, invalid, or already attached
+        """
+        blob_service = get_blob_service()
+        blob_urls = [att.blobStorageUri.split('?')[0] for att in report_data.attachments]
+        
+        if len(set(blob_urls)) != len(blob_urls):
+            raise HTTPException(status_code=400, detail="Duplicate blobStorageUri in attachments")
+        
+        # --- 1. Verify Uploaded Blobs ---
+        verified = []
+        for blob_url in blob_urls:
+            # Only ticket blobs: any other blob may be shared or owned elsewhere
+            if not blob_service.is_upload_ticket_url(blob_url):
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"'{blob_url}' is not an attachment upload URL"
+                )
+            
+            metadata = blob_service.get_file_metadata(blob_url)
+            if not metadata:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"File '{blob_url}' has not been uploaded"
+                )
+            
+            if not metadata["size"] or metadata["size"] > settings.MAX_ATTACHMENT_SIZE_BYTES:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"File '{blob_url}' is empty or larger than {settings.MAX_ATTACHMENT_SIZE_BYTES} bytes"
+                )
             
+            verified.append((blob_url, metadata))
+        
+        already_attached = db.query(Attachment.blobStorageUri).filter(
+            Attachment.blobStorageUri.in_(blob_urls)
+        ).first()
+        if already_attached:
+            raise HTTPException(
+                status_code=409,
+                detail=f"File '{already_attached[0]}' is already attached to a report"
+            )
+        
+        # A blob released by a deleted report stays in storage until the purge runs
+        pending_purge = db.query(BlobPurge.blobStorageUri).filter(
+            BlobPurge.blobStorageUri.in_(blob_urls)
+        ).first()
+        if pending_purge:
+            raise HTTPException(
+                status_code=409,
+                detail=f"File '{pending_purge[0]}' has been deleted"
+            )
+        
+        # --- 2. Create Report and Attachment Records ---
+        db_report = ReportService._new_report(report_data, report_data.userId)
+        locate_report(db, db_report)
+        db.add(db_report)
+        
+        attachment_responses_data = []
+        for blob_url, metadata in verified:
+            mime = metadata["content_type"] or "application/octet-stream"
+            file_type = ReportService._classify_mime(mime)
+            
+            new_attachment = Attachment(
+                attachmentId=str(uuid.uuid4()),
+                reportId=db_report.reportId,
+                blobStorageUri=blob_url,
+                mimeType=mime,
+                fileType=file_type.value,
+                fileSizeBytes=metadata["size"]
+            )
+            db.add(new_attachment)
+            
+            attachment_responses_data.append({
+                "attachmentId": new_attachment.attachmentId,
+                "reportId": db_report.reportId,
+                "blobStorageUri": blob_url,
+                "downloadUrl": blob_service.generate_download_url(blob_url),
+                "mimeType": mime,
+                "fileType": file_type.value,
+                "fileSizeBytes": metadata["size"],
+                "createdAt": utcnow()
+            })
+        
+        # --- 3. Commit Transaction and Return ---
+        try:
+            ReportSearchService.index_report(db, db_report)
+            cluster_assignment = ReportClusterService.assign(db, db_report)
+            db.commit()
+            db.refresh(db_report)
+            ReportCountService.record_change(after=ReportCountService.snapshot(db_report))
+            ReportClusterService.record(db_report, cluster_assignment)
+        except Exception as e:
+            db.rollback()
             raise HTTPException(
                 status_code=500,
                 detail=f"Failed to create report: {str(e)}"
             )
+        
+        return ReportResponse(
+            reportId=db_report.reportId,
+            title=db_report.title,
+            descriptionText=db_report.descriptionText,
+            categoryId=db_report.categoryId,
+            status=db_report.status,
+            location=db_report.locationRaw,
+            latitude=db_report.latitude,
+            longitude=db_report.longitude,
+            clusterId=db_report.clusterId,
+            clusterSize=db_report.cluster.reportCount if db_report.cluster else None,
+            aiConfidence=db_report.aiConfidence,
+            createdAt=db_report.createdAt,
+            updatedAt=db_report.updatedAt,
+            userId=db_report.userId,
+            transcribedVoiceText=db_report.transcribedVoiceText,
+            attachments=attachment_responses_data,
+            reportUrl=None  # Will be set by API endpoint
+        )
+    
+    @staticmethod
+    def _new_report(report_data: ReportCreate, user_id: Optional[str]) -> Report:
+        """Build a new Submitted Report record from request data"""
+        return Report(
+            reportId=f"R-{uuid.uuid4().hex[:8].upper()}",
+            title=report_data.title,
+            descriptionText=report_data.descriptionText,
+            locationRaw=report_data.location,
+            categoryId=report_data.categoryId.value if report_data.categoryId else "other",
+            userId=user_id,
+            transcribedVoiceText=report_data.transcribedVoiceText,
+            status="Submitted",
+            aiConfidence=None,
+            createdAt=utcnow(),
+            updatedAt=utcnow()
+        )
+    
+    @staticmethod
+    def _classify_mime(mime: str) -> FileType:
+        """Determine attachment file type from MIME type"""
+        if mime.startswith("image/"):
+            return FileType.IMAGE
+        elif mime.startswith("video/"):
+            return FileType.VIDEO
+        elif mime.startswith("audio/"):
+            return FileType.AUDIO
+        return FileType.DOCUMENT
+    
+    @staticmethod
+    def _thumbnail_url(blob_service, attachment: Attachment) -> Optional[str]:
+        """Temporary SAS URL of the attachment's thumbnail, if one was generated"""
+        if not attachment.thumbnailUri:
+            return None
+        return blob_service.generate_download_url(attachment.thumbnailUri)
+    
+    @staticmethod
+    async def _upload_files_concurrently(
+        blob_service: AsyncStorageBackend,
+        files: List[UploadFile]
+    ) -> list:
+        """
+        Upload all files at once, at most BLOB_UPLOAD_CONCURRENCY in flight
+        
+        Returns one entry per file, in order: the upload_content_addressed
+        result dict, None if the upload failed, or the exception that was
+        raised. Every upload is awaited before returning so no blob is left
+        untracked.
+        """
+        semaphore = asyncio.Semaphore(max(1, settings.BLOB_UPLOAD_CONCURRENCY))
+        
+        async def upload_one(file: UploadFile) -> Optional[dict]:
+            async with semaphore:
+                await file.seek(0)
+                return await blob_service.upload_content_addressed(
+                    stream=file,
+                    filename=file.filename or "unnamed",
+                    content_type=file.content_type or "application/octet-stream"
+                )
+        
+        return await asyncio.gather(
+            *(upload_one(file) for file in files),
+            return_exceptions=True
+        )
+    
+    @staticmethod
+    async def _rollback_uploaded_blobs(
+        db: AsyncDB,
+        blob_service: AsyncStorageBackend,
+        uploaded_blobs: dict
+    ) -> None:
+        """
+        Queue blobs created by a failed report submission for purging
+        
+        Must run after db.rollback(). A blob is kept if another report has
+        meanwhile committed a reference to the same content. If the purge
+        queue cannot be written (e.g., the database is down), the blobs are
+        deleted directly as a best effort.
+        """
+        if not uploaded_blobs:
+            return
+        
+        def enqueue_orphans(session: Session) -> None:
+            orphaned = [
+                blob_url for content_hash, blob_url in uploaded_blobs.items()
+                if session.get(BlobReference, content_hash) is None
+            ]
+            PurgeService.enqueue(session, orphaned)
+            session.commit()
+        
+        try:
+            await db.run_sync(enqueue_orphans)
+        except Exception:
+            await db.rollback()
+            await asyncio.gather(
+                *(blob_service.delete_file(blob_url) for blob_url in uploaded_blobs.values())
+            )
+    
+    @staticmethod
+    async def _restore_purged_blobs(
+        blob_service: AsyncStorageBackend,
+        files: List[UploadFile],
+        upload_results: list,
+        new_references: List[bool],
+        uploaded_blobs: dict
+    ) -> None:
+        """
+        Upload again any deduplicated blob that was purged before it was referenced
+        
+        An upload that found its blob already stored skipped writing it, but
+        a blob without references may be queued for purging. If this request
+        started the reference, the purge may have deleted the blob while the
+        reference waited on its lock. The new (uncommitted) reference row now
+        keeps any later purge away, so one existence check settles it.
+        
+        Raises:
+            RuntimeError: If a purged blob cannot be uploaded again
+        """
+        for file, upload_result, is_new in zip(files, upload_results, new_references):
+            if not is_new or upload_result["created"] or await blob_service.exists(upload_result["sha256"]):
+                continue
+            
+            await file.seek(0)
+            restored = await blob_service.upload_content_addressed(
+                stream=file,
+                filename=file.filename or "unnamed",
+                content_type=file.content_type or "application/octet-stream"
+            )
+            if not restored:
+                raise RuntimeError(f"File '{file.filename}' could not be stored again after a purge")
+            if restored["created"]:
+                uploaded_blobs[restored["sha256"]] = restored["url"]
+    
+    @staticmethod
+    def _acquire_blob_reference(db: Session, content_hash: str, blob_url: str) -> bool:
+        """
+        Increment the reference count of a content-addressed blob
+        
+        An in-place UPDATE, then an INSERT if no row was counted. Two
+        requests storing the same new content can both miss the row; the
+        second INSERT then fails on the primary key (after waiting for the
+        first to commit), rolls back to its savepoint and counts instead.
+        
+        Returns:
+            True if this started the blob's first reference (the row was created)
+        """
+        def increment() -> int:
+            # "evaluate" keeps a row already loaded in this session in step
+            return db.query(BlobReference).filter(
+                BlobReference.contentHash == content_hash
+            ).update(
+                {BlobReference.refCount: BlobReference.refCount + 1},
+                synchronize_session="evaluate"
+            )
+        
+        if increment():
+            return False
+        
+        try:
+            with db.begin_nested():
+                db.add(BlobReference(contentHash=content_hash, blobStorageUri=blob_url, refCount=1))
+            return True
+        except IntegrityError:
+            if not increment():
+                raise
+            return False
+    
+    @staticmethod
+    def _release_blob_reference(db: Session, attachment: Attachment) -> List[str]:
+        """
+        Decrement the reference count of an attachment's blob
+        
+        Returns:
+            Blob URLs (original and derivatives) to delete once the transaction
+            commits; empty while other attachments still reference the blob
+        """
+        owned_blobs = [attachment.blobStorageUri]
+        if attachment.thumbnailUri:
+            owned_blobs.append(attachment.thumbnailUri)
+        
+        if not attachment.contentHash:
+            # Pre-deduplication (or direct upload) blob, owned by this attachment alone
+            return owned_blobs
+        
+        reference = db.query(BlobReference).filter(
+            BlobReference.contentHash == attachment.contentHash
+        ).with_for_update().first()
+        
+        if not reference:
+            return owned_blobs
+        
+        reference.refCount -= 1
+        if reference.refCount > 0:
+            return []
+        
+        db.delete(reference)
+        return owned_blobs
+    
+    @staticmethod
+    def _encode_cursor(report: Report) -> str:
+        """Opaque cursor for the position after `report` in (createdAt, reportId) DESC order"""
+        payload = json.dumps([report.createdAt.isoformat(), report.reportId], separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+    
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[datetime, str]:
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            created_at, report_id = json.loads(base64.urlsafe_b64decode(padded))
+            return datetime.fromisoformat(created_at), str(report_id)
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    
+    @staticmethod
+    def _paginate(
+        query: Query,
+        limit: int,
+        skip: int = 0,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Report], Optional[str]]:
+        """
+        Fetch one page in (createdAt, reportId) DESC order
+        
+        With a cursor the query seeks straight to the last row seen (keyset
+        pagination), so every page costs the same index seek however deep it
+        is. reportId breaks ties between reports created in the same instant.
+        One extra row is read to tell whether another page exists.
+        
+        Returns:
+            (reports, nextCursor or None on the last page)
+        """
+        if cursor:
+            created_at, report_id = ReportService._decode_cursor(cursor)
+            query = query.filter(or_(
+                Report.createdAt < created_at,
+                and_(Report.createdAt == created_at, Report.reportId < report_id)
+            ))
+        
+        query = query.order_by(Report.createdAt.desc(), Report.reportId.desc())
+        if skip and not cursor:
+            query = query.offset(skip)
+        
+        reports = query.limit(limit + 1).all()
+        if len(reports) <= limit:
+            return reports, None
+        
+        reports = reports[:limit]
+        return reports, ReportService._encode_cursor(reports[-1])
+    
+    @staticmethod
+    def _summary_query(db: Session) -> Query:
+        """
+        Listing query for view=summary
+        
+        Selects only columns carried by the createdAt/status/userId listing
+        indexes, so pages are served without key lookups into the clustered
+        index (and without reading the NVARCHAR(MAX) text columns). The
+        attachment count is a correlated seek on IX_Attachment_ReportId.
+        """
+        attachment_count = db.query(func.count(Attachment.attachmentId)).filter(
+            Attachment.reportId == Report.reportId
+        ).correlate(Report).scalar_subquery()
+        
+        return db.query(
+            Report.reportId,
+            Report.title,
+            Report.status,
+            Report.categoryId,
+            Report.createdAt,
+            attachment_count.label("attachmentCount")
+        )
+    
+    @staticmethod
+    def _page_metadata(
+        limit: int,
+        skip: int,
+        cursor: Optional[str],
+        next_cursor: Optional[str],
+        total: Optional[int],
+        approximate: bool = False
+    ) -> dict:
+        """Pagination fields of ReportListResponse"""
+        return {
+            "nextCursor": next_cursor,
+            "total": total,
+            "totalIsApproximate": approximate,
+            # Page numbers only exist for offset pages
+            "page": None if cursor else (skip // limit) + 1,
+            "pageSize": limit,
+            "totalPages": (total + limit - 1) // limit if total is not None else None
+        }
     
     @staticmethod
     def get_report(db: Session, report_id: Optional[str] = None) -> Optional[ReportResponse]:
@@ -203,12 +697,11 @@ class ReportService:
             return None
         
         # Generate download URLs for all attachments
-        blob_service = BlobStorageService()
+        blob_service = get_blob_service()
         attachment_responses = []
         
         for att in report.attachments:
             download_url = blob_service.generate_download_url(att.blobStorageUri)
-            print(download_url)
             attachment_responses.append({
                 "attachmentId": att.attachmentId,
                 "reportId": att.reportId,
@@ -217,6 +710,7 @@ class ReportService:
                 "mimeType": att.mimeType,
                 "fileType": att.fileType,
                 "fileSizeBytes": att.fileSizeBytes,
+                "thumbnailUrl": ReportService._thumbnail_url(blob_service, att),
                 "createdAt": utcnow()  # Manual timestamp (until DB migration)
             })
         
@@ -227,6 +721,12 @@ class ReportService:
             categoryId=report.categoryId,
             status=report.status,
             location=report.locationRaw,
+            latitude=report.latitude,
+            longitude=report.longitude,
+            clusterId=report.clusterId,
+            clusterSize=report.cluster.reportCount if report.cluster else None,
+            assignedTo=report.assignedTo,
+            assignedAt=report.assignedAt,
             aiConfidence=report.aiConfidence,
             createdAt=report.createdAt,
             updatedAt=report.updatedAt,
@@ -235,172 +735,6 @@ class ReportService:
             attachments=attachment_responses
         )
     @staticmethod
-    def list_reports(
-        db: Session, 
-        skip: int = 0, 
-        limit: int = 10,
-        status: Optional[str] = None,
-        category: Optional[str] = None
-    ) -> ReportListResponse:
-        """
-        List reports with pagination and filtering
-        
-        Args:
-            db: Database session
-            skip: Number of records to skip (for pagination)
-            limit: Maximum number of records to return
-            status: Optional status filter
-            category: Optional category filter
-        
-        Returns:
-            ReportListResponse with paginated reports and metadata
-        """
-        
-        # Build query with eager loading
-        query = db.query(Report).options(selectinload(Report.attachments))
-        
-        # Apply filters
-        if status:
-            query = query.filter(Report.status == status)
-        if category:
-            query = query.filter(Report.categoryId == category)
-        
-        # Get total count before pagination
-        total = query.count()
-        
-        # Apply pagination and ordering
-        reports = query.order_by(Report.createdAt.desc()).offset(skip).limit(limit).all()
-        
-        # Generate download URLs for all attachments
-        blob_service = BlobStorageService()
-        report_responses = []
-        
-        for r in reports:
-            attachment_responses = []
-            for att in r.attachments:
-                download_url = blob_service.generate_download_url(att.blobStorageUri)
-                attachment_responses.append({
-                    "attachmentId": att.attachmentId,
-                    "reportId": att.reportId,
-                    "blobStorageUri": att.blobStorageUri,
-                    "downloadUrl": download_url,
-                    "mimeType": att.mimeType,
-                    "fileType": att.fileType,
-                    "fileSizeBytes": att.fileSizeBytes,
-                    "createdAt": utcnow()  # Manual timestamp
-                })
-            
-            report_responses.append(
-                ReportResponse(
-                    reportId=r.reportId,
-                    title=r.title,
-                    descriptionText=r.descriptionText,
-                    categoryId=r.categoryId,
-                    status=r.status,
-                    location=r.locationRaw,
-                    aiConfidence=r.aiConfidence,
-                    createdAt=r.createdAt,
-                    updatedAt=r.updatedAt,
-                    userId=r.userId,
-                    transcribedVoiceText=r.transcribedVoiceText,
-                    attachments=attachment_responses
-                )
-            )
-        
-        # Calculate pagination metadata
-        return ReportListResponse(
-            reports=report_responses,
-            total=total,
-            page=(skip // limit) + 1 if limit > 0 else 1,
-            pageSize=limit,
-            totalPages=(total + limit - 1) // limit if limit > 0 else 1
-        ) 
-    @staticmethod
-    def get_report_by_user(
-        db: Session, 
-        user_id: str,
-        skip: int = 0, 
-        limit: int = 10,
-        status: Optional[str] = None,
-        category: Optional[str] = None
-    ) -> ReportListResponse:
-        """
-        List reports with pagination and filtering
-        
-        Args:
-            db: Database session
-            skip: Number of records to skip (for pagination)
-            limit: Maximum number of records to return
-            status: Optional status filter
-            category: Optional category filter
-        
-        Returns:
-            ReportListResponse with paginated reports and metadata
-        """
-        
-        # Build query with eager loading
-        query = db.query(Report).options(selectinload(Report.attachments))
-        
-        # Apply filters
-        if status:
-            query = query.filter(Report.status == status)
-        if category:
-            query = query.filter(Report.categoryId == category)
-        if user_id:
-            query = query.filter(Report.userId == user_id)
-        
-        # Get total count before pagination
-        total = query.count()
-        
-        # Apply pagination and ordering
-        reports = query.order_by(Report.createdAt.desc()).offset(skip).limit(limit).all()
-        
-        # Generate download URLs for all attachments
-        blob_service = BlobStorageService()
-        report_responses = []
-        
-        for r in reports:
-            attachment_responses = []
-            for att in r.attachments:
-                download_url = blob_service.generate_download_url(att.blobStorageUri)
-                attachment_responses.append({
-                    "attachmentId": att.attachmentId,
-                    "reportId": att.reportId,
-                    "blobStorageUri": att.blobStorageUri,
-                    "downloadUrl": download_url,
-                    "mimeType": att.mimeType,
-                    "fileType": att.fileType,
-                    "fileSizeBytes": att.fileSizeBytes,
-                    "createdAt": utcnow()  # Manual timestamp
-                })
-            
-            report_responses.append(
-                ReportResponse(
-                    reportId=r.reportId,
-                    title=r.title,
-                    descriptionText=r.descriptionText,
-                    categoryId=r.categoryId,
-                    status=r.status,
-                    location=r.locationRaw,
-                    aiConfidence=r.aiConfidence,
-                    createdAt=r.createdAt,
-                    updatedAt=r.updatedAt,
-                    userId=r.userId,
-                    transcribedVoiceText=r.transcribedVoiceText,
-                    attachments=attachment_responses
-                )
-            )
-        
-        # Calculate pagination metadata
-        return ReportListResponse(
-            reports=report_responses,
-            total=total,
-            page=(skip // limit) + 1 if limit > 0 else 1,
-            pageSize=limit,
-            totalPages=(total + limit - 1) // limit if limit > 0 else 1
-        )
-    
-    @staticmethod
     def update_report_status(
         db: Session,
         report_id: str,
@@ -430,12 +764,19 @@ class ReportService:
             return None
         
         # Update status and timestamp
+        before = ReportCountService.snapshot(report)
         report.status = status_update.status.value
         report.updatedAt = utcnow()
+        if report.status == "Submitted":
+            # Back in the work queue (see ReportQueueService.claim)
+            report.assignedTo = None
+            report.assignedAt = None
         
         try:
             db.commit()
             db.refresh(report)
+            ReportCountService.record_change(before, ReportCountService.snapshot(report))
+            get_report_cache().invalidate(report_id)
             
             # Return updated report with attachments
             return ReportService.get_report(db, report_id)
@@ -452,9 +793,11 @@ class ReportService:
         Delete a report and all its attachments
         
         This will:
-        1. Delete all files from Azure Blob Storage
-        2. Delete attachment records from database
-        3. Delete report record from database
+        1. Release each attachment's blob reference
+        2. Queue blobs that are no longer referenced in the BlobPurge outbox
+        3. Delete attachment and report records from database
+        
+        Blobs are removed from Azure Blob Storage later by the purge worker.
         
         Args:
             db: Database session
@@ -476,14 +819,24 @@ class ReportService:
             return False
         
         try:
-            # Delete all files from blob storage
-            blob_service = BlobStorageService()
+            # Release blob references; shared blobs are kept while still referenced
+            blobs_to_delete = []
             for attachment in report.attachments:
-                blob_service.delete_file(attachment.blobStorageUri)
+                blobs_to_delete.extend(ReportService._release_blob_reference(db, attachment))
+            
+            # Queue unreferenced blobs for the purge worker, atomically with the delete
+            PurgeService.enqueue(db, blobs_to_delete)
             
             # Delete report (cascade will delete attachments from DB)
+            before = ReportCountService.snapshot(report)
+            cluster_id = report.clusterId
+            ReportClusterService.remove(db, report)
             db.delete(report)
             db.commit()
+            ReportCountService.record_change(before=before)
+            if cluster_id:
+                report_clusters.record_removal(cluster_id)
+            get_report_cache().invalidate(report_id)
             
             return True
         except Exception as e:
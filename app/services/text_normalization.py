@@ -0,0 +1,96 @@
+"""
+Arabic/English text normalization for report search.
+
+The same pipeline runs when a report is indexed and when a query is parsed,
+so spelling variants that citizens use interchangeably meet on one term:
+  - Unicode NFKC and case folding
+  - Arabic diacritics (tashkeel) and tatweel removed
+  - Alef forms (أ إ آ ٱ) -> ا, ى -> ي, ة -> ه, ؤ -> و, ئ -> ي
+  - Arabic-Indic and Persian digits -> ASCII digits
+  - Light stemming: Arabic definite article/conjunction prefixes and
+    English plural/verb suffixes
+"""
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+MAX_TERM_LENGTH = 64  # ReportSearchTerm.term column size
+
+_ARABIC_DIACRITICS = re.compile(r"[\u0610-\u061A\u064B-\u065F\u0670\u06D6-\u06ED\u0640]")
+_TOKEN = re.compile(r"\w+")
+
+_CHARACTER_MAP = str.maketrans({
+    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
+    "ى": "ي", "ئ": "ي", "ؤ": "و", "ة": "ه",
+    **{chr(0x0660 + digit): str(digit) for digit in range(10)},  # Arabic-Indic
+    **{chr(0x06F0 + digit): str(digit) for digit in range(10)},  # Persian
+})
+
+# Longest first, so "وال" is stripped before "و" would be considered
+_ARABIC_PREFIXES = ("وال", "بال", "كال", "فال", "لل", "ال")
+
+STOPWORDS = frozenset({
+    # English
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have",
+    "in", "is", "it", "its", "of", "on", "or", "that", "the", "there", "this",
+    "to", "was", "were", "with",
+    # Arabic (already normalized)
+    "في", "من", "علي", "الي", "عن", "مع", "هذا", "هذه", "ذلك", "التي", "الذي",
+    "هو", "هي", "و", "او", "ثم", "كان", "قد", "لا", "ما", "يوجد",
+})
+
+
+def normalize(text: str) -> str:
+    """Fold case, orthographic variants and digits; strip diacritics"""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = _ARABIC_DIACRITICS.sub("", text)
+    return text.translate(_CHARACTER_MAP)
+
+
+def _stem(token: str) -> str:
+    if token.isascii():
+        if token.endswith("ies") and len(token) > 4:
+            return token[:-3] + "y"
+        if token.endswith("ing") and len(token) > 5:
+            return token[:-3]
+        if token.endswith("ed") and len(token) > 4:
+            return token[:-2]
+        if token.endswith("es") and token[-3:-2] in ("s", "x", "z", "h") and len(token) > 4:
+            return token[:-2]
+        if token.endswith("s") and not token.endswith("ss") and len(token) > 3:
+            return token[:-1]
+        return token
+
+    for prefix in _ARABIC_PREFIXES:
+        # Keep at least a three-letter root
+        if token.startswith(prefix) and len(token) - len(prefix) >= 3:
+            return token[len(prefix):]
+    return token
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Normalized, stemmed search terms of a text (stopwords removed, order kept)"""
+    if not text:
+        return []
+
+    terms = []
+    for token in _TOKEN.findall(normalize(text)):
+        if token in STOPWORDS or (len(token) < 2 and not token.isdigit()):
+            continue
+        terms.append(_stem(token)[:MAX_TERM_LENGTH])
+    return terms
+
+
+def term_weights(fields: Iterable[Tuple[Optional[str], int]]) -> Dict[str, int]:
+    """
+    Weighted term frequencies over several fields
+
+    Args:
+        fields: (text, weight of each occurrence) pairs, e.g. title 3, description 1
+    """
+    weights: Counter = Counter()
+    for text, weight in fields:
+        for term in tokenize(text):
+            weights[term] += weight
+    return dict(weights)
@@ -0,0 +1,242 @@
+import asyncio
+import io
+import logging
+import subprocess
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import open_async_db_ops
+from app.models.attachment import Attachment
+from app.models.report import Report
+from app.services.blob_service import get_async_blob_service
+from app.services.report_cache import get_report_cache
+
+logger = logging.getLogger(__name__)
+
+# Derivatives are stored next to the original: "<blob name>.thumb.webp"
+THUMBNAIL_SUFFIX = ".thumb.webp"
+
+_thumbnail_pool: Optional[ProcessPoolExecutor] = None
+
+
+# ==========================================
+# Rendering (runs inside the process pool)
+# ==========================================
+def render_thumbnail(source_url: str, file_type: str, max_size: int, quality: int) -> Optional[bytes]:
+    """
+    Render a WebP thumbnail for an image, or a poster frame for a video
+
+    Runs in a worker process so decoding and resizing never compete with
+    request handling. Videos are read by ffmpeg straight from the SAS URL,
+    which fetches only the byte ranges it needs for the frame.
+
+    Args:
+        source_url: Readable (SAS) URL of the original blob
+        file_type: 'image' or 'video'
+        max_size: Longest edge of the thumbnail in pixels
+        quality: WebP quality (0-100)
+
+    Returns:
+        WebP bytes, or None if the file could not be rendered
+    """
+    try:
+        if file_type == "image":
+            from PIL import Image, ImageOps
+
+            with urllib.request.urlopen(source_url, timeout=30) as response:
+                data = response.read()
+
+            with Image.open(io.BytesIO(data)) as image:
+                image.draft("RGB", (max_size, max_size))  # Cheap JPEG downscale while decoding
+                image = ImageOps.exif_transpose(image)
+                image.thumbnail((max_size, max_size))
+                if image.mode not in ("RGB", "RGBA"):
+                    image = image.convert("RGB")
+
+                output = io.BytesIO()
+                image.save(output, format="WEBP", quality=quality)
+                return output.getvalue()
+
+        if file_type == "video":
+            # Try one second in first (skips black intro frames), then the first frame
+            for seek in ("1", "0"):
+                result = subprocess.run(
+                    [
+                        "ffmpeg", "-v", "error",
+                        "-ss", seek, "-i", source_url,
+                        "-frames:v", "1",
+                        "-vf", f"scale={max_size}:{max_size}:force_original_aspect_ratio=decrease",
+                        "-c:v", "libwebp", "-quality", str(quality),
+                        "-f", "image2pipe", "-"
+                    ],
+                    capture_output=True,
+                    timeout=60
+                )
+                if result.returncode == 0 and result.stdout:
+                    return result.stdout
+
+        return None
+
+    except ImportError:
+        logger.warning("Pillow is not installed; skipping image thumbnails")
+        return None
+    except FileNotFoundError:
+        logger.warning("ffmpeg is not installed; skipping video poster frames")
+        return None
+    except Exception as e:
+        logger.error(f"Failed to render {file_type} thumbnail: {e}")
+        return None
+
+
+# ==========================================
+# Process Pool Lifecycle
+# ==========================================
+def init_thumbnail_pool() -> None:
+    """Start the per-worker thumbnail process pool (called from the lifespan)"""
+    global _thumbnail_pool
+
+    if _thumbnail_pool is None:
+        _thumbnail_pool = ProcessPoolExecutor(max_workers=max(1, settings.THUMBNAIL_WORKERS))
+        logger.info(f"✓ Thumbnail pool started ({settings.THUMBNAIL_WORKERS} processes)")
+
+
+def close_thumbnail_pool() -> None:
+    """Stop the thumbnail process pool on shutdown"""
+    global _thumbnail_pool
+
+    if _thumbnail_pool is not None:
+        _thumbnail_pool.shutdown(wait=False, cancel_futures=True)
+        _thumbnail_pool = None
+
+
+class ThumbnailService:
+    """Background generation of attachment previews"""
+
+    @staticmethod
+    async def generate_thumbnails(attachment_ids: List[str]) -> None:
+        """
+        Generate and store thumbnails for newly uploaded attachments
+
+        Scheduled as a background task after a report or attachment is
+        created. Failures are logged and leave thumbnailUri empty; clients
+        then fall back to downloadUrl. Database work runs through
+        db.run_sync, so it never blocks the event loop.
+
+        Deduplicated blobs share one thumbnail: attachments with the same
+        content hash are rendered once, whether the sibling is already
+        stored or arrived in the same batch.
+
+        Args:
+            attachment_ids: Attachments to process (non image/video ones are skipped)
+        """
+        if not attachment_ids:
+            return
+
+        init_thumbnail_pool()
+        db = open_async_db_ops()
+
+        try:
+            attachments, existing = await db.run_sync(ThumbnailService._load_pending, attachment_ids)
+
+            # One render per blob: deduplicated attachments share a hash (and a blob)
+            groups: Dict[str, List[Row]] = {}
+            for attachment in attachments:
+                groups.setdefault(attachment.contentHash or attachment.attachmentId, []).append(attachment)
+
+            async def process(key: str, group: List[Row]) -> Tuple[List[Row], Optional[str]]:
+                return group, existing.get(key) or await ThumbnailService._render_and_upload(group[0])
+
+            results = await asyncio.gather(*(process(key, group) for key, group in groups.items()))
+            thumbnails = {
+                attachment.attachmentId: (attachment.reportId, thumbnail_url)
+                for group, thumbnail_url in results if thumbnail_url
+                for attachment in group
+            }
+            if not thumbnails:
+                return
+
+            report_ids = await db.run_sync(ThumbnailService._save_thumbnails, thumbnails)
+            await db.commit()
+            get_report_cache().invalidate(*report_ids)
+
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Thumbnail generation failed for {attachment_ids}: {e}")
+        finally:
+            await db.close()
+
+    @staticmethod
+    def _load_pending(db: Session, attachment_ids: List[str]) -> Tuple[List[Row], Dict[str, str]]:
+        """
+        Attachments still needing a thumbnail, and stored thumbnails for their content hashes
+
+        Returns:
+            (attachmentId, reportId, contentHash, blobStorageUri, fileType) rows,
+            and a contentHash -> thumbnailUri map
+        """
+        attachments = db.query(
+            Attachment.attachmentId,
+            Attachment.reportId,
+            Attachment.contentHash,
+            Attachment.blobStorageUri,
+            Attachment.fileType
+        ).filter(
+            Attachment.attachmentId.in_(attachment_ids),
+            Attachment.fileType.in_(["image", "video"]),
+            Attachment.thumbnailUri.is_(None)
+        ).all()
+
+        content_hashes = {attachment.contentHash for attachment in attachments if attachment.contentHash}
+        existing: Dict[str, str] = {}
+        if content_hashes:
+            existing = dict(
+                db.query(Attachment.contentHash, Attachment.thumbnailUri).filter(
+                    Attachment.contentHash.in_(content_hashes),
+                    Attachment.thumbnailUri.isnot(None)
+                ).all()
+            )
+        return attachments, existing
+
+    @staticmethod
+    async def _render_and_upload(attachment: Row) -> Optional[str]:
+        """Render a thumbnail in the process pool and store it next to the original"""
+        blob_service = get_async_blob_service()
+        source_url = blob_service.generate_download_url(attachment.blobStorageUri)
+        if not source_url:
+            return None
+
+        data = await asyncio.get_running_loop().run_in_executor(
+            _thumbnail_pool,
+            render_thumbnail,
+            source_url,
+            attachment.fileType,
+            settings.THUMBNAIL_MAX_SIZE,
+            settings.THUMBNAIL_QUALITY
+        )
+        if not data:
+            return None
+
+        blob_name = attachment.blobStorageUri.split('/')[-1].split('?')[0]
+        return await blob_service.upload_bytes(f"{blob_name}{THUMBNAIL_SUFFIX}", data, "image/webp")
+
+    @staticmethod
+    def _save_thumbnails(db: Session, thumbnails: Dict[str, Tuple[str, str]]) -> Set[str]:
+        """Store thumbnail URLs and bump the reports' version so cached copies pick them up"""
+        for attachment_id, (_, thumbnail_url) in thumbnails.items():
+            db.query(Attachment).filter(Attachment.attachmentId == attachment_id).update(
+                {Attachment.thumbnailUri: thumbnail_url},
+                synchronize_session=False
+            )
+
+        report_ids = {report_id for report_id, _ in thumbnails.values()}
+        db.query(Report).filter(Report.reportId.in_(report_ids)).update(
+            {Report.updatedAt: datetime.now(timezone.utc)},
+            synchronize_session=False
+        )
+        return report_ids
@@ -0,0 +1,269 @@
+import uuid
+from datetime import timedelta
+from typing import AsyncIterator, Optional, Tuple
+
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.database import AsyncDB
+from app.services.blob_service import get_async_blob_service
+from app.services.report_service import ReportService, utcnow, utcnow_naive
+from app.services.report_cache import get_report_cache
+from app.models.report import Report
+from app.models.attachment import Attachment
+from app.models.upload_session import UploadSession
+from app.schemas.attachment import ResumableUploadCreate, AttachmentResponse
+
+
+class UploadSessionService:
+    """
+    Resumable (tus-style) attachment uploads.
+
+    1. create_session reserves a blob and records the expected length
+    2. append_chunk stages PATCH bodies as blob blocks at the current offset
+    3. get_session reports the offset so clients resend only missing bytes
+    4. commit_session assembles the blocks and attaches the blob to a report
+    """
+
+    @staticmethod
+    def create_session(db: Session, upload_in: ResumableUploadCreate) -> UploadSession:
+        """Open a new upload session"""
+        if upload_in.uploadLength > settings.RESUMABLE_UPLOAD_MAX_SIZE_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Upload exceeds {settings.RESUMABLE_UPLOAD_MAX_SIZE_BYTES} bytes"
+            )
+
+        file_extension = upload_in.filename.split('.')[-1] if '.' in upload_in.filename else 'bin'
+        upload_id = str(uuid.uuid4())
+
+        upload_session = UploadSession(
+            uploadId=upload_id,
+            blobName=f"{upload_id}.{file_extension}",
+            filename=upload_in.filename,
+            mimeType=upload_in.mimeType,
+            uploadLength=upload_in.uploadLength,
+            uploadOffset=0,
+            status="active",
+            expiresAt=utcnow_naive() + timedelta(hours=settings.RESUMABLE_UPLOAD_EXPIRY_HOURS)
+        )
+        db.add(upload_session)
+        db.commit()
+        db.refresh(upload_session)
+
+        return upload_session
+
+    @staticmethod
+    def get_session(db: Session, upload_id: str) -> UploadSession:
+        """Get an upload session, rejecting unknown or expired ones"""
+        upload_session = db.query(UploadSession).filter(UploadSession.uploadId == upload_id).first()
+
+        if not upload_session:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Upload {upload_id} not found"
+            )
+
+        if upload_session.status == "active" and upload_session.expiresAt < utcnow_naive():
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail=f"Upload {upload_id} has expired"
+            )
+
+        return upload_session
+
+    @staticmethod
+    async def append_chunk(
+        db: AsyncDB,
+        upload_id: str,
+        offset: int,
+        body: AsyncIterator[bytes]
+    ) -> int:
+        """
+        Stage a PATCH body as blob blocks starting at `offset`
+
+        The body is streamed in BLOB_UPLOAD_CHUNK_SIZE blocks and the session
+        offset is saved after each one, so bytes already staged survive a
+        dropped connection.
+
+        Args:
+            db: Async database session
+            upload_id: Upload session identifier
+            offset: Upload-Offset sent by the client
+            body: Request body stream
+
+        Returns:
+            New upload offset
+
+        Raises:
+            HTTPException: If the offset does not match, or the body overruns uploadLength
+        """
+        upload_session = await db.run_sync(UploadSessionService.get_session, upload_id)
+
+        if upload_session.status != "active":
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Upload {upload_id} is already completed"
+            )
+
+        if offset != upload_session.uploadOffset:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Upload-Offset {offset} does not match current offset {upload_session.uploadOffset}"
+            )
+
+        blob_service = get_async_blob_service()
+        blob_name = upload_session.blobName
+        upload_length = upload_session.uploadLength
+        chunk_size = settings.BLOB_UPLOAD_CHUNK_SIZE
+        current_offset = offset
+
+        def save_offset(session: Session, start: int, end: int) -> int:
+            # Conditional update: a concurrent PATCH may have moved the offset
+            updated = session.query(UploadSession).filter(
+                UploadSession.uploadId == upload_id,
+                UploadSession.uploadOffset == start
+            ).update(
+                {UploadSession.uploadOffset: end},
+                synchronize_session=False
+            )
+            session.commit()
+            return updated
+
+        async def stage(data: bytes) -> None:
+            nonlocal current_offset
+
+            if not await blob_service.stage_block_at(blob_name, current_offset, data):
+                raise HTTPException(
+                    status_code=status.HTTP_502_BAD_GATEWAY,
+                    detail="Failed to store chunk in blob storage"
+                )
+
+            if not await db.run_sync(save_offset, current_offset, current_offset + len(data)):
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Upload offset changed by a concurrent request"
+                )
+
+            current_offset += len(data)
+
+        buffer = bytearray()
+        async for piece in body:
+            if current_offset + len(buffer) + len(piece) > upload_length:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"Chunk exceeds declared upload length of {upload_length} bytes"
+                )
+
+            buffer.extend(piece)
+            while len(buffer) >= chunk_size:
+                await stage(bytes(buffer[:chunk_size]))
+                del buffer[:chunk_size]
+
+        if buffer:
+            await stage(bytes(buffer))
+
+        return current_offset
+
+    @staticmethod
+    async def commit_session(db: AsyncDB, upload_id: str, report_id: str) -> AttachmentResponse:
+        """
+        Assemble the staged blocks and attach the finished blob to a report
+
+        Safe to retry: committing an already completed session returns its attachment.
+
+        Raises:
+            HTTPException: If the upload is incomplete or the report does not exist
+        """
+        blob_service = get_async_blob_service()
+
+        def validate(session: Session) -> Tuple[UploadSession, Optional[AttachmentResponse]]:
+            upload_session = UploadSessionService.get_session(session, upload_id)
+
+            if upload_session.status == "completed":
+                attachment = session.query(Attachment).filter(
+                    Attachment.attachmentId == upload_session.attachmentId
+                ).first()
+                if not attachment or attachment.reportId != report_id:
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail=f"Upload {upload_id} is already attached to another report"
+                    )
+                return upload_session, UploadSessionService._to_response(attachment, blob_service)
+
+            if upload_session.uploadOffset != upload_session.uploadLength:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Upload is incomplete ({upload_session.uploadOffset}/{upload_session.uploadLength} bytes)"
+                )
+
+            if not session.query(Report.reportId).filter(Report.reportId == report_id).first():
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Report with ID {report_id} not found"
+                )
+            return upload_session, None
+
+        upload_session, existing = await db.run_sync(validate)
+        if existing:
+            return existing
+
+        blob_url = await blob_service.commit_staged_blocks(
+            upload_session.blobName,
+            expected_size=upload_session.uploadLength,
+            filename=upload_session.filename,
+            content_type=upload_session.mimeType
+        )
+        if not blob_url:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Staged chunks are missing or inconsistent; restart the upload"
+            )
+
+        def persist(session: Session) -> AttachmentResponse:
+            attachment = Attachment(
+                attachmentId=str(uuid.uuid4()),
+                reportId=report_id,
+                blobStorageUri=blob_url,
+                mimeType=upload_session.mimeType,
+                fileType=ReportService._classify_mime(upload_session.mimeType).value,
+                fileSizeBytes=upload_session.uploadLength
+            )
+            session.add(attachment)
+
+            upload_session.status = "completed"
+            upload_session.attachmentId = attachment.attachmentId
+            # Bumps the version that per-process report caches revalidate against
+            session.query(Report).filter(Report.reportId == report_id).update(
+                {Report.updatedAt: utcnow()}, synchronize_session=False
+            )
+
+            try:
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Failed to attach upload: {str(e)}"
+                )
+            return UploadSessionService._to_response(attachment, blob_service)
+
+        response = await db.run_sync(persist)
+        get_report_cache().invalidate(report_id)
+
+        return response
+
+    @staticmethod
+    def _to_response(attachment: Attachment, blob_service) -> AttachmentResponse:
+        return AttachmentResponse(
+            attachmentId=attachment.attachmentId,
+            reportId=attachment.reportId,
+            blobStorageUri=attachment.blobStorageUri,
+            downloadUrl=blob_service.generate_download_url(attachment.blobStorageUri),
+            mimeType=attachment.mimeType,
+            fileType=attachment.fileType,
+            fileSizeBytes=attachment.fileSizeBytes,
+            thumbnailUrl=ReportService._thumbnail_url(blob_service, attachment),
+            createdAt=attachment.createdAt or utcnow()
+        )
@@ -0,0 +1,163 @@
+"""
+Per-page CPU cost of the report listing read paths.
+
+Run:  python -m benchmarks.bench_report_listing [--page-size 50] [--attachments 3]
+
+Compares, on the same in-memory page (no database or network I/O):
+  before: ORM objects -> dicts -> ReportResponse models -> response_model
+          re-validation -> jsonable_encoder -> json.dumps (FastAPI's pipeline)
+  after:  column tuples -> dicts -> orjson (ReportReadService)
+
+SAS signing is replaced by a constant URL so only the serialization work is measured.
+"""
+import argparse
+import json
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+
+from app.models.attachment import Attachment
+from app.models.report import Report
+from app.schemas.report import ReportListResponse, ReportResponse
+from app.services.report_documents import ATTACHMENT_COLUMNS, REPORT_COLUMNS
+from app.services.report_read_service import serialize_report_page
+from app.services.report_service import ReportService
+
+ReportRow = namedtuple("ReportRow", [column.key for column in REPORT_COLUMNS])
+AttachmentRow = namedtuple("AttachmentRow", [column.key for column in ATTACHMENT_COLUMNS])
+
+
+class StaticUrlSigner:
+    """Stands in for the blob service; returns a fixed URL"""
+
+    def generate_download_url(self, blob_url: str, expiry_hours: int = 1) -> str:
+        return f"{blob_url}?sv=2024-01-01&se=2030-01-01T00%3A00%3A00Z&sr=b&sp=r&sig=benchmark"
+
+
+def build_page(page_size: int, attachments_per_report: int):
+    """Return the same page as ORM objects and as column tuples"""
+    created = datetime(2025, 1, 1)
+    description = "Broken street light near the main intersection. " * 8
+    transcript = "The lamp has been out for three nights and the road is dark. " * 4
+
+    reports, report_rows, attachment_rows = [], [], {}
+    for i in range(page_size):
+        values = {
+            "reportId": f"report-{i:06d}",
+            "title": f"Street light outage #{i}",
+            "descriptionText": description,
+            "categoryId": "infrastructure",
+            "status": "Submitted",
+            "locationRaw": "30.0444,31.2357",
+            "latitude": 30.0444,
+            "longitude": 31.2357,
+            "aiConfidence": 0.87,
+            "createdAt": created - timedelta(minutes=i),
+            "updatedAt": created - timedelta(minutes=i),
+            "userId": f"user-{i % 17:04d}",
+            "transcribedVoiceText": transcript,
+            "clusterId": None,
+            "assignedTo": None,
+            "assignedAt": None,
+        }
+        report = Report(**values)
+        report_rows.append(ReportRow(**values, clusterSize=None))
+
+        attachment_rows[values["reportId"]] = []
+        for j in range(attachments_per_report):
+            attachment_values = {
+                "attachmentId": f"att-{i:06d}-{j}",
+                "reportId": values["reportId"],
+                "blobStorageUri": f"https://account.blob.core.windows.net/report-attachments/{i:06d}{j}.jpg",
+                "thumbnailUri": None,
+                "mimeType": "image/jpeg",
+                "fileType": "image",
+                "fileSizeBytes": 245760,
+                "createdAt": values["createdAt"],
+            }
+            report.attachments.append(Attachment(**attachment_values))
+            attachment_rows[values["reportId"]].append(AttachmentRow(**attachment_values))
+
+        reports.append(report)
+
+    return reports, report_rows, attachment_rows
+
+
+def orm_report_responses(reports, signer) -> list:
+    """ReportResponse models built from loaded Report objects (the former listing path)"""
+    return [
+        ReportResponse(
+            reportId=r.reportId,
+            title=r.title,
+            descriptionText=r.descriptionText,
+            categoryId=r.categoryId,
+            status=r.status,
+            location=r.locationRaw,
+            latitude=r.latitude,
+            longitude=r.longitude,
+            clusterId=r.clusterId,
+            aiConfidence=r.aiConfidence,
+            createdAt=r.createdAt,
+            updatedAt=r.updatedAt,
+            userId=r.userId,
+            transcribedVoiceText=r.transcribedVoiceText,
+            attachments=[
+                {
+                    "attachmentId": att.attachmentId,
+                    "reportId": att.reportId,
+                    "blobStorageUri": att.blobStorageUri,
+                    "downloadUrl": signer.generate_download_url(att.blobStorageUri),
+                    "mimeType": att.mimeType,
+                    "fileType": att.fileType,
+                    "fileSizeBytes": att.fileSizeBytes,
+                    "thumbnailUrl": None,
+                    "createdAt": att.createdAt
+                }
+                for att in r.attachments
+            ]
+        )
+        for r in reports
+    ]
+
+
+def before(reports, signer, page_metadata) -> bytes:
+    response = ReportListResponse(
+        reports=orm_report_responses(reports, signer),
+        **page_metadata
+    )
+    # What FastAPI does with a response_model return value
+    validated = ReportListResponse.model_validate(response.model_dump())
+    return json.dumps(jsonable_encoder(validated), ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def after(report_rows, attachment_rows, signer, page_metadata) -> bytes:
+    return serialize_report_page(report_rows, attachment_rows, signer, page_metadata)
+
+
+def measure(label: str, fn, iterations: int) -> float:
+    fn()  # Warm up
+    start = time.process_time()
+    for _ in range(iterations):
+        fn()
+    per_page_ms = (time.process_time() - start) / iterations * 1000
+    print(f"{label:<8} {per_page_ms:8.3f} ms CPU per page")
+    return per_page_ms
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark report listing serialization")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--attachments", type=int, default=3, help="Attachments per report")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    reports, report_rows, attachment_rows = build_page(args.page_size, args.attachments)
+    signer = StaticUrlSigner()
+    page_metadata = ReportService._page_metadata(args.page_size, 0, None, "cursor", None)
+
+    print(f"{args.page_size} reports x {args.attachments} attachments, {args.iterations} iterations")
+    before_ms = measure("before", lambda: before(reports, signer, page_metadata), args.iterations)
+    after_ms = measure("after", lambda: after(report_rows, attachment_rows, signer, page_metadata), args.iterations)
+    print(f"speedup  {before_ms / after_ms:8.2f}x")
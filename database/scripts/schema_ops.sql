@@ -29,6 +29,12 @@ CREATE TABLE [dbo].[Report] (
     [title] NVARCHAR(500) NOT NULL,
     [descriptionText] NVARCHAR(MAX) NOT NULL,
     [locationRaw] NVARCHAR(2048) NULL,
+    [latitude] FLOAT NULL CHECK ([latitude] >= -90 AND [latitude] <= 90),
+    [longitude] FLOAT NULL CHECK ([longitude] >= -180 AND [longitude] <= 180),
+    [geohash] VARCHAR(12) NULL,
+    [clusterId] NVARCHAR(450) NULL,
+    [assignedTo] NVARCHAR(450) NULL, -- Officer userId (no FK: a second cascade path to User is not allowed)
+    [assignedAt] DATETIME2(7) NULL,
     [status] NVARCHAR(50) NOT NULL DEFAULT 'Submitted'
         CHECK ([status] IN ('Submitted', 'Assigned', 'InProgress', 'Resolved', 'Rejected')),
     [categoryId] NVARCHAR(100) NOT NULL,
@@ -49,11 +55,87 @@ CREATE TABLE [dbo].[Attachment] (
     [mimeType] NVARCHAR(100) NOT NULL,
     [fileType] NVARCHAR(50) NOT NULL CHECK ([fileType] IN ('image', 'video', 'audio')),
     [fileSizeBytes] BIGINT NOT NULL CHECK ([fileSizeBytes] > 0),
+    [contentHash] NVARCHAR(64) NULL,
+    [thumbnailUri] NVARCHAR(2048) NULL,
     CONSTRAINT [PK_Attachment] PRIMARY KEY CLUSTERED ([attachmentId]),
     CONSTRAINT [FK_Attachment_Report] FOREIGN KEY ([reportId]) REFERENCES [dbo].[Report]([reportId]) ON DELETE CASCADE
 );
 GO
 
+-- Reference counts for content-addressed (deduplicated) attachment blobs
+CREATE TABLE [dbo].[BlobReference] (
+    [contentHash] NVARCHAR(64) NOT NULL,
+    [blobStorageUri] NVARCHAR(2048) NOT NULL,
+    [refCount] INT NOT NULL DEFAULT 0,
+    [createdAt] DATETIME2(7) NOT NULL DEFAULT GETUTCDATE(),
+    CONSTRAINT [PK_BlobReference] PRIMARY KEY CLUSTERED ([contentHash]),
+    CONSTRAINT [CK_BlobReference_RefCount] CHECK ([refCount] >= 0)
+);
+GO
+
+-- Resumable (tus-style) attachment uploads; chunks are staged blob blocks
+CREATE TABLE [dbo].[UploadSession] (
+    [uploadId] NVARCHAR(450) NOT NULL,
+    [blobName] NVARCHAR(450) NOT NULL,
+    [filename] NVARCHAR(255) NOT NULL,
+    [mimeType] NVARCHAR(100) NOT NULL,
+    [uploadLength] BIGINT NOT NULL CHECK ([uploadLength] > 0),
+    [uploadOffset] BIGINT NOT NULL DEFAULT 0,
+    [status] NVARCHAR(20) NOT NULL DEFAULT 'active' CHECK ([status] IN ('active', 'completed')),
+    [attachmentId] NVARCHAR(450) NULL,
+    [createdAt] DATETIME2(7) NOT NULL DEFAULT GETUTCDATE(),
+    [expiresAt] DATETIME2(7) NOT NULL,
+    CONSTRAINT [PK_UploadSession] PRIMARY KEY CLUSTERED ([uploadId]),
+    CONSTRAINT [CK_UploadSession_Offset] CHECK ([uploadOffset] >= 0 AND [uploadOffset] <= [uploadLength])
+);
+GO
+
+-- Outbox of blobs to delete, drained by the API's background purge worker
+CREATE TABLE [dbo].[BlobPurge] (
+    [purgeId] BIGINT IDENTITY(1,1) NOT NULL,
+    [blobStorageUri] NVARCHAR(2048) NOT NULL,
+    [attempts] INT NOT NULL DEFAULT 0,
+    [nextAttemptAt] DATETIME2(7) NOT NULL DEFAULT GETUTCDATE(),
+    [lastError] NVARCHAR(1000) NULL,
+    [enqueuedAt] DATETIME2(7) NOT NULL DEFAULT GETUTCDATE(),
+    CONSTRAINT [PK_BlobPurge] PRIMARY KEY CLUSTERED ([purgeId])
+);
+GO
+
+-- Inverted index for report search (normalized Arabic/English terms, maintained by the API)
+CREATE TABLE [dbo].[ReportSearchTerm] (
+    [term] NVARCHAR(64) NOT NULL,
+    [reportId] NVARCHAR(450) NOT NULL,
+    [weight] INT NOT NULL,
+    CONSTRAINT [PK_ReportSearchTerm] PRIMARY KEY CLUSTERED ([term], [reportId]),
+    CONSTRAINT [FK_ReportSearchTerm_Report] FOREIGN KEY ([reportId]) REFERENCES [dbo].[Report]([reportId]) ON DELETE CASCADE
+);
+GO
+
+-- Coordinates of known places, for report locations given as text
+CREATE TABLE [dbo].[GeocodeCache] (
+    [addressKey] NVARCHAR(450) NOT NULL,
+    [latitude] FLOAT NOT NULL,
+    [longitude] FLOAT NOT NULL,
+    [createdAt] DATETIME2(7) NOT NULL DEFAULT GETUTCDATE(),
+    CONSTRAINT [PK_GeocodeCache] PRIMARY KEY CLUSTERED ([addressKey])
+);
+GO
+
+-- Incident clusters of near-duplicate reports (same category, place and time)
+CREATE TABLE [dbo].[ReportCluster] (
+    [clusterId] NVARCHAR(450) NOT NULL,
+    [categoryId] NVARCHAR(100) NOT NULL,
+    [geohash] VARCHAR(12) NOT NULL,
+    [latitude] FLOAT NOT NULL,
+    [longitude] FLOAT NOT NULL,
+    [reportCount] INT NOT NULL DEFAULT 1,
+    [firstReportAt] DATETIME2(7) NOT NULL,
+    [lastReportAt] DATETIME2(7) NOT NULL,
+    CONSTRAINT [PK_ReportCluster] PRIMARY KEY CLUSTERED ([clusterId])
+);
+GO
+
 -- Operational indexes for fast writes
 CREATE NONCLUSTERED INDEX [IX_User_Role] ON [dbo].[User] ([role]) INCLUDE ([userId], [isAnonymous]);
 CREATE NONCLUSTERED INDEX [IX_User_HashedDeviceId] ON [dbo].[User] ([hashedDeviceId]) WHERE [hashedDeviceId] IS NOT NULL;
@@ -61,8 +143,21 @@ CREATE NONCLUSTERED INDEX [IX_Report_Status] ON [dbo].[Report] ([status]) INCLUD
 CREATE NONCLUSTERED INDEX [IX_Report_CategoryId] ON [dbo].[Report] ([categoryId]) INCLUDE ([reportId], [title], [status]);
 CREATE NONCLUSTERED INDEX [IX_Report_UserId] ON [dbo].[Report] ([userId]) INCLUDE ([reportId], [title], [status], [createdAt]) WHERE [userId] IS NOT NULL;
 CREATE NONCLUSTERED INDEX [IX_Report_UpdatedAt] ON [dbo].[Report] ([updatedAt] DESC) INCLUDE ([reportId], [status]); -- For ADF
-CREATE NONCLUSTERED INDEX [IX_Report_CreatedAt] ON [dbo].[Report] ([createdAt] DESC) INCLUDE ([reportId], [status], [categoryId]);
+CREATE NONCLUSTERED INDEX [IX_Report_CreatedAt] ON [dbo].[Report] ([createdAt] DESC) INCLUDE ([reportId], [title], [status], [categoryId]);
+-- Keyset pagination of filtered listings: seek on (filter, createdAt, reportId)
+-- INCLUDE columns cover the view=summary projection (no key lookups)
+CREATE NONCLUSTERED INDEX [IX_Report_Status_CreatedAt] ON [dbo].[Report] ([status], [createdAt] DESC, [reportId] DESC) INCLUDE ([title], [categoryId]);
+CREATE NONCLUSTERED INDEX [IX_Report_UserId_CreatedAt] ON [dbo].[Report] ([userId], [createdAt] DESC, [reportId] DESC) INCLUDE ([title], [status], [categoryId]) WHERE [userId] IS NOT NULL;
+CREATE NONCLUSTERED INDEX [IX_Report_Geohash] ON [dbo].[Report] ([geohash]) INCLUDE ([latitude], [longitude], [status], [categoryId], [createdAt]) WHERE [geohash] IS NOT NULL; -- Nearby search
+CREATE NONCLUSTERED INDEX [IX_Report_ClusterId] ON [dbo].[Report] ([clusterId]) INCLUDE ([createdAt], [status]) WHERE [clusterId] IS NOT NULL;
+-- Officer work queue: claims seek the oldest Submitted reports of the requested categories
+CREATE NONCLUSTERED INDEX [IX_Report_Queue] ON [dbo].[Report] ([categoryId], [createdAt], [reportId]) INCLUDE ([userId]) WHERE [status] = 'Submitted';
+CREATE NONCLUSTERED INDEX [IX_Report_AssignedTo] ON [dbo].[Report] ([assignedTo], [status]) INCLUDE ([assignedAt]) WHERE [assignedTo] IS NOT NULL;
+CREATE NONCLUSTERED INDEX [IX_ReportCluster_LastReportAt] ON [dbo].[ReportCluster] ([lastReportAt]); -- Cluster index refresh
 CREATE NONCLUSTERED INDEX [IX_Attachment_ReportId] ON [dbo].[Attachment] ([reportId]) INCLUDE ([attachmentId], [fileType], [mimeType]);
+CREATE NONCLUSTERED INDEX [IX_BlobPurge_NextAttemptAt] ON [dbo].[BlobPurge] ([nextAttemptAt]) INCLUDE ([blobStorageUri], [attempts]);
+CREATE NONCLUSTERED INDEX [IX_ReportSearchTerm_ReportId] ON [dbo].[ReportSearchTerm] ([reportId]); -- Reindex and cascade deletes
+CREATE NONCLUSTERED INDEX [IX_Attachment_ContentHash] ON [dbo].[Attachment] ([contentHash]) WHERE [contentHash] IS NOT NULL;
 GO
 
 -- Trigger for operational table
@@ -1,13 +1,29 @@
+import os
+import tempfile
+import uuid
+
 import pytest
-from typing import Generator
+from typing import Callable, Generator
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 import urllib.parse
 
+# Attachments go to a throwaway local directory, never to real blob storage
+os.environ.setdefault("STORAGE_BACKEND", "local")
+os.environ.setdefault("LOCAL_STORAGE_PATH", tempfile.mkdtemp(prefix="test-storage-"))
+
 from app.main import app
-from app.core.database import get_db_ops, BaseOps
+from app.core.database import (
+    get_db_ops,
+    get_db_read,
+    get_async_db_ops,
+    get_async_db_read,
+    ThreadedAsyncSession,
+    BaseOps
+)
 from app.core.config import get_settings
+from app.models.user import User
 
 settings = get_settings()
 
@@ -61,9 +77,49 @@ def client(db_session: Session) -> Generator[TestClient, None, None]:
         finally:
             pass
     
+    async def override_get_async_db():
+        yield ThreadedAsyncSession(db_session)
+    
     app.dependency_overrides[get_db_ops] = override_get_db
+    app.dependency_overrides[get_db_read] = override_get_db
+    app.dependency_overrides[get_async_db_ops] = override_get_async_db
+    app.dependency_overrides[get_async_db_read] = override_get_async_db
     
     with TestClient(app) as test_client:
         yield test_client
     
-    app.dependency_overrides.clear()
\ No newline at end of file
+    app.dependency_overrides.clear()
+
+@pytest.fixture(scope="function")
+def reporter(db_session: Session) -> Generator[User, None, None]:
+    """An anonymous citizen account to submit test reports as"""
+    user = User(userId=f"test-reporter-{uuid.uuid4().hex[:8]}", isAnonymous=True, role="citizen")
+    db_session.add(user)
+    db_session.commit()
+    yield user
+    
+    # Reports keep their rows (userId is SET NULL on delete)
+    db_session.delete(user)
+    db_session.commit()
+
+@pytest.fixture(scope="function")
+def create_report(client: TestClient, reporter: User) -> Callable[..., dict]:
+    """Submit a report through the multipart endpoint; keyword arguments override the form fields"""
+    def create(**fields) -> dict:
+        form = {
+            "title": "Test Report",
+            "descriptionText": "Test description for a seeded report",
+            "categoryId": "infrastructure",
+            "location": "Test Location",
+            "user_id": reporter.userId,
+            **fields
+        }
+        response = client.post(
+            "/api/v1/reports/",
+            data=form,
+            files=[("files", ("evidence.jpg", b"fake image content", "image/jpeg"))]
+        )
+        assert response.status_code == 201, f"Expected 201, got {response.status_code}. Response: {response.text}"
+        return response.json()
+    
+    return create
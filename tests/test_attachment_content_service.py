@@ -0,0 +1,62 @@
+import os
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.attachment_content_service import AttachmentDiskCache, parse_range
+
+def test_parse_range_forms():
+    """Test explicit, open-ended and suffix byte ranges"""
+    assert parse_range("bytes=0-99", 1000) == (0, 99)
+    assert parse_range("bytes=900-", 1000) == (900, 999)
+    assert parse_range("bytes=950-2000", 1000) == (950, 999)
+    assert parse_range("bytes=-100", 1000) == (900, 999)
+    assert parse_range("bytes=-5000", 1000) == (0, 999)
+    print("✓ Range forms parsed correctly")
+
+def test_parse_range_ignored_headers():
+    """Test missing, multi-range and malformed headers serve the whole file"""
+    assert parse_range(None, 1000) is None
+    assert parse_range("items=0-10", 1000) is None
+    assert parse_range("bytes=0-10,20-30", 1000) is None
+    assert parse_range("bytes=abc-", 1000) is None
+    print("✓ Ignored range headers fall back to full responses")
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=500-100", "bytes=-0"])
+def test_parse_range_unsatisfiable(header):
+    """Test ranges past the end, reversed or empty are rejected with 416"""
+    with pytest.raises(HTTPException) as error:
+        parse_range(header, 1000)
+    
+    assert error.value.status_code == 416
+    assert error.value.headers["Content-Range"] == "bytes */1000"
+    print(f"✓ {header} rejected with 416")
+
+def test_disk_cache_lookup_survives_eviction(tmp_path):
+    """Test a handle from lookup still reads the file after another worker evicts it"""
+    cache = AttachmentDiskCache(str(tmp_path), max_bytes=1024)
+    (tmp_path / "blob-1").write_bytes(b"cached bytes")
+    
+    handle = cache.lookup("blob-1")
+    assert handle is not None
+    os.unlink(tmp_path / "blob-1")
+    
+    with handle:
+        assert handle.read() == b"cached bytes"
+    assert cache.lookup("blob-1") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    print("✓ Open cache handles outlive eviction")
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    """Test eviction drops the oldest files until the cache fits"""
+    cache = AttachmentDiskCache(str(tmp_path), max_bytes=20)
+    for index, name in enumerate(["old", "middle", "new"]):
+        path = tmp_path / name
+        path.write_bytes(b"x" * 8)
+        os.utime(path, (1000 + index, 1000 + index))
+    
+    cache._evict()
+    
+    assert sorted(os.listdir(tmp_path)) == ["middle", "new"]
+    print("✓ Least recently used attachments evicted")
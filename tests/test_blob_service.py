@@ -0,0 +1,275 @@
+import hashlib
+import io
+import threading
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from app.services import blob_service as blob_service_module
+from app.core.config import settings
+from app.services.blob_service import (
+    AsyncBlobStorageService,
+    BlobSasMixin,
+    BlobStorageService,
+    SasUrlCache,
+    close_blob_storage,
+    get_async_blob_service,
+    get_blob_service,
+    snap_expiry
+)
+
+class FakeBlobClient:
+    """Records the blocks staged and committed for one blob"""
+    
+    url = "https://storage.test/attachments/blob"
+    
+    def __init__(self):
+        self.staged = {}
+        self.committed = None
+        self.metadata = None
+    
+    def stage_block(self, block_id, data, length):
+        assert len(data) == length
+        self.staged[block_id] = data
+    
+    def commit_block_list(self, block_ids, content_settings=None, metadata=None):
+        self.committed = list(block_ids)
+        self.metadata = metadata
+
+class FakeBlobServiceClient:
+    def __init__(self, blob_client):
+        self.blob_client = blob_client
+    
+    def get_blob_client(self, container, blob):
+        return self.blob_client
+
+def _azure_service(service_class, blob_client):
+    """A storage service wired to a fake client (skips the connection string and container check)"""
+    service = service_class.__new__(service_class)
+    service.blob_service_client = FakeBlobServiceClient(blob_client)
+    service.container_name = "attachments"
+    return service
+
+def test_upload_stream_stages_ordered_blocks():
+    """Test a stream is staged in chunk-sized blocks committed in order, with its size and hash"""
+    blob_client = FakeBlobClient()
+    service = _azure_service(BlobStorageService, blob_client)
+    content = b"0123456789"
+    
+    result = service.upload_stream(io.BytesIO(content), "clip.mp4", "video/mp4", chunk_size=4)
+    
+    assert blob_client.committed == ["00000000", "00000001", "00000002"]
+    assert b"".join(blob_client.staged[block_id] for block_id in blob_client.committed) == content
+    assert result["size"] == len(content)
+    assert result["sha256"] == hashlib.sha256(content).hexdigest()
+    assert blob_client.metadata["sha256"] == result["sha256"]
+    print("✓ Streamed uploads staged as ordered blocks")
+
+def test_upload_stream_skips_empty_files():
+    """Test an empty stream commits nothing"""
+    blob_client = FakeBlobClient()
+    service = _azure_service(BlobStorageService, blob_client)
+    
+    result = service.upload_stream(io.BytesIO(b""), "empty.jpg", "image/jpeg", chunk_size=4)
+    
+    assert result == {'url': None, 'size': 0, 'sha256': hashlib.sha256(b"").hexdigest()}
+    assert blob_client.committed is None
+    print("✓ Empty uploads not committed")
+
+class CountingService:
+    """Storage service stand-in that counts how often it is constructed"""
+    
+    created = 0
+    
+    def __init__(self):
+        type(self).created += 1
+        self.closed = False
+    
+    def close(self):
+        self.closed = True
+
+class CountingAsyncService(CountingService):
+    created = 0
+    
+    async def close(self):
+        self.closed = True
+
+def _use_counting_services(monkeypatch):
+    CountingService.created = 0
+    CountingAsyncService.created = 0
+    monkeypatch.setattr(blob_service_module, "_blob_service", None)
+    monkeypatch.setattr(blob_service_module, "_async_blob_service", None)
+    monkeypatch.setattr(blob_service_module, "_storage_backend_classes", lambda: (CountingService, CountingAsyncService))
+
+def test_blob_service_created_once_across_threads(monkeypatch):
+    """Test concurrent first calls share a single lazily created sync service"""
+    _use_counting_services(monkeypatch)
+    results = []
+    
+    threads = [threading.Thread(target=lambda: results.append(get_blob_service())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert CountingService.created == 1
+    assert all(service is results[0] for service in results)
+    print("✓ One shared sync storage service per worker")
+
+async def test_async_blob_service_shared_and_closed(monkeypatch):
+    """Test the async service is created once (after the sync one) and released on shutdown"""
+    _use_counting_services(monkeypatch)
+    
+    service = get_async_blob_service()
+    assert get_async_blob_service() is service
+    assert CountingAsyncService.created == 1
+    assert CountingService.created == 1
+    
+    sync_service = get_blob_service()
+    await close_blob_storage()
+    
+    assert service.closed and sync_service.closed
+    assert blob_service_module._blob_service is None
+    assert blob_service_module._async_blob_service is None
+    print("✓ Shared async storage service reused and closed")
+
+class FakeAsyncBlobClient:
+    """Uncommitted blocks as listed by Azure (block ID -> size), and the committed list"""
+    
+    url = "https://storage.test/attachments/upload.mp4"
+    
+    def __init__(self, block_sizes: dict):
+        self.block_sizes = block_sizes
+        self.committed = None
+    
+    async def get_block_list(self, block_list_type):
+        return [], [SimpleNamespace(id=block_id, size=size) for block_id, size in self.block_sizes.items()]
+    
+    async def commit_block_list(self, block_ids, content_settings=None, metadata=None):
+        self.committed = list(block_ids)
+
+async def test_commit_staged_blocks_follows_offsets():
+    """Test blocks are committed in byte order, skipping a stale overlapping retry"""
+    blob_client = FakeAsyncBlobClient({
+        f"{8:016d}": 2,
+        f"{0:016d}": 4,
+        f"{2:016d}": 6,  # Stale block from a retried chunk
+        f"{4:016d}": 4
+    })
+    service = _azure_service(AsyncBlobStorageService, blob_client)
+    
+    url = await service.commit_staged_blocks("upload.mp4", 10, "clip.mp4", "video/mp4")
+    
+    assert url == blob_client.url
+    assert blob_client.committed == [f"{0:016d}", f"{4:016d}", f"{8:016d}"]
+    print("✓ Staged blocks committed in offset order")
+
+async def test_commit_staged_blocks_rejects_gaps_and_overruns():
+    """Test a missing block or blocks past the expected size leave the upload uncommitted"""
+    for block_sizes in ({f"{0:016d}": 4, f"{8:016d}": 2}, {f"{0:016d}": 4, f"{4:016d}": 8}):
+        blob_client = FakeAsyncBlobClient(block_sizes)
+        service = _azure_service(AsyncBlobStorageService, blob_client)
+        
+        assert await service.commit_staged_blocks("upload.mp4", 10, "clip.mp4", "video/mp4") is None
+        assert blob_client.committed is None
+    print("✓ Incomplete staged uploads not committed")
+
+async def test_local_commit_staged_blocks(tmp_path, monkeypatch):
+    """Test the filesystem backend assembles out-of-order and retried blocks by offset"""
+    from app.services.local_blob_service import AsyncLocalBlobStorageService
+    
+    monkeypatch.setattr(settings, "SECRET_KEY", "test-secret")
+    monkeypatch.setattr(settings, "LOCAL_STORAGE_PATH", str(tmp_path))
+    service = AsyncLocalBlobStorageService()
+    await service._ensure_container_exists()
+    
+    for offset, data in ((8, b"ij"), (0, b"abcd"), (2, b"cdefgh"), (4, b"efgh")):
+        assert await service.stage_block_at("upload.mp4", offset, data)
+    
+    assert await service.commit_staged_blocks("upload.mp4", 10, "clip.mp4", "video/mp4")
+    assert service.blob_path("upload.mp4").read_bytes() == b"abcdefghij"
+    print("✓ Local staged blocks assembled in offset order")
+
+def test_snap_expiry_rounds_up_to_bucket():
+    """Test expiries within one bucket snap to the same boundary, never before now + ttl"""
+    ttl = timedelta(hours=1)
+    early = datetime(2026, 1, 1, 12, 0, 1, tzinfo=timezone.utc)
+    late = datetime(2026, 1, 1, 12, 14, 59, tzinfo=timezone.utc)
+    
+    assert snap_expiry(ttl, 15, early) == datetime(2026, 1, 1, 13, 15, tzinfo=timezone.utc)
+    assert snap_expiry(ttl, 15, late) == snap_expiry(ttl, 15, early)
+    assert snap_expiry(ttl, 15, late) >= late + ttl
+    # On a boundary nothing is added
+    on_boundary = datetime(2026, 1, 1, 12, 15, tzinfo=timezone.utc)
+    assert snap_expiry(ttl, 15, on_boundary) == on_boundary + ttl
+    print("✓ SAS expiries snapped to buckets")
+
+def test_sas_url_cache_lru():
+    """Test the URL cache counts hits and misses and evicts least recently used entries"""
+    cache = SasUrlCache(max_entries=2)
+    cache.put(("attachments", "a", 1), "url-a")
+    cache.put(("attachments", "b", 1), "url-b")
+    
+    assert cache.get(("attachments", "a", 1)) == "url-a"
+    cache.put(("attachments", "c", 1), "url-c")
+    
+    assert cache.get(("attachments", "b", 1)) is None
+    assert cache.get(("attachments", "c", 1)) == "url-c"
+    assert cache.stats() == {"hits": 2, "misses": 1, "hitRate": 0.6667, "size": 2}
+    print("✓ SAS URL cache LRU working")
+
+class CountingSigner(BlobSasMixin):
+    """Signs with a counter so each new signature is distinguishable"""
+    
+    def __init__(self, container_name: str):
+        self.container_name = container_name
+        self.signed = []
+    
+    def _sign_blob(self, blob_name, permission, expiry):
+        self.signed.append((blob_name, expiry))
+        return f"sig={len(self.signed)}"
+
+def test_download_urls_reused_within_bucket(monkeypatch):
+    """Test repeat reads of a blob share one signed URL until the expiry bucket changes"""
+    # Pin the bucket so the calls cannot straddle a boundary
+    bucket_start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    monkeypatch.setattr(blob_service_module, "snap_expiry", lambda ttl, bucket_minutes: bucket_start + ttl)
+    signer = CountingSigner(container_name=f"test-{datetime.now().timestamp()}")
+    blob_url = "https://storage.test/attachments/photo.jpg"
+    
+    first = signer.generate_download_url(blob_url)
+    second = signer.generate_download_url(f"{blob_url}?old-token")
+    
+    assert first == second == f"{blob_url}?sig=1"
+    assert len(signer.signed) == 1
+    # A longer lifetime lands in another bucket and is signed separately
+    assert signer.generate_download_url(blob_url, expiry_hours=2) == f"{blob_url}?sig=2"
+    print("✓ Signed download URLs reused within a bucket")
+
+class TicketSigner(BlobSasMixin):
+    container_name = "attachments"
+    container_url = "https://storage.test/attachments"
+    
+    def get_blob_url(self, blob_name):
+        return f"{self.container_url}/{blob_name}"
+    
+    def _sign_blob(self, blob_name, permission, expiry):
+        return "sig=test"
+
+def test_only_ticket_blobs_can_be_finalized():
+    """Test finalize accepts blobs named by upload tickets and nothing else in the container"""
+    signer = TicketSigner()
+    ticket = signer.generate_upload_url("evidence video.final.MP4")
+    content_hash = hashlib.sha256(b"shared").hexdigest()
+    
+    assert ticket["blob_name"].endswith(".MP4")
+    assert signer.is_upload_ticket_url(ticket["blob_url"])
+    assert signer.is_upload_ticket_url(ticket["upload_url"])
+    for blob_url in (
+        f"{signer.container_url}/{content_hash}",  # Deduplicated, shared blob
+        f"{ticket['blob_url']}.thumb.webp",  # Thumbnail
+        f"{signer.container_url}/0b7c3f55-5f5e-4c39-9a53-2d0e8f7f6a10.mp4",  # Resumable or proxied upload
+        f"https://storage.test/other/{ticket['blob_name']}",
+        f"{signer.container_url}/nested/{ticket['blob_name']}",
+    ):
+        assert not signer.is_upload_ticket_url(blob_url), blob_url
+    print("✓ Only upload ticket blobs accepted for finalize")
@@ -1,6 +1,12 @@
+import asyncio
+import threading
+
 import pytest
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from app.core.database import ThreadedAsyncSession
+
 from app.models.report import Report
 from app.models.user import User
 from app.models.attachment import Attachment
@@ -67,4 +73,34 @@ def test_create_report_with_user(db_session: Session):
     # Cleanup
     db_session.delete(found_report)
     db_session.delete(user)
-    db_session.commit()
\ No newline at end of file
+    db_session.commit()
+
+def test_read_only_session_rejects_writes(db_session: Session):
+    """Test sessions from get_db_read refuse to flush changes"""
+    db_session.info["read_only"] = True
+    db_session.add(User(userId="read-only-user", isAnonymous=True, role="citizen"))
+    
+    with pytest.raises(RuntimeError):
+        db_session.flush()
+    
+    db_session.expunge_all()
+    db_session.info["read_only"] = False
+    print("✓ Read-only session guard working")
+
+def test_threaded_async_session_runs_off_event_loop(db_session: Session):
+    """Test the async session adapter runs queries in a worker thread"""
+    async_session = ThreadedAsyncSession(db_session)
+    
+    def query(session: Session, value: int):
+        return threading.get_ident(), session.execute(text("SELECT :value"), {"value": value}).scalar()
+    
+    async def run():
+        loop_thread = threading.get_ident()
+        worker_thread, result = await async_session.run_sync(query, 7)
+        await async_session.rollback()
+        return loop_thread, worker_thread, result
+    
+    loop_thread, worker_thread, result = asyncio.run(run())
+    assert result == 7
+    assert worker_thread != loop_thread
+    print("✓ Async session adapter working")
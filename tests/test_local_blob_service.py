@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qs
+
+import pytest
+from azure.storage.blob import BlobSasPermissions
+
+from app.core.config import settings
+from app.services.local_blob_service import LocalBlobStorageService
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch) -> LocalBlobStorageService:
+    """Filesystem storage in a temporary directory with a known signing key"""
+    monkeypatch.setattr(settings, "SECRET_KEY", "test-secret")
+    monkeypatch.setattr(settings, "LOCAL_STORAGE_PATH", str(tmp_path))
+    return LocalBlobStorageService()
+
+def _sign(storage: LocalBlobStorageService, blob_name: str, expiry: datetime) -> dict:
+    token = storage._sign_blob(blob_name, BlobSasPermissions(read=True), expiry)
+    return {key: values[0] for key, values in parse_qs(token).items()}
+
+def test_signed_token_verifies(storage: LocalBlobStorageService):
+    """Test a token verifies for the blob and permission it was signed for"""
+    params = _sign(storage, "photo.jpg", datetime.now(timezone.utc) + timedelta(hours=1))
+    
+    assert params["sp"] == "r"
+    assert storage.verify_signature("photo.jpg", params["sp"], int(params["se"]), params["sig"])
+    print("✓ Local storage tokens verified")
+
+def test_tampered_token_rejected(storage: LocalBlobStorageService, monkeypatch):
+    """Test a token cannot be reused for another blob, permission, expiry or key"""
+    params = _sign(storage, "photo.jpg", datetime.now(timezone.utc) + timedelta(hours=1))
+    expiry_ts = int(params["se"])
+    
+    assert not storage.verify_signature("other.jpg", "r", expiry_ts, params["sig"])
+    assert not storage.verify_signature("photo.jpg", "cw", expiry_ts, params["sig"])
+    assert not storage.verify_signature("photo.jpg", "r", expiry_ts + 3600, params["sig"])
+    
+    monkeypatch.setattr(settings, "SECRET_KEY", "rotated-secret")
+    assert not storage.verify_signature("photo.jpg", "r", expiry_ts, params["sig"])
+    print("✓ Tampered local storage tokens rejected")
+
+def test_expired_token_rejected(storage: LocalBlobStorageService):
+    """Test a correctly signed token stops working once it expires"""
+    params = _sign(storage, "photo.jpg", datetime.now(timezone.utc) - timedelta(seconds=1))
+    
+    assert not storage.verify_signature("photo.jpg", params["sp"], int(params["se"]), params["sig"])
+    print("✓ Expired local storage tokens rejected")
+
+def test_blob_names_confined_to_container(storage: LocalBlobStorageService):
+    """Test blob names that could escape the container directory are refused"""
+    for blob_name in ("../secrets.txt", ".meta", "nested/photo.jpg", "a..b"):
+        with pytest.raises(ValueError):
+            storage.blob_path(blob_name)
+    assert storage.blob_path("photo.jpg") == storage.root / "photo.jpg"
+    print("✓ Local blob names validated")
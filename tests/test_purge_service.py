@@ -0,0 +1,90 @@
+import hashlib
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.blob_purge import BlobPurge
+from app.models.blob_reference import BlobReference
+from app.services import purge_service
+from app.services.purge_service import PurgeService
+
+class RecordingBlobService:
+    """Blob service double that records batch deletes and fails chosen URLs"""
+    
+    def __init__(self, failures: dict = None):
+        self.failures = failures or {}
+        self.deleted = []
+    
+    def delete_files_batch(self, blob_urls):
+        self.deleted.extend(blob_urls)
+        return [self.failures.get(blob_url) for blob_url in blob_urls]
+
+def _blob_url() -> str:
+    content_hash = hashlib.sha256(uuid.uuid4().bytes).hexdigest()
+    return f"https://storage.test/attachments/{content_hash}"
+
+@pytest.fixture
+def drain(db_session: Session, monkeypatch):
+    """Run drain_batch on the test session with a recording blob service"""
+    def run(blob_service: RecordingBlobService, batch_size: int) -> int:
+        # Seeded rows are overdue since 2000, so they are claimed before any others
+        monkeypatch.setattr(settings, "BLOB_PURGE_BATCH_SIZE", batch_size)
+        monkeypatch.setattr(purge_service, "SessionLocalOps", lambda: db_session)
+        monkeypatch.setattr(purge_service, "get_blob_service", lambda: blob_service)
+        return PurgeService.drain_batch()
+    
+    return run
+
+def _enqueue(db_session: Session, *blob_urls: str) -> list:
+    rows = [
+        BlobPurge(blobStorageUri=blob_url, attempts=0, nextAttemptAt=datetime(2000, 1, 1))
+        for blob_url in blob_urls
+    ]
+    db_session.add_all(rows)
+    db_session.commit()
+    return [row.purgeId for row in rows]
+
+def test_drain_skips_rereferenced_blobs(db_session: Session, drain):
+    """Test a queued blob that was referenced again is dropped from the queue, not deleted"""
+    referenced_url, orphan_url = _blob_url(), _blob_url()
+    referenced_hash = referenced_url.split('/')[-1]
+    db_session.add(BlobReference(contentHash=referenced_hash, blobStorageUri=referenced_url, refCount=1))
+    db_session.commit()
+    purge_ids = _enqueue(db_session, referenced_url, orphan_url)
+    blob_service = RecordingBlobService()
+    
+    try:
+        assert drain(blob_service, batch_size=2) == 2
+        
+        assert blob_service.deleted == [orphan_url]
+        assert all(db_session.get(BlobPurge, purge_id) is None for purge_id in purge_ids)
+        # The orphan's tombstone lock is gone with the batch
+        assert db_session.get(BlobReference, orphan_url.split('/')[-1]) is None
+        assert db_session.get(BlobReference, referenced_hash).refCount == 1
+    finally:
+        db_session.query(BlobReference).filter(BlobReference.contentHash == referenced_hash).delete()
+        db_session.commit()
+    print("✓ Re-referenced blobs skipped by the purge")
+
+def test_drain_backs_off_failed_deletes(db_session: Session, drain):
+    """Test a failed delete stays queued with its error and an exponential backoff"""
+    blob_url = _blob_url()
+    [purge_id] = _enqueue(db_session, blob_url)
+    blob_service = RecordingBlobService(failures={blob_url: "storage unavailable"})
+    
+    try:
+        before = datetime.utcnow()
+        assert drain(blob_service, batch_size=1) == 1
+        
+        row = db_session.get(BlobPurge, purge_id)
+        assert row.attempts == 1
+        assert row.lastError == "storage unavailable"
+        expected_delay = timedelta(seconds=settings.BLOB_PURGE_POLL_SECONDS * 2)
+        assert before + expected_delay <= row.nextAttemptAt <= datetime.utcnow() + expected_delay
+    finally:
+        db_session.query(BlobPurge).filter(BlobPurge.purgeId == purge_id).delete()
+        db_session.commit()
+    print("✓ Failed purges retried with backoff")
@@ -0,0 +1,69 @@
+import math
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.services.report_cluster_service import ReportClusterIndex, _Cluster, CLUSTER_CELL_PRECISION
+from app.services.geolocation import _cell_size, encode_geohash
+
+NOW = datetime(2025, 6, 1, 12, 0)
+
+def _cluster(cluster_id: str, latitude: float, longitude: float, category: str = "traffic", count: int = 1) -> _Cluster:
+    return _Cluster(
+        clusterId=cluster_id,
+        categoryId=category,
+        cell=encode_geohash(latitude, longitude, CLUSTER_CELL_PRECISION),
+        latitude=latitude,
+        longitude=longitude,
+        reportCount=count,
+        lastReportAt=NOW
+    )
+
+def test_cluster_match_radius_category_and_window():
+    """Test matching needs the same category, the radius and the time window"""
+    index = ReportClusterIndex()
+    index.record_new(_cluster("c1", 30.0444, 31.2357))
+    
+    assert index.match("traffic", 30.0454, 31.2357, NOW).clusterId == "c1"  # ~110m
+    assert index.match("crime", 30.0444, 31.2357, NOW) is None
+    assert index.match("traffic", 30.0544, 31.2357, NOW) is None  # ~1.1km
+    
+    late = NOW + timedelta(minutes=settings.CLUSTER_WINDOW_MINUTES + 1)
+    assert index.match("traffic", 30.0444, 31.2357, late) is None
+    print("✓ Cluster matching working")
+
+def test_cluster_match_across_cell_boundary():
+    """Test a cluster in a neighbouring geohash cell still matches"""
+    _, width = _cell_size(CLUSTER_CELL_PRECISION)
+    boundary = math.ceil((31.2357 + 180) / width) * width - 180
+    
+    index = ReportClusterIndex()
+    index.record_new(_cluster("c1", 30.0444, boundary - 0.0005))
+    
+    # ~100m apart, on either side of a cell edge
+    assert encode_geohash(30.0444, boundary + 0.0005, CLUSTER_CELL_PRECISION) != index._clusters["c1"].cell
+    assert index.match("traffic", 30.0444, boundary + 0.0005, NOW).clusterId == "c1"
+    print("✓ Cross-cell cluster matching working")
+
+def test_cluster_join_keeps_latest_report_time():
+    """Test joining updates the centroid and never moves lastReportAt back"""
+    index = ReportClusterIndex()
+    index.record_new(_cluster("c1", 30.0, 31.0))
+    
+    index.record_join("c1", 30.002, 31.0, NOW - timedelta(minutes=30))
+    
+    cluster = index._clusters["c1"]
+    assert cluster.reportCount == 2
+    assert abs(cluster.latitude - 30.001) < 1e-9
+    assert cluster.lastReportAt == NOW
+    print("✓ Cluster join working")
+
+def test_empty_cluster_is_not_matched():
+    """Test a cluster whose reports were all deleted no longer attracts reports"""
+    index = ReportClusterIndex()
+    index.record_new(_cluster("c1", 30.0444, 31.2357))
+    
+    index.record_removal("c1")
+    
+    assert index.size("c1") == 0
+    assert index.match("traffic", 30.0444, 31.2357, NOW) is None
+    print("✓ Empty clusters skipped")
@@ -0,0 +1,87 @@
+import time
+
+from app.services.report_count_service import ReportCountCache, ReportCounters, _matches
+
+def test_count_key_matching():
+    """Test None parts of a filter key match any value"""
+    report = ("Submitted", "traffic", "user-1")
+    
+    assert _matches((None, None, None), report)
+    assert _matches(("Submitted", None, None), report)
+    assert _matches((None, "traffic", "user-1"), report)
+    assert not _matches(("Resolved", None, None), report)
+    assert not _matches((None, "crime", None), report)
+    assert not _matches((None, None, "user-2"), report)
+    print("✓ Count key matching working")
+
+def test_count_cache_invalidates_matching_filters():
+    """Test a report write drops every cached filter that counts it, and only those"""
+    cache = ReportCountCache(ttl_seconds=60, max_entries=100)
+    cache.put((None, None, None), 10)
+    cache.put(("Submitted", None, None), 4)
+    cache.put(("Submitted", "traffic", None), 2)
+    cache.put(("Resolved", None, None), 6)
+    cache.put((None, "crime", None), 3)
+    cache.put((None, None, "user-2"), 1)
+    
+    cache.invalidate(("Submitted", "traffic", "user-1"))
+    
+    assert cache.get((None, None, None)) is None
+    assert cache.get(("Submitted", None, None)) is None
+    assert cache.get(("Submitted", "traffic", None)) is None
+    assert cache.get(("Resolved", None, None)) == 6
+    assert cache.get((None, "crime", None)) == 3
+    assert cache.get((None, None, "user-2")) == 1
+    print("✓ Count cache invalidation working")
+
+def test_count_cache_expiry_and_capacity():
+    """Test entries expire after the TTL and the oldest are evicted first"""
+    expired = ReportCountCache(ttl_seconds=0, max_entries=10)
+    expired.put((None, None, None), 5)
+    time.sleep(0.01)
+    assert expired.get((None, None, None)) is None
+    
+    bounded = ReportCountCache(ttl_seconds=60, max_entries=2)
+    bounded.put(("Submitted", None, None), 1)
+    bounded.put(("Resolved", None, None), 2)
+    bounded.get(("Submitted", None, None))  # Now most recently used
+    bounded.put(("Rejected", None, None), 3)
+    
+    assert bounded.get(("Resolved", None, None)) is None
+    assert bounded.get(("Submitted", None, None)) == 1
+    assert bounded.get(("Rejected", None, None)) == 3
+    print("✓ Count cache expiry and eviction working")
+
+def test_report_counters_estimate_and_adjust():
+    """Test approximate totals sum the matching cells and follow adjustments"""
+    counters = ReportCounters(refresh_seconds=3600)
+    counters._cells = {
+        ("Submitted", "traffic"): 5,
+        ("Submitted", "crime"): 2,
+        ("Resolved", "traffic"): 7,
+    }
+    counters._loaded_at = time.monotonic()  # Loaded: estimate() does not query
+    
+    assert counters.estimate(None, None, None) == 14
+    assert counters.estimate(None, "Submitted", None) == 7
+    assert counters.estimate(None, None, "traffic") == 12
+    assert counters.estimate(None, "Resolved", "crime") == 0
+    
+    # A status update moves one report between cells
+    counters.adjust("Submitted", "traffic", -1)
+    counters.adjust("Assigned", "traffic", 1)
+    assert counters.estimate(None, "Submitted", "traffic") == 4
+    assert counters.estimate(None, "Assigned", None) == 1
+    assert counters.estimate(None, None, None) == 14
+    
+    # Cells never go negative
+    counters.adjust("Rejected", "crime", -1)
+    assert counters.estimate(None, "Rejected", None) == 0
+    print("✓ Report counters working")
+
+def test_report_counters_ignore_adjustments_before_load():
+    """Test adjustments are dropped until the first load (which sees them anyway)"""
+    counters = ReportCounters(refresh_seconds=3600)
+    counters.adjust("Submitted", "traffic", 1)
+    assert counters._cells == {}
+    print("✓ Unloaded counters ignore adjustments")
@@ -0,0 +1,113 @@
+import asyncio
+import hashlib
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.attachment import Attachment
+from app.models.blob_reference import BlobReference
+from app.services.report_service import ReportService
+
+class FakeUpload:
+    """The UploadFile attributes _upload_files_concurrently uses"""
+    
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.content_type = "image/jpeg"
+    
+    async def seek(self, offset: int) -> None:
+        pass
+
+class SlowBlobService:
+    """Uploads that take a moment, tracking how many run at once"""
+    
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+    
+    async def upload_content_addressed(self, stream, filename, content_type):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            # Later files finish first, so results must not come back in completion order
+            await asyncio.sleep(0.01 * (5 - int(filename.split('-')[1])))
+            if filename == "file-3":
+                raise RuntimeError("storage unavailable")
+            return {"url": f"https://storage.test/{filename}", "sha256": filename, "size": 1, "created": True}
+        finally:
+            self.in_flight -= 1
+
+async def test_concurrent_uploads_bounded_and_ordered(monkeypatch):
+    """Test uploads run at most BLOB_UPLOAD_CONCURRENCY at a time and results keep file order"""
+    monkeypatch.setattr(settings, "BLOB_UPLOAD_CONCURRENCY", 2)
+    blob_service = SlowBlobService()
+    files = [FakeUpload(f"file-{index}") for index in range(5)]
+    
+    results = await ReportService._upload_files_concurrently(blob_service, files)
+    
+    assert blob_service.peak == 2
+    assert [result["url"] for index, result in enumerate(results) if index != 3] == [
+        f"https://storage.test/file-{index}" for index in (0, 1, 2, 4)
+    ]
+    # A failed upload is returned in place, after every other upload finished
+    assert isinstance(results[3], RuntimeError)
+    assert blob_service.in_flight == 0
+    print("✓ Concurrent uploads bounded and ordered")
+
+def test_blob_reference_counting(db_session: Session):
+    """Test shared blobs are only released for deletion with their last attachment"""
+    content_hash = hashlib.sha256(uuid.uuid4().bytes).hexdigest()
+    blob_url = f"https://storage.test/attachments/{content_hash}"
+    first = Attachment(contentHash=content_hash, blobStorageUri=blob_url, thumbnailUri=f"{blob_url}.thumb.webp")
+    second = Attachment(contentHash=content_hash, blobStorageUri=blob_url)
+    
+    try:
+        assert ReportService._acquire_blob_reference(db_session, content_hash, blob_url)
+        assert not ReportService._acquire_blob_reference(db_session, content_hash, blob_url)
+        assert db_session.get(BlobReference, content_hash).refCount == 2
+        
+        assert ReportService._release_blob_reference(db_session, second) == []
+        assert db_session.get(BlobReference, content_hash).refCount == 1
+        
+        assert ReportService._release_blob_reference(db_session, first) == [blob_url, f"{blob_url}.thumb.webp"]
+        db_session.flush()
+        assert db_session.get(BlobReference, content_hash) is None
+    finally:
+        db_session.rollback()
+    print("✓ Blob reference counts acquired and released")
+
+def test_unshared_blob_released_immediately(db_session: Session):
+    """Test blobs without a content hash (direct uploads) belong to their attachment alone"""
+    attachment = Attachment(contentHash=None, blobStorageUri="https://storage.test/attachments/upload.jpg")
+    
+    assert ReportService._release_blob_reference(db_session, attachment) == [attachment.blobStorageUri]
+    print("✓ Unshared blobs released with their attachment")
+
+def test_concurrent_first_references(db_session: Session):
+    """Test two requests storing the same new content both count a reference instead of failing"""
+    content_hash = hashlib.sha256(uuid.uuid4().bytes).hexdigest()
+    blob_url = f"https://storage.test/attachments/{content_hash}"
+    other_session = Session(bind=db_session.get_bind())
+    
+    try:
+        assert ReportService._acquire_blob_reference(db_session, content_hash, blob_url)
+        
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            racing = pool.submit(ReportService._acquire_blob_reference, other_session, content_hash, blob_url)
+            time.sleep(0.5)  # Let it wait on the uncommitted row
+            db_session.commit()
+            assert racing.result(timeout=30) is False
+        other_session.commit()
+        
+        db_session.expire_all()
+        assert db_session.get(BlobReference, content_hash).refCount == 2
+    finally:
+        other_session.rollback()
+        other_session.close()
+        db_session.rollback()
+        db_session.query(BlobReference).filter(BlobReference.contentHash == content_hash).delete()
+        db_session.commit()
+    print("✓ Concurrent first references counted")
@@ -1,3 +1,5 @@
+import random
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -237,6 +239,70 @@ def test_pagination(client: TestClient):
     
     print("✓ Pagination working correctly")
 
+def test_resumable_upload(client: TestClient, create_report):
+    """Test resumable chunks are accepted only at the current offset"""
+    report = create_report()
+    
+    response = client.post(
+        "/api/v1/reports/uploads",
+        json={"filename": "clip.mp4", "mimeType": "video/mp4", "uploadLength": 10}
+    )
+    assert response.status_code == 201
+    upload_url = f"/api/v1/reports/uploads/{response.json()['uploadId']}"
+    
+    def patch(offset: int, body: bytes):
+        return client.patch(upload_url, content=body, headers={"Upload-Offset": str(offset)})
+    
+    first = patch(0, b"01234")
+    assert first.status_code == 204
+    assert first.headers["Upload-Offset"] == "5"
+    
+    # A retried chunk at a stale offset, or one overrunning the declared length, is refused
+    assert patch(0, b"01234").status_code == 409
+    assert patch(5, b"56789ab").status_code == 413
+    assert client.head(upload_url).headers["Upload-Offset"] == "5"
+    
+    assert patch(5, b"56789").headers["Upload-Offset"] == "10"
+    
+    commit = client.post(f"{upload_url}/commit", json={"reportId": report["reportId"]})
+    assert commit.status_code == 201
+    assert commit.json()["fileSizeBytes"] == 10
+    
+    # Committing again is safe and returns the same attachment
+    retry = client.post(f"{upload_url}/commit", json={"reportId": report["reportId"]})
+    assert retry.json()["attachmentId"] == commit.json()["attachmentId"]
+    
+    print("✓ Resumable uploads working correctly")
+
+def test_cursor_pagination(client: TestClient, create_report, reporter):
+    """Test keyset pagination returns disjoint pages in newest-first order"""
+    created = [create_report(title=f"Cursor Test {i}")["reportId"] for i in range(3)]
+    
+    page1 = client.get(f"/api/v1/reports/user/{reporter.userId}?limit=2&include_total=true")
+    assert page1.status_code == 200
+    data1 = page1.json()
+    assert data1["total"] == 3
+    assert len(data1["reports"]) == 2
+    assert data1["nextCursor"]
+    
+    page2 = client.get(f"/api/v1/reports/user/{reporter.userId}?limit=2&cursor={data1['nextCursor']}")
+    assert page2.status_code == 200
+    data2 = page2.json()
+    assert data2["total"] is None
+    assert len(data2["reports"]) == 1
+    assert data2["nextCursor"] is None
+    
+    # Every report exactly once, newest first (ties broken by reportId)
+    reports = data1["reports"] + data2["reports"]
+    assert sorted(r["reportId"] for r in reports) == sorted(created)
+    keys = [(r["createdAt"], r["reportId"]) for r in reports]
+    assert keys == sorted(keys, reverse=True)
+    
+    bad = client.get("/api/v1/reports/?cursor=not-a-cursor")
+    assert bad.status_code == 400
+    
+    print("✓ Cursor pagination working correctly")
+
 def test_invalid_report_creation(client: TestClient):
     """Test validation errors"""
     # Missing required field
@@ -256,4 +322,342 @@ def test_get_nonexistent_report(client: TestClient):
     response = client.get("/api/v1/reports/nonexistent-id-12345")
     assert response.status_code == 404
     assert "not found" in response.json()["detail"].lower()
-    print("✓ 404 handling working correctly")
\ No newline at end of file
+    print("✓ 404 handling working correctly")
+
+def test_get_nonexistent_attachment_content(client: TestClient):
+    """Test streaming an attachment that doesn't exist"""
+    response = client.get(
+        "/api/v1/reports/nonexistent-id-12345/attachments/nonexistent-attachment/content",
+        headers={"Range": "bytes=0-1023"}
+    )
+    assert response.status_code == 404
+    assert "not found" in response.json()["detail"].lower()
+    print("✓ Attachment content 404 working correctly")
+
+def test_attachment_content_validators(client: TestClient, create_report):
+    """Test If-None-Match compares weakly and If-Range strongly"""
+    report = create_report()
+    attachment = report["attachments"][0]
+    url = f"/api/v1/reports/{report['reportId']}/attachments/{attachment['attachmentId']}/content"
+    
+    full = client.get(url)
+    assert full.status_code == 200
+    assert full.content == b"fake image content"
+    etag = full.headers["ETag"]
+    
+    assert client.get(url, headers={"If-None-Match": f"W/{etag}"}).status_code == 304
+    
+    ranged = client.get(url, headers={"Range": "bytes=0-3", "If-Range": etag})
+    assert ranged.status_code == 206
+    assert ranged.content == b"fake"
+    weak_range = client.get(url, headers={"Range": "bytes=0-3", "If-Range": f"W/{etag}"})
+    assert weak_range.status_code == 200
+    
+    print("✓ Attachment validators working correctly")
+
+def test_count_modes(client: TestClient, create_report):
+    """Test cached totals see new reports and approximate totals are flagged"""
+    before = client.get("/api/v1/reports/?category=infrastructure&include_total=true").json()["total"]
+    
+    create_report(title="Count Test", categoryId="infrastructure")
+    
+    # The create invalidates the cached total for this filter, so it is recounted exactly
+    after = client.get("/api/v1/reports/?category=infrastructure&include_total=true").json()
+    assert after["total"] == before + 1
+    assert after["totalIsApproximate"] is False
+    
+    # Served from the cache: may lag other workers' writes
+    cached = client.get("/api/v1/reports/?category=infrastructure&include_total=true").json()
+    assert cached["total"] == after["total"]
+    assert cached["totalIsApproximate"] is True
+    
+    approximate = client.get("/api/v1/reports/?include_total=true&count_mode=approximate").json()
+    assert approximate["totalIsApproximate"] is True
+    assert approximate["total"] >= after["total"]
+    
+    print("✓ Count modes working correctly")
+
+def test_summary_view(client: TestClient, create_report):
+    """Test the summary list view omits text bodies and attachments"""
+    report_id = create_report(
+        title="Summary View Test",
+        descriptionText="This long description should not be listed"
+    )["reportId"]
+    
+    response = client.get("/api/v1/reports/?view=summary&limit=100")
+    assert response.status_code == 200
+    reports = response.json()["reports"]
+    
+    summary = next(r for r in reports if r["reportId"] == report_id)
+    assert summary["title"] == "Summary View Test"
+    assert summary["attachmentCount"] == 1
+    assert "descriptionText" not in summary
+    assert "attachments" not in summary
+    
+    print("✓ Summary view working correctly")
+
+def test_report_cache_invalidation(client: TestClient, create_report):
+    """Test cached reports reflect status updates and deletes"""
+    report_id = create_report(title="Cache Test")["reportId"]
+    
+    # First read fills the cache, second is served from it
+    assert client.get(f"/api/v1/reports/{report_id}").json()["status"] == "Submitted"
+    assert client.get(f"/api/v1/reports/{report_id}").json()["status"] == "Submitted"
+    
+    client.put(f"/api/v1/reports/{report_id}/status", json={"status": "Resolved"})
+    assert client.get(f"/api/v1/reports/{report_id}").json()["status"] == "Resolved"
+    
+    client.delete(f"/api/v1/reports/{report_id}")
+    assert client.get(f"/api/v1/reports/{report_id}").status_code == 404
+    
+    print("✓ Report cache invalidation working correctly")
+
+def test_report_cache_rejects_stale_fill(client: TestClient, create_report):
+    """Test an entry filled with a superseded version is reloaded, not served"""
+    from app.services.report_cache import get_report_cache
+    from app.services.report_documents import dumps
+    
+    report = create_report(title="Stale Cache Test")
+    report_id = report["reportId"]
+    client.put(f"/api/v1/reports/{report_id}/status", json={"status": "Resolved"})
+    
+    # What a reader that loaded the report before the update would have written back
+    cache = get_report_cache()
+    if cache.backend is None:
+        pytest.skip("Report cache disabled")
+    stale = {**report, "status": "Submitted", "attachments": []}
+    cache.backend.set(cache._key(report_id), dumps({"version": "2000-01-01T00:00:00", "report": stale}), 300)
+    
+    assert client.get(f"/api/v1/reports/{report_id}").json()["status"] == "Resolved"
+    
+    print("✓ Stale report cache entries rejected")
+
+def test_report_etag(client: TestClient, create_report):
+    """Test If-None-Match returns 304 until the report changes"""
+    report_id = create_report(title="ETag Test")["reportId"]
+    
+    response = client.get(f"/api/v1/reports/{report_id}")
+    etag = response.headers["ETag"]
+    
+    not_modified = client.get(f"/api/v1/reports/{report_id}", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == etag
+    
+    client.put(f"/api/v1/reports/{report_id}/status", json={"status": "Assigned"})
+    modified = client.get(f"/api/v1/reports/{report_id}", headers={"If-None-Match": etag})
+    assert modified.status_code == 200
+    assert modified.headers["ETag"] != etag
+    
+    listing = client.get("/api/v1/reports/?limit=5")
+    assert client.get("/api/v1/reports/?limit=5", headers={"If-None-Match": listing.headers["ETag"]}).status_code == 304
+    
+    print("✓ Report ETags working correctly")
+
+def test_batch_get_reports(client: TestClient, create_report):
+    """Test fetching several reports in one request"""
+    report_ids = [create_report(title=f"Batch Test {i}")["reportId"] for i in range(3)]
+    
+    requested = [report_ids[2], "nonexistent-id-12345", report_ids[0], report_ids[1], report_ids[0]]
+    response = client.post("/api/v1/reports/batch-get", json={"reportIds": requested})
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert [report["reportId"] for report in data["reports"]] == [report_ids[2], report_ids[0], report_ids[1]]
+    assert data["missing"] == ["nonexistent-id-12345"]
+    assert all(len(report["attachments"]) == 1 for report in data["reports"])
+    assert all(report["attachments"][0]["downloadUrl"] for report in data["reports"])
+    
+    too_many = client.post("/api/v1/reports/batch-get", json={"reportIds": [str(i) for i in range(501)]})
+    assert too_many.status_code == 422
+    
+    print("✓ Batch get working correctly")
+
+def test_search_reports(client: TestClient, create_report):
+    """Test search matches normalized Arabic and English terms"""
+    report_id = create_report(
+        title="كسر ماسورة المياه",
+        descriptionText="Water pipes leaking near the mosque entrance",
+        categoryId="utilities",
+        location="Search Street"
+    )["reportId"]
+    
+    # Ta marbuta, definite article and English plural are normalized
+    for query in ["ماسوره مياه", "water pipe leak", "الْمِياه"]:
+        response = client.get("/api/v1/reports/search", params={"q": query, "category": "utilities"})
+        assert response.status_code == 200
+        assert report_id in [report["reportId"] for report in response.json()["reports"]]
+    
+    filtered = client.get("/api/v1/reports/search", params={"q": "water pipe", "status": "Resolved"})
+    assert report_id not in [report["reportId"] for report in filtered.json()["reports"]]
+    
+    print("✓ Report search working correctly")
+
+def test_nearby_reports(client: TestClient, create_report):
+    """Test coordinates are parsed at ingest and found by radius search"""
+    report = create_report(
+        title="Nearby Test",
+        descriptionText="Testing radius search around a maps link",
+        categoryId="traffic",
+        location="https://www.google.com/maps/@30.0444,31.2357,17z"
+    )
+    report_id = report["reportId"]
+    assert report["latitude"] == 30.0444
+    
+    # ~500m north of the report
+    response = client.get("/api/v1/reports/nearby", params={"lat": 30.0489, "lon": 31.2357, "radius_m": 1000})
+    assert response.status_code == 200
+    hit = next(report for report in response.json()["reports"] if report["reportId"] == report_id)
+    assert 400 < hit["distanceMeters"] < 600
+    
+    too_small = client.get("/api/v1/reports/nearby", params={"lat": 30.0489, "lon": 31.2357, "radius_m": 100})
+    assert report_id not in [report["reportId"] for report in too_small.json()["reports"]]
+    
+    bbox = client.get(
+        "/api/v1/reports/nearby",
+        params={"min_lat": 30.04, "min_lon": 31.23, "max_lat": 30.05, "max_lon": 31.24, "category": "traffic"}
+    )
+    assert report_id in [report["reportId"] for report in bbox.json()["reports"]]
+    
+    assert client.get("/api/v1/reports/nearby").status_code == 400
+    
+    print("✓ Nearby search working correctly")
+
+def test_report_clustering(client: TestClient, create_report):
+    """Test near-duplicate reports of one incident share a cluster"""
+    latitude, longitude = 25 + random.random(), 28 + random.random()
+    
+    def create(lat: float, lon: float, category: str = "environmental") -> dict:
+        return create_report(
+            title="Cluster Test",
+            descriptionText="Testing incident clustering of duplicates",
+            categoryId=category,
+            location=f"{lat},{lon}"
+        )
+    
+    first = create(latitude, longitude)
+    duplicate = create(latitude + 0.0005, longitude)  # ~55m away
+    assert first["clusterId"] is not None
+    assert duplicate["clusterId"] == first["clusterId"]
+    assert duplicate["clusterSize"] == first["clusterSize"] + 1
+    
+    # Different category or far away: separate incidents
+    assert create(latitude, longitude, category="crime")["clusterId"] != first["clusterId"]
+    assert create(latitude + 0.05, longitude)["clusterId"] != first["clusterId"]
+    
+    print("✓ Report clustering working correctly")
+
+def test_cached_report_cluster_size(client: TestClient, create_report):
+    """Test cached and freshly loaded copies of a report agree on cluster size and ETag"""
+    from app.services.report_cache import get_report_cache
+    
+    latitude, longitude = 25 + random.random(), 28 + random.random()
+    location = f"{latitude},{longitude}"
+    first = create_report(title="Cluster Cache Test", categoryId="environmental", location=location)
+    
+    cached = client.get(f"/api/v1/reports/{first['reportId']}")
+    assert cached.json()["clusterSize"] == 1
+    
+    # The cluster grows without a write to the first report
+    create_report(title="Cluster Cache Test", categoryId="environmental", location=location)
+    hit = client.get(f"/api/v1/reports/{first['reportId']}")
+    get_report_cache().invalidate(first["reportId"])
+    miss = client.get(f"/api/v1/reports/{first['reportId']}")
+    
+    assert hit.json()["clusterSize"] == miss.json()["clusterSize"] == 2
+    assert hit.headers["ETag"] == miss.headers["ETag"] != cached.headers["ETag"]
+    
+    print("✓ Cached cluster sizes consistent")
+
+def test_claim_reports(client: TestClient, create_report):
+    """Test officers claim distinct Submitted reports"""
+    from app.main import app
+    from app.api.v1.auth import get_current_user
+    from app.models.user import User
+    
+    for i in range(2):
+        create_report(title=f"Claim Test {i}", categoryId="traffic")
+    
+    def claim(officer_id: str, role: str = "officer"):
+        app.dependency_overrides[get_current_user] = lambda: User(userId=officer_id, role=role, isAnonymous=False)
+        return client.post("/api/v1/reports/claim", json={"limit": 1, "categories": ["traffic"]})
+    
+    try:
+        first = claim("test-officer-1")
+        second = claim("test-officer-2")
+        assert first.status_code == 200 and second.status_code == 200
+        
+        first_report = first.json()["reports"][0]
+        second_report = second.json()["reports"][0]
+        assert first_report["reportId"] != second_report["reportId"]
+        assert first_report["status"] == "Assigned"
+        assert first_report["assignedTo"] == "test-officer-1"
+        assert second_report["assignedTo"] == "test-officer-2"
+        assert second_report["categoryId"] == "traffic"
+        
+        assert claim("test-citizen", role="citizen").status_code == 403
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+    
+    print("✓ Report claiming working correctly")
+
+def test_deduplicated_upload_survives_purge(client: TestClient, db_session, reporter, monkeypatch):
+    """Test an upload that reused a blob the purge then deleted stores the blob again"""
+    import asyncio
+    import hashlib
+    import uuid
+    from datetime import datetime
+    from app.core.config import settings
+    from app.models.blob_purge import BlobPurge
+    from app.models.blob_reference import BlobReference
+    from app.services.blob_service import get_blob_service
+    from app.services.purge_service import PurgeService
+    from app.services.report_service import ReportService
+    
+    content = f"purged evidence {uuid.uuid4()}".encode()
+    
+    def submit():
+        response = client.post(
+            "/api/v1/reports/",
+            data={
+                "title": "Purge Race Test",
+                "descriptionText": "Evidence shared with a deleted report",
+                "categoryId": "infrastructure",
+                "location": "Test Location",
+                "user_id": reporter.userId
+            },
+            files=[("files", ("evidence.jpg", content, "image/jpeg"))]
+        )
+        assert response.status_code == 201, response.text
+        return response.json()
+    
+    # The first report's blob loses its last reference and is queued for purging
+    first = submit()
+    blob_url = first["attachments"][0]["blobStorageUri"]
+    assert client.delete(f"/api/v1/reports/{first['reportId']}").status_code == 204
+    db_session.query(BlobPurge).filter(BlobPurge.blobStorageUri == blob_url).update(
+        {BlobPurge.nextAttemptAt: datetime(2000, 1, 1)},
+        synchronize_session=False
+    )
+    db_session.commit()
+    
+    # The purge runs after the second upload found the blob stored, before it is referenced
+    upload_files = ReportService._upload_files_concurrently
+    
+    async def upload_then_purge(blob_service, files):
+        results = await upload_files(blob_service, files)
+        assert results[0]["created"] is False
+        await asyncio.to_thread(PurgeService.drain_batch)
+        assert get_blob_service().get_file_metadata(blob_url) is None
+        return results
+    
+    monkeypatch.setattr(settings, "BLOB_PURGE_BATCH_SIZE", 1)
+    monkeypatch.setattr(ReportService, "_upload_files_concurrently", staticmethod(upload_then_purge))
+    
+    second = submit()
+    
+    assert second["attachments"][0]["blobStorageUri"] == blob_url
+    assert get_blob_service().get_file_metadata(blob_url) is not None
+    reference = db_session.get(BlobReference, hashlib.sha256(content).hexdigest())
+    assert reference.refCount == 1
+    
+    print("✓ Purged blobs restored for deduplicated uploads")
@@ -1,7 +1,7 @@
 import pytest
 from pydantic import ValidationError
-from app.schemas.report import ReportCreate, ReportCategory
-from app.schemas.attachment import AttachmentCreate, FileType
+from app.schemas.report import ReportCreate, ReportCategory, ReportFinalize
+from app.schemas.attachment import AttachmentCreate, FileType, UploadTicketRequest
 
 # ==========================================
 # 1. TEST ATTACHMENTS
@@ -145,3 +145,26 @@ def test_report_with_multiple_attachments():
     assert len(report.attachments) == 2
     assert report.attachments[0].fileType == "image"
     assert report.attachments[1].fileType == "video"
+
+# ==========================================
+# 3. TEST DIRECT UPLOADS
+# ==========================================
+
+def test_upload_ticket_file_too_large():
+    """Test that tickets are not issued for files > 50MB"""
+    with pytest.raises(ValidationError) as excinfo:
+        UploadTicketRequest(files=[
+            {"filename": "clip.mp4", "mimeType": "video/mp4", "fileSizeBytes": 52_428_801}
+        ])
+    assert "less than or equal to 52428800" in str(excinfo.value)
+
+def test_finalize_requires_attachments():
+    """Test that a finalized report must reference at least one uploaded blob"""
+    with pytest.raises(ValidationError) as excinfo:
+        ReportFinalize(
+            title="Direct Upload",
+            descriptionText="Files were uploaded straight to storage",
+            location="Cairo",
+            attachments=[]
+        )
+    assert "attachments" in str(excinfo.value)